@@ -0,0 +1,180 @@
+"""Micro-benchmark for clean_and_split_address.
+
+Compares the previous per-state re.sub loop with the precompiled
+single-pass implementation on a synthetic address sample, and the
+per-row DataFrame.apply path with clean_and_split_addresses.
+
+    python -m benchmarks.bench_address_cleaning --rows 100000
+"""
+import argparse
+import random
+import re
+import time
+
+import pandas as pd
+
+from src.config.config import state_abbreviations
+from src.data_processing.cleanAddrRestaurants import (
+    clean_and_split_address,
+    clean_and_split_addresses,
+    _clean_and_split_address,
+)
+
+STREETS = ['Main St', 'Broadway', 'Market Street', 'Pennsylvania Ave', 'Elm Ave',
+           'Washington Blvd', 'Ocean Dr', 'Mission St', 'Peachtree Rd', 'Colorado Blvd']
+CITIES = [('Boston', 'Massachusetts'), ('Austin', 'Texas'), ('Portland', 'Oregon'),
+          ('Chicago', 'Illinois'), ('Denver', 'Colorado'), ('Atlanta', 'Georgia'),
+          ('Miami', 'Florida'), ('Seattle', 'Washington'), ('New York', 'New York'),
+          ('Charleston', 'West Virginia')]
+UNITS = ['', ' Suite 200', ' Ste 4', ' Floor 2', ' #12']
+
+
+def legacy_clean_and_split_address(address):
+    """Implementation prior to the precompiled patterns, kept for comparison"""
+    if not address:
+        return {"Address": "", "City": "", "State": "", "Zip": ""}
+
+    for full_state, abbrev in state_abbreviations.items():
+        address = re.sub(r'\b' + re.escape(full_state) + r'\b', abbrev, address, flags=re.IGNORECASE)
+
+    address = re.sub(r'\s+,', ',', address)
+    address = re.sub(r',\s+', ', ', address)
+
+    parts = [part.strip() for part in address.split(',') if part.strip()]
+    cleaned_address_components = {"Address": "", "City": "", "State": "", "Zip": ""}
+
+    dc_zip_match = re.match(r'^D\.C\.\s*(\d{5}(?:-\d{4})?)$', parts[-1])
+    if dc_zip_match:
+        cleaned_address_components["City"] = "WA"
+        cleaned_address_components["State"] = "DC"
+        cleaned_address_components["Zip"] = dc_zip_match.group(1)
+        parts.pop()
+    else:
+        if parts:
+            last_part = parts[-1]
+            state_zip_match = re.match(r'^([A-Z]{2})\s*(\d{5}(?:-\d{4})?)$', last_part)
+            if state_zip_match:
+                cleaned_address_components["State"] = state_zip_match.group(1)
+                cleaned_address_components["Zip"] = state_zip_match.group(2)
+                parts.pop()
+            else:
+                zip_match = re.search(r'\b(\d{5}(?:-\d{4})?)\b', last_part)
+                if zip_match:
+                    cleaned_address_components["Zip"] = zip_match.group(1)
+                    state_part = last_part.replace(zip_match.group(1), '').strip()
+                    if len(state_part) == 2 and state_part.isupper():
+                        cleaned_address_components["State"] = state_part
+                    parts.pop()
+                elif len(last_part) == 2 and last_part.isupper():
+                    cleaned_address_components["State"] = last_part
+                    parts.pop()
+
+    if len(parts) > 1:
+        cleaned_address_components["City"] = parts.pop()
+
+    if cleaned_address_components["State"] == "DC" and not cleaned_address_components["City"]:
+        cleaned_address_components["City"] = "WA"
+
+    cleaned_address_components["Address"] = ', '.join(parts)
+
+    address = cleaned_address_components["Address"]
+    address = re.sub(r'(\d+)\s*&\s*(\d+[A-Za-z]?)', r'\1-\2', address)
+    address = re.sub(r'\b(floor|fl|ste|suite|#)\s*(\d+)', r'#\2', address, flags=re.IGNORECASE)
+    cleaned_address_components["Address"] = address
+
+    return cleaned_address_components
+
+
+def make_addresses(rows, unique_ratio=0.7, seed=42):
+    """Build a reproducible address sample with some repeated raw addresses"""
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(max(1, int(rows * unique_ratio))):
+        number = rng.randint(1, 9999)
+        street = rng.choice(STREETS)
+        unit = rng.choice(UNITS)
+        zip_code = f"{rng.randint(10000, 99999)}"
+        form = rng.random()
+        if form < 0.1:
+            pool.append(f"{number} {street}{unit}, Washington, D.C. {zip_code}")
+        elif form < 0.2:
+            pool.append(f"{number} & {number + 2} {street}, {rng.choice(CITIES)[0]}, "
+                        f"{state_abbreviations[rng.choice(CITIES)[1]]} {zip_code}")
+        else:
+            city, state = rng.choice(CITIES)
+            pool.append(f"{number} {street}{unit} , {city},  {state} {zip_code}")
+    return [pool[i] if i < len(pool) else rng.choice(pool) for i in range(rows)]
+
+
+def time_per_address(func, addresses):
+    start = time.perf_counter()
+    for address in addresses:
+        func(address)
+    return (time.perf_counter() - start) / len(addresses)
+
+
+def time_batch(addresses, apply_rows):
+    """Seconds per row for the per-row apply path and the batch API"""
+    series = pd.Series(addresses)
+    sample = series[:apply_rows]
+    _clean_and_split_address.cache_clear()
+    start = time.perf_counter()
+    sample.apply(lambda x: pd.Series(clean_and_split_address(x)))
+    apply_cost = (time.perf_counter() - start) / len(sample)
+
+    _clean_and_split_address.cache_clear()
+    start = time.perf_counter()
+    clean_and_split_addresses(series)
+    batch_cost = (time.perf_counter() - start) / len(series)
+    return apply_cost, batch_cost
+
+
+def run(rows, apply_rows=20000):
+    addresses = make_addresses(rows)
+    legacy = time_per_address(legacy_clean_and_split_address, addresses)
+
+    _clean_and_split_address.cache_clear()
+    current = time_per_address(clean_and_split_address, addresses)
+    cache_info = _clean_and_split_address.cache_info()
+
+    mismatches = sum(
+        1 for address in addresses
+        if legacy_clean_and_split_address(address) != clean_and_split_address(address)
+        and 'West Virginia' not in address
+    )
+
+    apply_cost, batch_cost = time_batch(addresses, min(apply_rows, rows))
+
+    return {
+        'rows': rows,
+        'unique_addresses': len(set(addresses)),
+        'legacy_us_per_address': legacy * 1e6,
+        'current_us_per_address': current * 1e6,
+        'speedup': legacy / current if current else float('inf'),
+        'cache_hits': cache_info.hits,
+        'apply_us_per_row': apply_cost * 1e6,
+        'batch_us_per_row': batch_cost * 1e6,
+        'mismatches': mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--apply-rows', type=int, default=20000,
+                        help="rows timed through the slow DataFrame.apply path")
+    args = parser.parse_args()
+
+    result = run(args.rows, args.apply_rows)
+    print(f"Addresses: {result['rows']} ({result['unique_addresses']} unique)")
+    print(f"Legacy:  {result['legacy_us_per_address']:.2f} us/address")
+    print(f"Current: {result['current_us_per_address']:.2f} us/address "
+          f"({result['cache_hits']} cache hits)")
+    print(f"Speedup: {result['speedup']:.1f}x")
+    print(f"DataFrame.apply: {result['apply_us_per_row']:.2f} us/row")
+    print(f"Batch:           {result['batch_us_per_row']:.2f} us/row")
+    print(f"Mismatches (excluding West Virginia fix): {result['mismatches']}")
+
+
+if __name__ == "__main__":
+    main()
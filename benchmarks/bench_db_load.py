@@ -0,0 +1,113 @@
+"""Benchmark RestaurantDB upserts: execute_values vs COPY + staging merge.
+
+Needs a local PostgreSQL. Runs against its own database (created if
+missing) so the real restaurants table is never touched; the DB_HOST,
+DB_PORT, DB_USER and DB_PASSWORD settings are reused.
+
+    python -m benchmarks.bench_db_load --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+import psycopg2
+from psycopg2 import sql
+
+from src.config.config import CSV_FIELDNAMES
+from src.config.database_config import DATABASE
+from src.database.db_operations import RestaurantDB
+
+WORDS = ['Taqueria', 'Noodle', 'Bar', 'Kitchen', 'Cafe', 'Grill', 'Bistro', 'Diner',
+         'Pizza', 'Sushi', 'Bakery', 'Tavern', 'Oyster', 'Smokehouse', 'Deli']
+ATTRIBUTES = ['Wheelchair accessible entrance', 'Dine-in', 'Takeout', 'Delivery',
+              'Outdoor seating', 'Great cocktails', 'Vegetarian options', 'Not available']
+
+
+def make_rows(count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        row = {field: rng.choice(ATTRIBUTES) for field in CSV_FIELDNAMES}
+        row.update({
+            'Restaurant Name': f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+            'Restaurant Description': ' '.join(rng.choices(WORDS, k=40)),
+            'Address': f"{rng.randint(1, 9999)} Main St, Springfield, IL 62701",
+            'Cleaned Address': f"{rng.randint(1, 9999)} Main St",
+            'City': 'Springfield', 'State': 'IL', 'Zip': '62701',
+            'Star Rating': f"{rng.uniform(1, 5):.1f}",
+            'Number of Reviews': str(rng.randint(0, 20000)),
+            'Latitude': f"{rng.uniform(25, 49):.6f}",
+            'Longitude': f"{rng.uniform(-124, -67):.6f}",
+        })
+        rows.append(row)
+    return pd.DataFrame(rows, columns=CSV_FIELDNAMES)
+
+
+def ensure_database(name):
+    conn = psycopg2.connect(host=DATABASE['host'], port=DATABASE['port'], database='postgres',
+                            user=DATABASE['user'], password=DATABASE['password'])
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (name,))
+        if not cur.fetchone():
+            cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(name)))
+    conn.close()
+
+
+def timed_load(db, method, df):
+    with db.conn.cursor() as cur:
+        cur.execute("TRUNCATE restaurants")
+    db.conn.commit()
+
+    started = time.perf_counter()
+    method(df.copy())
+    insert_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    method(df.copy())
+    upsert_seconds = time.perf_counter() - started
+    return insert_seconds, upsert_seconds
+
+
+def run(sizes, max_legacy_rows):
+    db = RestaurantDB()
+    db.connect()
+    try:
+        db.create_tables()
+        results = []
+        for size in sizes:
+            df = make_rows(size)
+            result = {'rows': size}
+            result['copy_insert_s'], result['copy_upsert_s'] = timed_load(db, db.bulk_load_restaurant_data, df)
+            if size <= max_legacy_rows:
+                result['values_insert_s'], result['values_upsert_s'] = timed_load(db, db.insert_restaurant_data, df)
+            results.append(result)
+        return results
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--database', default='restaurants_bench')
+    parser.add_argument('--max-legacy-rows', type=int, default=1000000,
+                        help="skip the execute_values path above this many rows")
+    args = parser.parse_args()
+
+    ensure_database(args.database)
+    DATABASE['database'] = args.database
+
+    for result in run(args.sizes, args.max_legacy_rows):
+        line = (f"{result['rows']:>9} rows  COPY: insert {result['copy_insert_s']:.2f}s, "
+                f"upsert {result['copy_upsert_s']:.2f}s")
+        if 'values_insert_s' in result:
+            line += (f"  execute_values: insert {result['values_insert_s']:.2f}s, "
+                     f"upsert {result['values_upsert_s']:.2f}s  "
+                     f"(speedup {result['values_upsert_s'] / result['copy_upsert_s']:.1f}x on upsert)")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
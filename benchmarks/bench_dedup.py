@@ -0,0 +1,91 @@
+"""Benchmark for fuzzy duplicate detection.
+
+Builds a synthetic restaurant list with planted near-duplicates
+("Joe's Pizza" / "Joes Pizza", "Street" / "St") and compares the exact
+remove_duplicates passes with FuzzyDeduplicator on time and on how many
+planted duplicates each one removes.
+
+    python -m benchmarks.bench_dedup --rows 200000
+"""
+import argparse
+import random
+import string
+import time
+
+import pandas as pd
+
+from src.data_processing.cleanAddrRestaurants import remove_duplicates
+from src.data_processing.fuzzy_dedup import FuzzyDeduplicator
+
+SUFFIXES = [('Street', 'St'), ('Avenue', 'Ave'), ('Boulevard', 'Blvd'), ('Road', 'Rd')]
+COMMON_WORDS = ['Pizza', 'Bar', 'Grill', 'Cafe', 'Kitchen', 'Tacos', 'Sushi', 'Deli']
+
+
+def near_duplicate_name(name, rng):
+    form = rng.random()
+    if form < 0.3:
+        return name.replace("'s", 's') if "'s" in name else name + "'s"
+    if form < 0.6:
+        return name.upper()
+    return name + 's'
+
+
+def make_rows(rows, duplicate_ratio=0.05, seed=42):
+    """(frame, planted duplicate count) with rows spread over rows // 200 zips, ten per city"""
+    rng = random.Random(seed)
+    vocab = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title()
+             for _ in range(5000)]
+    records, planted = [], 0
+    while len(records) < rows:
+        words = rng.choices(vocab, k=rng.randint(1, 2)) + [rng.choice(COMMON_WORDS)]
+        name = ' '.join(words) if rng.random() < 0.7 else f"{words[0]}'s {' '.join(words[1:])}"
+        long_suffix, short_suffix = rng.choice(SUFFIXES)
+        street = f"{rng.randint(1, 9999)} {rng.choice(vocab)}"
+        zip_code = rng.randint(0, rows // 200)
+        record = {'Restaurant Name': name, 'Cleaned Address': f"{street} {long_suffix}",
+                  'City': f"City {zip_code // 10}", 'State': 'IL', 'Zip': f"{zip_code:05d}"}
+        records.append(record)
+        if rng.random() < duplicate_ratio:
+            records.append({**record, 'Restaurant Name': near_duplicate_name(name, rng),
+                            'Cleaned Address': f"{street} {short_suffix}", 'City': None})
+            planted += 1
+    return pd.DataFrame(records), planted
+
+
+def run(rows):
+    df, planted = make_rows(rows)
+
+    start = time.perf_counter()
+    exact = remove_duplicates(df)
+    exact_seconds = time.perf_counter() - start
+
+    deduplicator = FuzzyDeduplicator()
+    start = time.perf_counter()
+    fuzzy, _ = deduplicator.deduplicate(df)
+    fuzzy_seconds = time.perf_counter() - start
+
+    return {
+        'rows': len(df),
+        'planted_duplicates': planted,
+        'exact_seconds': exact_seconds,
+        'exact_removed': len(df) - len(exact),
+        'fuzzy_seconds': fuzzy_seconds,
+        'fuzzy_removed': len(df) - len(fuzzy),
+        'pairs_compared': deduplicator.stats['pairs_compared'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    args = parser.parse_args()
+
+    result = run(args.rows)
+    print(f"Rows: {result['rows']} ({result['planted_duplicates']} planted near-duplicates)")
+    print(f"remove_duplicates:  {result['exact_seconds']:.2f}s, removed {result['exact_removed']}")
+    print(f"FuzzyDeduplicator:  {result['fuzzy_seconds']:.2f}s, removed {result['fuzzy_removed']} "
+          f"({result['pairs_compared']} pairs compared)")
+
+
+if __name__ == "__main__":
+    main()
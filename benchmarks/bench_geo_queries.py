@@ -0,0 +1,157 @@
+"""Benchmark RestaurantDB bounding-box and radius queries and check their plans.
+
+Seeds a scratch database with restaurants clustered around a few city
+centres and one on the antimeridian. For each query shape it asserts
+that EXPLAIN shows the GiST point index in use, times it against a forced
+sequential scan, and checks that radius queries return exactly the rows a
+full-table haversine scan finds. Needs a local PostgreSQL.
+
+    python -m benchmarks.bench_geo_queries --rows 200000
+"""
+import argparse
+import json
+import random
+import time
+
+import pandas as pd
+
+from src.config.database_config import DATABASE
+from src.database.db_operations import RestaurantDB, bbox_query, radius_query
+from benchmarks.bench_db_load import ensure_database
+
+GEO_INDEX = 'idx_geo_point'
+CENTRES = [(40.7128, -74.0060), (34.0522, -118.2437), (41.8781, -87.6298), (29.7604, -95.3698),
+           (47.6062, -122.3321), (39.7392, -104.9903), (25.7617, -80.1918), (42.3601, -71.0589)]
+ANTIMERIDIAN = (-16.8, 179.99)
+
+
+def make_rows(count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        lat, lon = rng.choice(CENTRES + [ANTIMERIDIAN])
+        longitude = (rng.gauss(lon, 0.15) + 180.0) % 360.0 - 180.0
+        rows.append({
+            'Restaurant Name': f"Restaurant {i}",
+            'Cleaned Address': f"{i} Main St",
+            'Star Rating': f"{rng.uniform(1, 5):.1f}",
+            'Number of Reviews': str(rng.randint(0, 5000)),
+            'Latitude': f"{rng.gauss(lat, 0.15):.6f}",
+            'Longitude': f"{longitude:.6f}",
+        })
+    return pd.DataFrame(rows)
+
+
+def plan_indexes(plan):
+    """Index names used anywhere in an EXPLAIN (FORMAT JSON) plan tree"""
+    names = {plan['Index Name']} if 'Index Name' in plan else set()
+    for child in plan.get('Plans', []):
+        names |= plan_indexes(child)
+    return names
+
+
+def explain(cur, query, params):
+    cur.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+    result = cur.fetchone()[0]
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]['Plan']
+
+
+def time_query(cur, cases, force_seq_scan=False):
+    """Mean ms per query over (sql, params) cases; returns it with each case's result ids"""
+    if force_seq_scan:
+        cur.execute("SET enable_indexscan = off; SET enable_bitmapscan = off; SET enable_indexonlyscan = off")
+    try:
+        ids = []
+        started = time.perf_counter()
+        for query, params in cases:
+            cur.execute(query, params)
+            ids.append(sorted(row[0] for row in cur.fetchall()))
+        return (time.perf_counter() - started) / len(cases) * 1000, ids
+    finally:
+        if force_seq_scan:
+            cur.execute("RESET enable_indexscan; RESET enable_bitmapscan; RESET enable_indexonlyscan")
+
+
+def haversine_ids(cur, lat, lon, radius_km, min_rating=None):
+    """Ids within radius_km by a full-table haversine scan, for checking radius_query"""
+    cur.execute(
+        "SELECT id FROM restaurants WHERE 2 * 6371.0 * asin(least(1.0, sqrt("
+        "power(sin(radians(latitude - %s) / 2), 2) + cos(radians(%s)) * cos(radians(latitude)) * "
+        "power(sin(radians(longitude - %s) / 2), 2)))) <= %s AND (%s IS NULL OR star_rating >= %s)",
+        [lat, lat, lon, radius_km, min_rating, min_rating]
+    )
+    return sorted(row[0] for row in cur.fetchall())
+
+
+def query_cases(rng, count):
+    """Query shapes mapped to [(sql, params, radius args or None)]"""
+    cases = {'bbox_1km': [], 'radius_2km': [], 'radius_2km_rating_4.5': [],
+             'bbox_antimeridian': [], 'radius_antimeridian': []}
+    for _ in range(count):
+        lat, lon = rng.choice(CENTRES)
+        lat, lon = rng.gauss(lat, 0.1), rng.gauss(lon, 0.1)
+        cases['bbox_1km'].append((*bbox_query(lat - 0.009, lon - 0.012, lat + 0.009, lon + 0.012), None))
+        cases['radius_2km'].append((*radius_query(lat, lon, 2.0), (lat, lon, 2.0, None)))
+        cases['radius_2km_rating_4.5'].append((*radius_query(lat, lon, 2.0, min_rating=4.5), (lat, lon, 2.0, 4.5)))
+
+        lat = rng.gauss(ANTIMERIDIAN[0], 0.05)
+        lon = rng.uniform(179.95, 180.0) * rng.choice([1, -1])
+        cases['bbox_antimeridian'].append((*bbox_query(lat - 0.01, lon - 0.1, lat + 0.01, lon + 0.1), None))
+        cases['radius_antimeridian'].append((*radius_query(lat, lon, 5.0), (lat, lon, 5.0, None)))
+    return cases
+
+
+def run(rows, queries, seed=0):
+    db = RestaurantDB()
+    db.create_tables()
+    with db.transaction() as cur:
+        cur.execute("TRUNCATE restaurants")
+    db.bulk_load_restaurant_data(make_rows(rows, seed))
+    with db.transaction() as cur:
+        cur.execute("ANALYZE restaurants")
+
+    results = {}
+    with db.cursor() as cur:
+        for name, cases in query_cases(random.Random(seed), queries).items():
+            used = set()
+            for query, params, _ in cases:
+                plan_used = plan_indexes(explain(cur, query, params))
+                assert GEO_INDEX in plan_used, f"{name} does not use {GEO_INDEX}: plan uses {plan_used or 'no index'}"
+                used |= plan_used
+            statements = [(query, params) for query, params, _ in cases]
+            index_ms, index_ids = time_query(cur, statements)
+            sample = max(1, queries // 10)
+            seq_scan_ms, seq_scan_ids = time_query(cur, statements[:sample], force_seq_scan=True)
+            assert index_ids[:sample] == seq_scan_ids, f"{name} returns different rows with the index"
+            for (_, _, radius), ids in zip(cases, index_ids):
+                if radius is not None:
+                    assert ids == haversine_ids(cur, *radius), f"{name} misses rows within {radius[2]} km"
+            results[name] = {
+                'indexes': sorted(used),
+                'rows': sum(map(len, index_ids)) / len(index_ids),
+                'index_ms': index_ms,
+                'seq_scan_ms': seq_scan_ms,
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--database', default='restaurants_bench')
+    args = parser.parse_args()
+
+    ensure_database(args.database)
+    DATABASE['database'] = args.database
+
+    for name, result in run(args.rows, args.queries).items():
+        print(f"{name:<24} {result['rows']:7.1f} rows {result['index_ms']:8.3f} ms with {', '.join(result['indexes'])}  "
+              f"{result['seq_scan_ms']:8.3f} ms seq scan  "
+              f"({result['seq_scan_ms'] / result['index_ms']:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark for Eater and Google Maps HTML parsing on the recorded fixtures.
+
+Compares the previous full-tree html.parser implementation of
+parse_eater_cards with the strained, single-walk parser under each
+available backend, and times archive and place-page parsing the same way.
+
+    python -m benchmarks.bench_html_parsing --repeat 20
+"""
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.suite import ARCHIVE_FIXTURE, ARTICLE_FIXTURE, PLACE_FIXTURE, PLACE_PATH, fixture
+from src.config.config import HTML_PARSER_CONFIG
+from src.scrapers.archive_crawler import parse_archive_entries
+from src.scrapers.EAS import parse_eater_cards
+from src.scrapers.FetchGoogleData import parse_place_snapshot
+from src.utils.html_parser import LXML_AVAILABLE
+
+
+def legacy_parse_eater_cards(html):
+    """Implementation prior to the parser layer, kept for comparison"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    restaurant_entries = soup.find_all('section', class_='c-mapstack__card')
+    
+    data = []
+    
+    for entry in restaurant_entries:
+        name = entry.find('h1').text.strip() if entry.find('h1') else "Name Not Found"
+        
+        description_container = entry.find('div', class_='c-entry-content venu-card')
+        if description_container:
+            description_paragraphs = description_container.find_all('p')
+            description = ''.join([p.text.strip() for p in description_paragraphs])
+            
+            embedded_links = []
+            for p in description_paragraphs:
+                links = p.find_all('a')
+                for link in links:
+                    link_data = {
+                        'text': link.text.strip(),
+                        'url': link.get('href', ''),
+                    }
+                    embedded_links.append(link_data)
+        else:
+            description = "Description Not Found"
+            embedded_links = []
+        
+        venue_id = "Venue ID Not Found"
+        card_hed = entry.find('div', class_='c-mapstack__card-hed')
+        if card_hed and 'data-venue-id' in card_hed.attrs:
+            venue_id = card_hed['data-venue-id']
+
+        info_section = entry.find('div', class_='c-mapstack__info')
+        
+        address = "Address Not Found"
+        phone = "Phone Not Found"
+        website = "Website Not Found"
+        google_maps_link = "Google Maps Link Not Found"
+
+        if info_section:
+            address_div = info_section.find('div', class_='c-mapstack__address')
+            if address_div:
+                google_maps_link = address_div.find('a')['href']
+                address = address_div.text.strip()
+
+            info_items = info_section.find_all('div', class_='info')
+            for item in info_items:
+                icon = item.find('div', class_='info-icon').find('svg').find('use')['xlink:href']
+                if '#icon-phone' in icon:
+                    phone = item.find('div', class_='c-mapstack__phone-url').find('a').text.strip()
+                elif '#icon-world' in icon:
+                    website = item.find('a')['href']
+
+        if name != "Name Not Found" and address != "Address Not Found":
+            data.append({
+                'Restaurant Name': name,
+                'Restaurant Description': description,
+                'Address': address,
+                'Phone': phone,
+                'Website': website,
+                'Google Maps Link': google_maps_link,
+                'Embedded Links': embedded_links,
+                'Venue ID': venue_id
+            })
+
+    return len(restaurant_entries), data
+
+
+def legacy_parse_archive_entries(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    return [entry.find('a')['href'] for entry in soup.find_all('div', class_='c-compact-river__entry')
+            if entry.find('a')]
+
+
+def best_ms(func, repeat):
+    func()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def run(repeat):
+    article, archive, place = fixture(ARTICLE_FIXTURE), fixture(ARCHIVE_FIXTURE), fixture(PLACE_FIXTURE)
+    expected = legacy_parse_eater_cards(article)
+    results = {
+        'legacy': {
+            'article_ms': best_ms(lambda: legacy_parse_eater_cards(article), repeat),
+            'archive_ms': best_ms(lambda: legacy_parse_archive_entries(archive), repeat),
+        }
+    }
+    backends = ['html.parser'] + (['lxml'] if LXML_AVAILABLE else [])
+    configured = HTML_PARSER_CONFIG['backend']
+    try:
+        for backend in backends:
+            HTML_PARSER_CONFIG['backend'] = backend
+            results[backend] = {
+                'article_ms': best_ms(lambda: parse_eater_cards(article), repeat),
+                'archive_ms': best_ms(lambda: parse_archive_entries(archive), repeat),
+                'place_ms': best_ms(lambda: parse_place_snapshot(place, PLACE_PATH), repeat),
+                'matches_legacy': parse_eater_cards(article) == expected,
+            }
+    finally:
+        HTML_PARSER_CONFIG['backend'] = configured
+    return expected[0], results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    cards, results = run(args.repeat)
+    legacy = results['legacy']
+    print(f"Article: {cards} cards, {len(fixture(ARTICLE_FIXTURE)) // 1024} KB")
+    print(f"{'parser':<14} {'article ms':>11} {'ms/card':>8} {'archive ms':>11} {'place ms':>9}")
+    print(f"{'legacy':<14} {legacy['article_ms']:11.2f} {legacy['article_ms'] / cards:8.3f} "
+          f"{legacy['archive_ms']:11.2f} {'':>9}")
+    for backend, result in results.items():
+        if backend == 'legacy':
+            continue
+        print(f"{backend:<14} {result['article_ms']:11.2f} {result['article_ms'] / cards:8.3f} "
+              f"{result['archive_ms']:11.2f} {result['place_ms']:9.2f}  "
+              f"({legacy['article_ms'] / result['article_ms']:.1f}x article speedup, "
+              f"{'identical' if result['matches_legacy'] else 'DIFFERENT'} output)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark for offloading HTML parsing from fetching threads to the parse pool.
+
+Fetcher threads alternate a simulated page load (a sleep, which releases the
+GIL as a blocked browser or socket does) with parsing the recorded article
+fixture, first inline and then through ParsePool with increasing worker
+counts. Reports pages/sec and how late the fetchers' page loads return,
+which is the GIL contention the pool is meant to remove.
+
+    python -m benchmarks.bench_parse_pool --pages 120 --fetchers 4 --fetch-ms 50
+"""
+import argparse
+import os
+import threading
+import time
+
+from benchmarks.suite import ARTICLE_FIXTURE, fixture
+from src.scrapers.EAS import parse_eater_cards
+from src.utils.parse_pool import ParsePool
+
+
+def run(pool, html, pages, fetchers, fetch_seconds):
+    """Fetch and parse pages across fetcher threads; returns the timing summary"""
+    remaining = iter(range(pages))
+    lock = threading.Lock()
+    lateness = []
+
+    def fetcher():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            started = time.perf_counter()
+            time.sleep(fetch_seconds)
+            late = time.perf_counter() - started - fetch_seconds
+            card_count, _ = pool.parse(parse_eater_cards, html)
+            assert card_count
+            with lock:
+                lateness.append(late)
+
+    pool.parse(parse_eater_cards, html)  # start the worker processes before timing
+    started = time.perf_counter()
+    threads = [threading.Thread(target=fetcher) for _ in range(fetchers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    stats = pool.stats()
+    pool.shutdown()
+
+    lateness.sort()
+    return {
+        'workers': pool.workers,
+        'pages_per_second': pages / seconds,
+        'fetch_late_p50_ms': 1000 * lateness[len(lateness) // 2],
+        'fetch_late_p95_ms': 1000 * lateness[int(len(lateness) * 0.95)],
+        'mean_parse_ms': stats['mean_parse_ms'],
+        'mean_wait_ms': stats['mean_wait_ms'],
+        'pending_peak': stats['pending_peak'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=120)
+    parser.add_argument('--fetchers', type=int, default=4)
+    parser.add_argument('--fetch-ms', type=float, default=50.0)
+    parser.add_argument('--max-workers', type=int, default=max(1, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    html = fixture(ARTICLE_FIXTURE)
+    print(f"{args.pages} pages, {args.fetchers} fetchers, {args.fetch_ms:.0f} ms simulated fetch, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'parsers':<8} {'pages/s':>8} {'late p50':>9} {'late p95':>9} {'parse ms':>9} "
+          f"{'wait ms':>8} {'peak depth':>10}")
+    for workers in range(0, args.max_workers + 1):
+        result = run(ParsePool(workers), html, args.pages, args.fetchers, args.fetch_ms / 1000)
+        print(f"{'inline' if not workers else workers:<8} {result['pages_per_second']:>8.1f} "
+              f"{result['fetch_late_p50_ms']:>9.1f} {result['fetch_late_p95_ms']:>9.1f} "
+              f"{result['mean_parse_ms']:>9.1f} {result['mean_wait_ms']:>8.1f} {result['pending_peak']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark GridSpatialIndex k-nearest, radius and bounding-box queries.
+
+Builds an index over synthetic restaurants clustered around a few city
+centres, saves and memory-maps it, checks query results against a brute
+force scan, then reports mean per-query latency.
+
+    python -m benchmarks.bench_spatial_index --rows 500000
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.utils.spatial_index import GridSpatialIndex, haversine_km
+
+CENTRES = np.array([(40.7128, -74.0060), (34.0522, -118.2437), (41.8781, -87.6298),
+                    (29.7604, -95.3698), (47.6062, -122.3321), (25.7617, -80.1918)])
+CATEGORIES = ['Pizza restaurant', 'Sushi restaurant', 'Bar', 'Bakery', 'Not available']
+
+
+def make_frame(rows, rng):
+    centres = CENTRES[rng.integers(0, len(CENTRES), rows)]
+    return pd.DataFrame({
+        'lat': centres[:, 0] + rng.normal(0, 0.15, rows),
+        'lon': centres[:, 1] + rng.normal(0, 0.15, rows),
+        'rating': np.round(rng.uniform(1, 5, rows), 1),
+        'category': rng.choice(CATEGORIES, rows),
+        'name': [f"Restaurant {i}" for i in range(rows)],
+        'address': [f"{i} Main St" for i in range(rows)],
+    })
+
+
+def query_points(rng, count):
+    return CENTRES[rng.integers(0, len(CENTRES), count)] + rng.normal(0, 0.1, (count, 2))
+
+
+def check(index, rng, count=50):
+    """Compare radius and k-nearest results with a brute-force scan"""
+    lat, lon = np.asarray(index.lat), np.asarray(index.lon)
+    for qlat, qlon in query_points(rng, count):
+        distances = haversine_km(qlat, qlon, lat, lon)
+        indices, _ = index.within_radius(qlat, qlon, 2.0, min_rating=4.5)
+        expected = np.flatnonzero((distances <= 2.0) & (np.asarray(index.rating) >= 4.5))
+        assert set(indices) == set(expected), "radius query disagrees with brute force"
+        _, nearest = index.nearest(qlat, qlon, k=10)
+        assert np.allclose(nearest, np.sort(distances)[:10]), "k-nearest disagrees with brute force"
+
+
+def time_queries(fn, points):
+    started = time.perf_counter()
+    for qlat, qlon in points:
+        fn(qlat, qlon)
+    return (time.perf_counter() - started) / len(points) * 1e6
+
+
+def run(rows, queries, seed=0):
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    built = GridSpatialIndex.build(make_frame(rows, rng))
+    build_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        built.save(directory)
+        started = time.perf_counter()
+        index = GridSpatialIndex.load(directory)
+        load_ms = (time.perf_counter() - started) * 1000
+        check(index, rng)
+
+        points = query_points(rng, queries)
+        results = {
+            'rows': len(index),
+            'build_s': build_seconds,
+            'mmap_load_ms': load_ms,
+            'knn10_us': time_queries(lambda a, b: index.nearest(a, b, k=10), points),
+            'radius_2km_us': time_queries(lambda a, b: index.within_radius(a, b, 2.0), points),
+            'radius_2km_rating_4.5_us': time_queries(
+                lambda a, b: index.within_radius(a, b, 2.0, min_rating=4.5), points),
+            'radius_2km_category_us': time_queries(
+                lambda a, b: index.within_radius(a, b, 2.0, category='Pizza restaurant'), points),
+            'bbox_1km_us': time_queries(
+                lambda a, b: index.within_bbox(a - 0.009, b - 0.012, a + 0.009, b + 0.012), points),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.queries)
+    print(f"Restaurants: {result['rows']} (build {result['build_s']:.2f}s, "
+          f"mmap load {result['mmap_load_ms']:.2f} ms)")
+    for key, value in result.items():
+        if key.endswith('_us'):
+            print(f"{key[:-3]:<24} {value:8.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
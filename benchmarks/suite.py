@@ -0,0 +1,352 @@
+"""Offline benchmark suite for the pipeline's hot paths.
+
+Every case runs from the recorded pages in benchmarks/fixtures (an Eater
+archive page, a c-mapstack__card article and a Google Maps place page) or
+from synthetic frames, so no live Eater or Google request is made. Pages
+that need a real fetch are served from a local HTTP server. Cases that
+need a browser (Google extraction) or PostgreSQL (insert_restaurant_data)
+are recorded as skipped when those are not available.
+
+Results go to a JSON file and are compared with a stored baseline; any
+case whose best time per item grows by more than --threshold is a
+regression and makes the run exit with status 1. The best of --repeat
+calls is compared rather than the median because it is far less
+sensitive to other load on the machine.
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --only eater_parse clean_address --repeat 10
+    python -m benchmarks.suite --save-baseline
+    python -m benchmarks.suite --record    # refresh the fixtures from the live sites
+"""
+import argparse
+import contextlib
+import datetime
+import functools
+import http.server
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from src.config.config import EATER_CONFIG, PROJECT_ROOT
+from src.config.database_config import DATABASE
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+RESULTS_DIR = Path(__file__).parent / 'results'
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+REGRESSION_THRESHOLD = 0.25
+
+ARCHIVE_FIXTURE = 'eater_archive_page.html'
+ARTICLE_FIXTURE = 'eater_article.html'
+PLACE_FIXTURE = 'google_maps_place.html'
+# Served under a Maps-style URL so the coordinates regex sees '@lat,lon'
+PLACE_PATH = '/maps/place/Joe%27s+Pizza/@40.7306,-73.9866,17z'
+
+CASES = {}
+
+
+class Skip(Exception):
+    """Raised by a case's setup when what it needs is not available"""
+
+
+def case(name):
+    """Register a setup function returning (callable, items per call)"""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def fixture(name):
+    return (FIXTURES_DIR / name).read_text(encoding='utf-8')
+
+
+class _FixtureHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = PLACE_FIXTURE if self.path.startswith('/maps/place/') else self.path.lstrip('/')
+        path = FIXTURES_DIR / name
+        if '/' in name or not path.is_file():
+            self.send_error(404)
+            return
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def fixture_server():
+    """Base URL of a local server for the fixtures, started on first use"""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _FixtureHandler)
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@functools.lru_cache(maxsize=None)
+def benchmark_driver():
+    from src.utils.webdriver_manager import WebDriverManager
+    try:
+        return WebDriverManager.checkout(timeout=30)
+    except Exception as e:
+        raise Skip(f"no WebDriver available: {e}")
+
+
+@case('archive_parse')
+def archive_parse():
+    from src.scrapers.archive_crawler import parse_archive_entries
+    html = fixture(ARCHIVE_FIXTURE)
+    return functools.partial(parse_archive_entries, html), len(parse_archive_entries(html))
+
+
+@case('eater_parse')
+def eater_parse():
+    from src.scrapers.EAS import parse_eater_cards
+    html = fixture(ARTICLE_FIXTURE)
+    return functools.partial(parse_eater_cards, html), parse_eater_cards(html)[0]
+
+
+@case('eater_fetch_http')
+def eater_fetch_http():
+    from src.scrapers.EAS import fetch_cards_http
+    url = f"{fixture_server()}/{ARTICLE_FIXTURE}"
+    return functools.partial(fetch_cards_http, url), fetch_cards_http(url)[0]
+
+
+def google_fetch(extraction_mode):
+    from src.scrapers.FetchGoogleData import fetch_google_maps_data
+    driver = benchmark_driver()
+    url = fixture_server() + PLACE_PATH
+    return functools.partial(fetch_google_maps_data, url, driver, extraction_mode=extraction_mode), 1
+
+
+case('google_fetch')(functools.partial(google_fetch, 'webdriver'))
+case('google_fetch_snapshot')(functools.partial(google_fetch, 'snapshot'))
+
+
+@case('google_snapshot_parse')
+def google_snapshot_parse():
+    from src.scrapers.FetchGoogleData import parse_place_snapshot
+    html = fixture(PLACE_FIXTURE)
+    return functools.partial(parse_place_snapshot, html, PLACE_PATH), 1
+
+
+@case('google_extract_attributes')
+def google_extract_attributes():
+    from selenium.webdriver.common.by import By
+    from src.scrapers.FetchGoogleData import extract_attributes
+    driver = benchmark_driver()
+    driver.get(fixture_server() + PLACE_PATH)
+    sections = driver.find_elements(By.CSS_SELECTOR, 'div.m6QErb[role="region"] div.iP2t7d')
+
+    def run():
+        for section in sections:
+            extract_attributes(section)
+    return run, len(sections)
+
+
+@case('clean_address')
+def clean_address():
+    from benchmarks.bench_address_cleaning import make_addresses
+    from src.data_processing.cleanAddrRestaurants import clean_and_split_address, _clean_and_split_address
+    addresses = make_addresses(20000)
+
+    def run():
+        _clean_and_split_address.cache_clear()
+        for address in addresses:
+            clean_and_split_address(address)
+    return run, len(addresses)
+
+
+@case('remove_duplicates')
+def remove_duplicates_case():
+    from benchmarks.bench_dedup import make_rows
+    from src.data_processing.cleanAddrRestaurants import remove_duplicates
+    df, _ = make_rows(50000)
+    return functools.partial(remove_duplicates, df), len(df)
+
+
+@case('fill_missing_city')
+def fill_missing_city_case():
+    from benchmarks.bench_dedup import make_rows
+    from src.data_processing.cleanAddrRestaurants import fill_missing_city
+    df, _ = make_rows(50000)
+    return (lambda: fill_missing_city(df.copy())), len(df)
+
+
+@case('db_insert')
+def db_insert():
+    import psycopg2
+    from benchmarks.bench_db_load import ensure_database, make_rows
+    from src.database.db_operations import RestaurantDB
+    try:
+        ensure_database(DATABASE['database'])
+    except psycopg2.Error as e:
+        raise Skip(f"PostgreSQL not reachable: {str(e).strip()}")
+    db = RestaurantDB()
+    db.create_tables()
+    df = make_rows(2000)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.insert_restaurant_data(df.copy())
+    return run, len(df)
+
+
+def measure(func, repeat):
+    """Seconds for each of repeat calls, after one warm-up call"""
+    func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def run_case(name, repeat):
+    try:
+        func, items = CASES[name]()
+        samples = measure(func, repeat)
+    except Skip as e:
+        return {'status': 'skipped', 'reason': str(e)}
+    except Exception as e:
+        return {'status': 'error', 'reason': f"{type(e).__name__}: {e}"}
+    median = statistics.median(samples)
+    return {
+        'status': 'ok',
+        'items': items,
+        'repeat': repeat,
+        'median_s': median,
+        'min_s': min(samples),
+        'stdev_s': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'median_us_per_item': median / max(items, 1) * 1e6,
+        'best_us_per_item': min(samples) / max(items, 1) * 1e6,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_suite(names, repeat):
+    results = {}
+    for name in names:
+        results[name] = run_case(name, repeat)
+        print(format_case(name, results[name]), flush=True)
+    return {
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cases': results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """(case, baseline us/item, current us/item, ratio, regressed) for cases timed in both runs"""
+    rows = []
+    for name, current in results['cases'].items():
+        previous = baseline.get('cases', {}).get(name)
+        if current.get('status') != 'ok' or not previous or previous.get('status') != 'ok':
+            continue
+        before, after = previous['best_us_per_item'], current['best_us_per_item']
+        ratio = after / before if before else float('inf')
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_case(name, result):
+    if result['status'] != 'ok':
+        return f"{name:<28} {result['status']}: {result['reason']}"
+    return (f"{name:<28} {result['median_s'] * 1e3:9.2f} ms/call  "
+            f"{result['median_us_per_item']:10.2f} us/item  ({result['items']} items, "
+            f"stdev {result['stdev_s'] * 1e3:.2f} ms)")
+
+
+def record_fixtures():
+    """Overwrite the fixtures with freshly fetched live pages"""
+    from src.scrapers.archive_crawler import parse_archive_entries
+    from src.utils.http_client import get_http_session, random_headers
+    from src.utils.webdriver_manager import WebDriverManager
+
+    session = get_http_session()
+    archive = session.get(EATER_CONFIG['base_url'], headers=random_headers(), timeout=30)
+    archive.raise_for_status()
+    (FIXTURES_DIR / ARCHIVE_FIXTURE).write_text(archive.text, encoding='utf-8')
+
+    article_url = parse_archive_entries(archive.text)[0]
+    article = session.get(article_url, headers=random_headers(), timeout=30)
+    article.raise_for_status()
+    (FIXTURES_DIR / ARTICLE_FIXTURE).write_text(article.text, encoding='utf-8')
+
+    from src.scrapers.EAS import parse_eater_cards
+    maps_link = parse_eater_cards(article.text)[1][0]['Google Maps Link']
+    with WebDriverManager.driver() as driver:
+        from src.scrapers.FetchGoogleData import fetch_google_maps_data
+        fetch_google_maps_data(maps_link, driver)
+        (FIXTURES_DIR / PLACE_FIXTURE).write_text(driver.page_source, encoding='utf-8')
+    print(f"Recorded fixtures from {EATER_CONFIG['base_url']}, {article_url} and {maps_link}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), help="cases to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed calls per case")
+    parser.add_argument('--output', type=Path,
+                        help="results JSON (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed slowdown per item before a case counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--database', default='restaurants_bench', help="scratch database for db_insert")
+    parser.add_argument('--record', action='store_true', help="refresh the fixtures from the live sites and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+        return 0
+
+    DATABASE['database'] = args.database
+    results = run_suite(args.only or list(CASES), args.repeat)
+
+    output = args.output or RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(f"Results written to {output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    rows = compare(results, json.loads(args.baseline.read_text(encoding='utf-8')), args.threshold)
+    for name, before, after, ratio, regressed in rows:
+        print(f"{name:<28} {before:10.2f} -> {after:10.2f} us/item  {ratio:5.2f}x"
+              f"{'  REGRESSION' if regressed else ''}")
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"No regressions above {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+import argparse
+import logging
+from src.config.config import ENHANCED_RESTAURANTS_CSV, SPATIAL_INDEX_CONFIG
+from src.database import RestaurantDB
+from src.utils.spatial_index import GridSpatialIndex
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def build_spatial_index(from_database=False, csv_path=ENHANCED_RESTAURANTS_CSV, output_dir=None):
+    """Build the restaurant spatial index and save it for memory-mapped loading"""
+    if from_database:
+        index = GridSpatialIndex.from_database(RestaurantDB())
+    else:
+        index = GridSpatialIndex.from_csv(csv_path)
+    index.save(output_dir or SPATIAL_INDEX_CONFIG['path'])
+    return index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the in-process restaurant spatial index")
+    parser.add_argument('--from-db', action='store_true', help="read coordinates from PostgreSQL instead of the CSV")
+    parser.add_argument('--csv', default=ENHANCED_RESTAURANTS_CSV, help="enhanced restaurants CSV")
+    parser.add_argument('--output', help="index directory (default: SPATIAL_INDEX_CONFIG['path'])")
+    args = parser.parse_args()
+    build_spatial_index(args.from_db, args.csv, args.output)
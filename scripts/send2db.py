@@ -1,47 +1,97 @@
+import argparse
 import pandas as pd
 import sys
+import time
 from src.database import RestaurantDB
+from src.config.database_config import DB_LOAD_CONFIG
 from pathlib import Path
 
-def load_csv_to_database():
+# A chunk is held as parsed rows, a normalised copy and a CSV buffer for COPY
+CHUNK_COPIES_IN_MEMORY = 3
+# Rows read first to measure the per-row footprint before sizing real chunks
+PROBE_ROWS = 1000
+
+def normalize_chunk(chunk):
+    """Drop rows without a name and turn blank / 'Not available' cells into NULLs"""
+    valid = chunk.dropna(subset=['Restaurant Name'])
+    blank = valid.apply(lambda column: column.str.strip().eq(''))
+    return valid.mask(blank | valid.eq('Not available')), len(chunk) - len(valid)
+
+def next_chunk_rows(chunk, chunk_rows, memory_limit_mb):
+    """Size the next chunk from the measured per-row footprint of the last one"""
+    if chunk.empty:
+        return chunk_rows
+    bytes_per_row = chunk.memory_usage(deep=True).sum() / len(chunk)
+    budget_rows = int(memory_limit_mb * 1024 * 1024 / (bytes_per_row * CHUNK_COPIES_IN_MEMORY))
+    return max(1, min(chunk_rows, budget_rows))
+
+def load_csv_to_database(csv_path=None, chunk_rows=None, memory_limit_mb=None):
+    """Stream the enhanced CSV into the database chunk by chunk.
+
+    Chunks start at chunk_rows rows and shrink if their measured size would
+    exceed memory_limit_mb. Each chunk is normalised and upserted on its own,
+    so peak memory is bounded by the ceiling rather than the file size.
+    """
     print("Starting database loading process...")
+    chunk_rows = chunk_rows or DB_LOAD_CONFIG['chunk_rows']
+    memory_limit_mb = memory_limit_mb or DB_LOAD_CONFIG['memory_limit_mb']
     try:
-        enhanced_csv = Path("data/processed/cleaned_restaurants_enhanced.csv")
+        enhanced_csv = Path(csv_path or "data/processed/cleaned_restaurants_enhanced.csv")
         print(f"Looking for CSV at: {enhanced_csv.absolute()}")
-        
+
         if not enhanced_csv.exists():
             print(f"ERROR: CSV file not found at: {enhanced_csv.absolute()}")
             return False
-            
+
         print("CSV found. Attempting database connection...")
         db = RestaurantDB()
         try:
             db.connect()
-            db.create_tables()            
-            final_df = pd.read_csv(enhanced_csv)
-            if final_df.empty:
+            db.create_tables()
+            total_bytes = enhanced_csv.stat().st_size
+            loaded = filtered = chunks = 0
+            started = time.monotonic()
+
+            with open(enhanced_csv, 'r', encoding='utf-8', newline='') as f:
+                reader = pd.read_csv(f, dtype=str, iterator=True)
+                size = min(chunk_rows, PROBE_ROWS)
+                while True:
+                    try:
+                        chunk = reader.get_chunk(size)
+                    except StopIteration:
+                        break
+                    chunks += 1
+                    size = next_chunk_rows(chunk, chunk_rows, memory_limit_mb)
+
+                    valid_chunk, dropped = normalize_chunk(chunk)
+                    filtered += dropped
+                    if not valid_chunk.empty:
+                        db.bulk_load_restaurant_data(valid_chunk)
+                    loaded += len(valid_chunk)
+
+                    elapsed = time.monotonic() - started
+                    done = f.tell() / total_bytes if total_bytes else 1.0
+                    print(f"Chunk {chunks}: {loaded} records loaded ({done:.0%} of file, "
+                          f"{loaded / elapsed if elapsed else 0:.0f} rows/s, next chunk {size} rows)")
+
+            if not chunks:
                 print("ERROR: CSV file is empty")
                 return False
-            
-            valid_df = final_df.dropna(subset=['Restaurant Name'])
-            
-            if len(valid_df) < len(final_df):
-                print(f"Filtered out {len(final_df) - len(valid_df)} invalid records")
-            
-            print(f"Found {len(valid_df)} valid records to insert")
-            
-            valid_df = valid_df.replace(r'^\s*$', None, regex=True)
-            valid_df = valid_df.replace('Not available', None)
-            
-            db.insert_restaurant_data(valid_df)
-            print("Data successfully loaded into database")
+            if filtered:
+                print(f"Filtered out {filtered} invalid records")
+            print(f"Data successfully loaded into database: {loaded} records in {chunks} chunks")
             return True
         finally:
             db.close()
-                
+
     except Exception as e:
         print(f"ERROR: {str(e)}", file=sys.stderr)
         raise
 
 if __name__ == "__main__":
-    load_csv_to_database()
+    parser = argparse.ArgumentParser(description="Load the enhanced restaurants CSV into PostgreSQL")
+    parser.add_argument('--csv', help="CSV to load (default: data/processed/cleaned_restaurants_enhanced.csv)")
+    parser.add_argument('--chunk-rows', type=int, help="maximum rows per chunk")
+    parser.add_argument('--memory-limit-mb', type=int, help="memory ceiling for one chunk")
+    args = parser.parse_args()
+    load_csv_to_database(args.csv, args.chunk_rows, args.memory_limit_mb)
@@ -12,6 +12,7 @@
     package_dir={"": "src"},
     install_requires=[
         'pandas>=1.3.0',
+        'numpy>=1.21.0',
         'requests>=2.26.0',
         'beautifulsoup4>=4.9.3',
         'selenium>=4.0.0',
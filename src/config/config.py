@@ -7,11 +7,15 @@
 DATA_DIR = PROJECT_ROOT / "data"
 RAW_DATA_DIR = DATA_DIR / "raw"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
+LOGS_DIR = PROJECT_ROOT / "logs"
 
 RAW_RESTAURANTS_CSV = RAW_DATA_DIR / "raw_restaurants.csv"
 CLEANED_RESTAURANTS_CSV = RAW_DATA_DIR / "cleaned_restaurants.csv"
 ENHANCED_RESTAURANTS_CSV = PROCESSED_DATA_DIR / "cleaned_restaurants_enhanced.csv"
 MISSING_RESTAURANTS_CSV = RAW_DATA_DIR / "missing_restaurants.csv"
+CHECKPOINT_JOURNAL_DB = PROCESSED_DATA_DIR / "enrichment_journal.db"
+GOOGLE_MAPS_CACHE_DB = PROCESSED_DATA_DIR / "google_maps_cache.db"
+SPATIAL_INDEX_DIR = PROCESSED_DATA_DIR / "spatial_index"
 
 REQUIRED_RESTAURANT_FIELDS = [
     'Restaurant Name',
@@ -69,7 +73,34 @@
         'page_load': (5, 10),
         'between_articles': (5, 10),
         'between_pages': (2, 5)
-    }
+    },
+    'crawler': {
+        'max_concurrency_per_host': 4,
+        'politeness_delay': 0.5,
+        'max_retries': 3,
+        'retry_backoff': 1.0,
+        'request_timeout': 30,
+        'article_delay': 0.5
+    },
+    'fetch_mode': 'auto'
+}
+
+HTML_PARSER_CONFIG = {
+    # 'auto' uses lxml when it is installed, else the stdlib html.parser
+    'backend': 'auto'
+}
+
+PARSE_POOL_CONFIG = {
+    # Parser processes fed by the fetching threads; None uses one per spare
+    # core up to max_auto_workers, 0 parses inline in the fetching thread
+    'workers': None,
+    'max_auto_workers': 4,
+    'start_method': 'spawn'
+}
+
+HTTP_CONFIG = {
+    'pool_connections': 10,
+    'pool_maxsize': 20
 }
 
 CHROME_OPTIONS = [
@@ -98,6 +129,37 @@
     'element_wait': 10 
 }
 
+GOOGLE_MAPS_CONFIG = {
+    'latency_budget': 20,
+    'basic_info_timeout': 5,
+    'about_tab_timeout': 2,
+    'info_container_timeout': 5,
+    'section_settle_timeout': 5,
+    'poll_interval': 0.25,
+    'stable_polls': 2,
+    # 'snapshot' parses one page_source copy; 'webdriver' reads each element live
+    'extraction_mode': 'snapshot'
+}
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+GOOGLE_MAPS_CACHE_CONFIG = {
+    'enabled': True,
+    'path': GOOGLE_MAPS_CACHE_DB,
+    # Fields not listed in a group fall into 'attributes'
+    'field_groups': {
+        'reviews': ['Star Rating', 'Number of Reviews'],
+        'place': ['Restaurant Category', 'Price Range', 'Latitude', 'Longitude'],
+    },
+    'ttl': {
+        'reviews': 7 * SECONDS_PER_DAY,
+        'place': 90 * SECONDS_PER_DAY,
+        'attributes': 30 * SECONDS_PER_DAY
+    },
+    'max_entries': 100000,
+    'max_age': 180 * SECONDS_PER_DAY
+}
+
 DEFAULT_VALUES = {
     'name': "Name Not Found",
     'description': "Description Not Found",
@@ -137,7 +199,10 @@
     'driver_path': None,
     'implicit_wait': 10,
     'page_load_timeout': 30,
-    'options': CHROME_OPTIONS
+    'options': CHROME_OPTIONS,
+    'pool_size': 4,
+    'max_page_loads': 200,
+    'checkout_timeout': 300
 }
 
 logging.getLogger('selenium').setLevel(logging.ERROR)
@@ -155,6 +220,66 @@
 PARALLEL_PROCESSING_CONFIG = {
     'num_workers': 4,
     'timeout_seconds': 1800,
-    'chunk_size': 100
+    'chunk_size': 100,
+    'batch_size': 1
+}
+
+CSV_WRITER_CONFIG = {
+    'batch_size': 50,
+    'flush_interval': 1.0,
+    'fsync': False,
+    'queue_size': 10000
+}
+
+SPATIAL_INDEX_CONFIG = {
+    'path': SPATIAL_INDEX_DIR,
+    'cell_size_deg': 0.01
+}
+
+DEDUP_CONFIG = {
+    'name_threshold': 0.85,
+    'address_threshold': 0.8,
+    'geohash_precision': 6,
+    # Each row is compared only with rows sharing one of its rarest name tokens
+    'candidate_tokens': 2
+}
+
+STREAMING_PIPELINE_CONFIG = {
+    # Bounded queues between stages; a full queue blocks the stage feeding it
+    'enrich_queue_size': 200,
+    'db_queue_size': 1000,
+    # Defaults to one browser fewer than the pool so the scraper's Selenium
+    # fallback can still borrow one
+    'enrich_workers': None,
+    'db_batch_rows': 100,
+    'db_flush_interval': 5.0,
+    'status_interval': 60.0
 }
 
+METRICS_CONFIG = {
+    'enabled': True,
+    # Written when the process exits, if anything was recorded
+    'export_at_exit': True,
+    'directory': LOGS_DIR,
+    'prometheus_file': 'pipeline_metrics.prom',
+    'summary_file': 'pipeline_run_summary.json',
+    'prefix': 'restaurant_pipeline',
+    # Samples kept per series for the p50/p95/p99 estimates
+    'max_samples': 10000
+}
+
+PROFILING_CONFIG = {
+    # Reports go to a profile_<timestamp> directory here
+    'directory': LOGS_DIR,
+    'top_n': 25,
+    'sample_interval': 0.01,
+    # Allocation tracking slows allocation-heavy stages several times over
+    'tracemalloc': True,
+    # Threads that run a stage of their own in the streaming pipeline
+    'thread_stages': {
+        'pipeline-source': 'scraping',
+        'archive-': 'scraping',
+        'pipeline-enrich': 'enrichment',
+        'pipeline-db': 'db_load'
+    }
+}
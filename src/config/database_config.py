@@ -13,6 +13,19 @@
     'log_path': PROJECT_ROOT / 'logs' / 'database.log'
 }
 
+DB_POOL_CONFIG = {
+    'min_connections': 1,
+    'max_connections': 10,
+    'checkout_timeout': 30,
+    'itersize': 2000
+}
+
+DB_LOAD_CONFIG = {
+    'copy_chunk_rows': 50000,
+    'chunk_rows': 100000,
+    'memory_limit_mb': 256
+}
+
 RESTAURANT_SCHEMA = {
     'core_fields': [
         'restaurant_name',
@@ -1,8 +1,17 @@
-from .cleanAddrRestaurants import clean_and_split_address, remove_duplicates, fill_missing_city
+from .cleanAddrRestaurants import (
+    clean_and_split_address,
+    clean_and_split_addresses,
+    remove_duplicates,
+    fill_missing_city
+)
+from .fuzzy_dedup import FuzzyDeduplicator, IncrementalDeduplicator, fuzzy_remove_duplicates
 
 __all__ = [
     'clean_and_split_address',
+    'clean_and_split_addresses',
     'remove_duplicates',
-    'fill_missing_city'
+    'fill_missing_city',
+    'FuzzyDeduplicator',
+    'IncrementalDeduplicator',
+    'fuzzy_remove_duplicates'
 ]
-
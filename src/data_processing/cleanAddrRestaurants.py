@@ -1,21 +1,76 @@
 import pandas as pd
 import re
+import threading
+from collections import Counter, defaultdict
+from functools import lru_cache
+from .fuzzy_dedup import fuzzy_remove_duplicates
 from ..config.config import RAW_RESTAURANTS_CSV, CLEANED_RESTAURANTS_CSV, state_abbreviations
 
+ADDRESS_CACHE_SIZE = 65536
+ADDRESS_COLUMNS = ["Cleaned Address", "City", "State", "Zip"]
+
+def _trie_pattern(words):
+    """Build a regex alternation that walks the words as a character trie.
+
+    Sharing prefixes keeps the case-insensitive scan cheap, and optional
+    suffixes are greedy so the longest name at a position wins.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = '(?:' + '|'.join(branches) + ')' if len(branches) > 1 or '' in node else branches[0]
+        return body + '?' if '' in node else body
+
+    return build(trie)
+
+_STATE_NAMES = {name.casefold(): abbrev for name, abbrev in state_abbreviations.items()}
+STATE_NAME_PATTERN = re.compile(
+    r'\b(?=[a-z])' + _trie_pattern(state_abbreviations) + r'\b',
+    re.IGNORECASE
+)
+SPACE_BEFORE_COMMA_PATTERN = re.compile(r'\s+,')
+SPACE_AFTER_COMMA_PATTERN = re.compile(r',\s+')
+DC_ZIP_PATTERN = re.compile(r'^D\.C\.\s*(\d{5}(?:-\d{4})?)$')
+STATE_ZIP_PATTERN = re.compile(r'^([A-Z]{2})\s*(\d{5}(?:-\d{4})?)$')
+ZIP_PATTERN = re.compile(r'\b(\d{5}(?:-\d{4})?)\b')
+AMPERSAND_PATTERN = re.compile(r'(\d+)\s*&\s*(\d+[A-Za-z]?)')
+SUITE_PATTERN = re.compile(r'\b(floor|fl|ste|suite|#)\s*(\d+)', re.IGNORECASE)
+
+def _abbreviate_state(match):
+    return _STATE_NAMES.get(match.group(0).casefold(), match.group(0))
+
+def normalize_state_names(address):
+    """Replace full state names with their abbreviations in a single pass"""
+    return STATE_NAME_PATTERN.sub(_abbreviate_state, address)
+
 def clean_and_split_address(address):
     if not address:
         return {"Address": "", "City": "", "State": "", "Zip": ""}
 
-    for full_state, abbrev in state_abbreviations.items():
-        address = re.sub(r'\b' + re.escape(full_state) + r'\b', abbrev, address, flags=re.IGNORECASE)
+    return dict(zip(("Address", "City", "State", "Zip"), _clean_and_split_address(address)))
 
-    address = re.sub(r'\s+,', ',', address)
-    address = re.sub(r',\s+', ', ', address)
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _clean_and_split_address(address):
+    address = normalize_state_names(address)
+
+    address = SPACE_BEFORE_COMMA_PATTERN.sub(',', address)
+    address = SPACE_AFTER_COMMA_PATTERN.sub(', ', address)
 
     parts = [part.strip() for part in address.split(',') if part.strip()]
+    if not parts:
+        return ("", "", "", "")
+
     cleaned_address_components = {"Address": "", "City": "", "State": "", "Zip": ""}
 
-    dc_zip_match = re.match(r'^D\.C\.\s*(\d{5}(?:-\d{4})?)$', parts[-1])
+    dc_zip_match = DC_ZIP_PATTERN.match(parts[-1])
     if dc_zip_match:
         cleaned_address_components["City"] = "WA"
         cleaned_address_components["State"] = "DC"
@@ -24,14 +79,14 @@ def clean_and_split_address(address):
     else:
         if parts:
             last_part = parts[-1]
-            state_zip_match = re.match(r'^([A-Z]{2})\s*(\d{5}(?:-\d{4})?)$', last_part)
+            state_zip_match = STATE_ZIP_PATTERN.match(last_part)
             
             if state_zip_match:
                 cleaned_address_components["State"] = state_zip_match.group(1)
                 cleaned_address_components["Zip"] = state_zip_match.group(2)
                 parts.pop()
             else:
-                zip_match = re.search(r'\b(\d{5}(?:-\d{4})?)\b', last_part)
+                zip_match = ZIP_PATTERN.search(last_part)
                 if zip_match:
                     cleaned_address_components["Zip"] = zip_match.group(1)
                     state_part = last_part.replace(zip_match.group(1), '').strip()
@@ -48,23 +103,189 @@ def clean_and_split_address(address):
     if cleaned_address_components["State"] == "DC" and not cleaned_address_components["City"]:
         cleaned_address_components["City"] = "WA"
 
-    cleaned_address_components["Address"] = ', '.join(parts)
-
-    address = cleaned_address_components["Address"]
-    address = re.sub(r'(\d+)\s*&\s*(\d+[A-Za-z]?)', r'\1-\2', address)
-    address = re.sub(r'\b(floor|fl|ste|suite|#)\s*(\d+)', r'#\2', address, flags=re.IGNORECASE)
+    address = ', '.join(parts)
+    address = AMPERSAND_PATTERN.sub(r'\1-\2', address)
+    address = SUITE_PATTERN.sub(r'#\2', address)
     cleaned_address_components["Address"] = address
 
-    return cleaned_address_components
+    return (
+        cleaned_address_components["Address"],
+        cleaned_address_components["City"],
+        cleaned_address_components["State"],
+        cleaned_address_components["Zip"],
+    )
+
+# Batch equivalents used by clean_and_split_addresses. Parts are joined by ", "
+# once canonicalized, so the last part is whatever follows the final ", ".
+PART_SEPARATOR_PATTERN = re.compile(r'\s*,[\s,]*')
+OUTER_SEPARATOR_PATTERN = re.compile(r'\A[\s,]+|[\s,]+\Z')
+LAST_PART_PATTERN = re.compile(
+    r'\A(?:(?P<prefix>.*), )?'
+    r'(?:D\.C\.\s*(?P<dc_zip>\d{5}(?:-\d{4})?)'
+    r'|(?P<state>[A-Z]{2})\s*(?P<state_zip>\d{5}(?:-\d{4})?)'
+    r'|(?P<last>[^,]*))\Z',
+    re.DOTALL
+)
+CITY_PART_PATTERN = re.compile(r'\A(.*), ([^,]*)\Z', re.DOTALL)
+ZIP_RUN_PATTERN = re.compile(r'\d{5}')
+
+def clean_and_split_addresses(addresses):
+    """Vectorized clean_and_split_address for a Series of raw addresses.
+
+    Returns a DataFrame with the Cleaned Address/City/State/Zip columns on the
+    same index, matching the scalar function row for row. Missing values are
+    treated like empty addresses. Each distinct address is parsed only once.
+    """
+    addresses = pd.Series(addresses, dtype=object)
+    present = addresses.notna()
+    codes, uniques = pd.factorize(addresses[present].astype(str))
+
+    parsed = _clean_unique_addresses(pd.Series(uniques, dtype=object))
+
+    result = pd.DataFrame("", index=addresses.index, columns=ADDRESS_COLUMNS, dtype=object)
+    if len(codes):
+        result.loc[present, ADDRESS_COLUMNS] = parsed.to_numpy()[codes]
+    return result
+
+def _clean_unique_addresses(raw):
+    canon = (raw.str.replace(STATE_NAME_PATTERN, _abbreviate_state, regex=True)
+                .str.replace(PART_SEPARATOR_PATTERN, ', ', regex=True)
+                .str.replace(OUTER_SEPARATOR_PATTERN, '', regex=True))
+
+    parts = canon.str.extract(LAST_PART_PATTERN)
+    is_dc = parts['dc_zip'].notna()
+    is_state_zip = parts['state_zip'].notna()
+
+    state = pd.Series("", index=raw.index, dtype=object)
+    zip_code = pd.Series("", index=raw.index, dtype=object)
+    state[is_dc] = "DC"
+    zip_code[is_dc] = parts['dc_zip'][is_dc]
+    state[is_state_zip] = parts['state'][is_state_zip]
+    zip_code[is_state_zip] = parts['state_zip'][is_state_zip]
+
+    # Only a minority of rows fall through to the zip search, so the remaining
+    # checks run on that subset alone.
+    last = parts['last'].dropna()
+    zip_search = last.str.extract(ZIP_PATTERN)[0]
+    is_zip = zip_search.notna()
+    state_part = last[is_zip].str.replace(ZIP_PATTERN, '', n=1, regex=True).str.strip()
+    has_state_part = (state_part.str.len() == 2) & state_part.str.isupper()
+    is_state = ~is_zip & (last.str.len() == 2) & last.str.isupper()
+    repeated_zip = last[is_zip].str.count(ZIP_RUN_PATTERN) > 1
+
+    zip_code[is_zip[is_zip].index] = zip_search[is_zip]
+    state[has_state_part[has_state_part].index] = state_part[has_state_part]
+    state[is_state[is_state].index] = last[is_state]
+
+    popped = is_dc | is_state_zip
+    popped[is_zip[is_zip].index] = True
+    popped[is_state[is_state].index] = True
+
+    rest = parts['prefix'].fillna('').where(popped, canon)
+    city_split = rest.str.extract(CITY_PART_PATTERN)
+    has_city = city_split[0].notna()
+
+    city = pd.Series("", index=raw.index, dtype=object)
+    city[is_dc] = "WA"
+    city[has_city] = city_split[1][has_city]
+    city[(state == "DC") & (city == "")] = "WA"
+
+    street = city_split[0].where(has_city, rest)
+    has_ampersand = street.str.contains('&', regex=False)
+    street[has_ampersand] = street[has_ampersand].str.replace(AMPERSAND_PATTERN, r'\1-\2', regex=True)
+    street = street.str.replace(SUITE_PATTERN, r'#\2', regex=True)
+
+    result = pd.DataFrame({
+        "Cleaned Address": street,
+        "City": city,
+        "State": state,
+        "Zip": zip_code,
+    }, index=raw.index)
+
+    # A zip repeated in the last part is removed everywhere by the scalar
+    # str.replace, which a single regex pass cannot mirror; parse those directly.
+    for idx in repeated_zip[repeated_zip].index:
+        result.loc[idx] = list(_clean_and_split_address(raw[idx]))
+
+    return result
 
 def fill_missing_city(df):
-    grouped = df.groupby(['State', 'Zip'])
-    for (state, zip_code), group in grouped:
-        cities = group['City'][group['City'] != ''].unique()
-        if len(cities) == 1:
-            df.loc[(df['State'] == state) & (df['Zip'] == zip_code), 'City'] = cities[0]
+    """Fill blank cities where every known city for the (State, Zip) agrees"""
+    cities = df['City'].where(df['City'].notna() & (df['City'] != ''))
+    grouped = cities.groupby([df['State'], df['Zip']])
+    single_city = grouped.transform('nunique') == 1
+    df.loc[single_city, 'City'] = grouped.transform('first')[single_city]
     return df
 
+class CityBackfill:
+    """Incremental fill_missing_city for rows written one at a time.
+
+    Keeps the set of cities seen for each (State, Zip) so a row without a
+    city can be filled when it is written, and remembers the keys of rows
+    that could not be filled yet so only those need revisiting later.
+    """
+
+    def __init__(self):
+        self._cities = defaultdict(set)
+        self._pending = Counter()
+        self._lock = threading.Lock()
+
+    def seed(self, df):
+        """Reset state from an existing DataFrame of cleaned rows"""
+        with self._lock:
+            self._cities.clear()
+            self._pending.clear()
+            for state, zip_code, city in zip(df['State'], df['Zip'], df['City']):
+                self._observe(state, zip_code, city)
+
+    def apply(self, entry):
+        """Record entry's city, or fill it in when the (State, Zip) has exactly one"""
+        with self._lock:
+            city = self._observe(entry.get('State'), entry.get('Zip'), entry.get('City'))
+        if city and not _has_value(entry.get('City')):
+            entry = {**entry, 'City': city}
+        return entry
+
+    def resolvable(self):
+        """Map of (State, Zip) -> city for pending rows that can now be filled"""
+        with self._lock:
+            return {
+                key: next(iter(self._cities[key]))
+                for key in self._pending
+                if len(self._cities.get(key, ())) == 1
+            }
+
+    def fill(self, df):
+        """Fill blank cities in df for resolvable keys; returns the number of rows filled"""
+        resolved = self.resolvable()
+        if not resolved:
+            return 0
+        missing = ~df['City'].map(_has_value)
+        keys = zip(df.loc[missing, 'State'], df.loc[missing, 'Zip'])
+        cities = pd.Series([resolved.get(key) for key in keys], index=df.index[missing], dtype=object)
+        cities = cities.dropna()
+        df.loc[cities.index, 'City'] = cities
+        with self._lock:
+            for key in resolved:
+                self._pending.pop(key, None)
+        return len(cities)
+
+    def _observe(self, state, zip_code, city):
+        if not (_has_value(state) and _has_value(zip_code)):
+            return None
+        key = (state, zip_code)
+        if _has_value(city):
+            self._cities[key].add(city)
+            return None
+        cities = self._cities.get(key)
+        if cities and len(cities) == 1:
+            return next(iter(cities))
+        self._pending[key] += 1
+        return None
+
+def _has_value(value):
+    return isinstance(value, str) and value != ''
+
 def remove_duplicates(df):
     df = df.sort_values(['Restaurant Name', 'Cleaned Address', 'City', 'Zip'], 
                         na_position='last').reset_index(drop=True)
@@ -84,13 +305,11 @@ def process_restaurant_data(input_file=RAW_RESTAURANTS_CSV, output_file=CLEANED_
     """Main function to process restaurant data"""
     data = pd.read_csv(input_file)
     
-    data[["Cleaned Address", "City", "State", "Zip"]] = data['Address'].apply(
-        lambda x: pd.Series(clean_and_split_address(x))
-    )
+    data[ADDRESS_COLUMNS] = clean_and_split_addresses(data['Address'])
     
     data = data[data['Zip'].notna() & (data['Zip'] != '')]
     data = fill_missing_city(data)
-    data = remove_duplicates(data)
+    data = fuzzy_remove_duplicates(data)
     
     data.to_csv(output_file, index=False)
     print(f"Cleaned and deduplicated data has been saved to {output_file}")
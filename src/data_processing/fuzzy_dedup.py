@@ -0,0 +1,327 @@
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+import numpy as np
+import pandas as pd
+from ..config.config import DEDUP_CONFIG
+
+logger = logging.getLogger(__name__)
+
+GEOHASH_BASE32 = np.array(list('0123456789bcdefghjkmnpqrstuvwxyz'))
+
+STREET_ABBREVIATIONS = {
+    'street': 'st', 'avenue': 'ave', 'av': 'ave', 'road': 'rd', 'boulevard': 'blvd',
+    'drive': 'dr', 'lane': 'ln', 'place': 'pl', 'court': 'ct', 'square': 'sq',
+    'highway': 'hwy', 'parkway': 'pkwy', 'terrace': 'ter', 'suite': 'ste',
+    'north': 'n', 'south': 's', 'east': 'e', 'west': 'w', 'floor': 'fl',
+}
+STREET_PATTERN = re.compile(r'\b(' + '|'.join(STREET_ABBREVIATIONS) + r')\b')
+APOSTROPHE_PATTERN = re.compile(r"['’`]")
+NON_WORD_PATTERN = re.compile(r'[^\w\s]+')
+HOUSE_NUMBER_PATTERN = re.compile(r'^(\d+)')
+NAME_STOPWORDS = {'the'}
+
+def _normalize_one(text):
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().casefold()
+    text = NON_WORD_PATTERN.sub(' ', APOSTROPHE_PATTERN.sub('', text.replace('&', ' and ')))
+    return ' '.join(text.split())
+
+def _map_unique(series, func):
+    """Apply func once per distinct value of series"""
+    codes, uniques = pd.factorize(series.fillna('').astype(str))
+    mapped = np.array([func(value) for value in uniques] + [''], dtype=object)
+    return pd.Series(mapped[codes], index=series.index)
+
+def _normalize_name(text):
+    name = _normalize_one(text)
+    return ' '.join(t for t in name.split() if t not in NAME_STOPWORDS) or name
+
+def _normalize_address(text):
+    return STREET_PATTERN.sub(lambda match: STREET_ABBREVIATIONS[match.group(1)], _normalize_one(text))
+
+def normalize_names(names):
+    """Casefolded, accent- and punctuation-free names: "Joe's Café" -> "joes cafe" """
+    return _map_unique(names, _normalize_name)
+
+def normalize_addresses(addresses):
+    """Normalized street addresses with abbreviated suffixes: "123 Main Street" -> "123 main st" """
+    return _map_unique(addresses, _normalize_address)
+
+def geohash(latitudes, longitudes, precision=None):
+    """Vectorized geohash of the given precision; NaN coordinates give None"""
+    precision = precision or DEDUP_CONFIG['geohash_precision']
+    lat = np.asarray(latitudes, dtype=np.float64)
+    lon = np.asarray(longitudes, dtype=np.float64)
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    result = np.full(len(lat), None, dtype=object)
+    if not valid.any():
+        return result
+
+    bits = precision * 5
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+    lat_cells = np.clip(((lat[valid] + 90) / 180 * (1 << lat_bits)).astype(np.int64), 0, (1 << lat_bits) - 1)
+    lon_cells = np.clip(((lon[valid] + 180) / 360 * (1 << lon_bits)).astype(np.int64), 0, (1 << lon_bits) - 1)
+
+    code = np.zeros(valid.sum(), dtype=np.int64)
+    for bit in range(bits):
+        # Geohash interleaves bits starting with longitude, most significant first
+        if bit % 2 == 0:
+            value = (lon_cells >> (lon_bits - 1 - bit // 2)) & 1
+        else:
+            value = (lat_cells >> (lat_bits - 1 - bit // 2)) & 1
+        code = (code << 1) | value
+
+    chars = [GEOHASH_BASE32[(code >> (5 * (precision - 1 - i))) & 31] for i in range(precision)]
+    result[valid] = [''.join(group) for group in zip(*chars)]
+    return result
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def labels(self):
+        return np.array([self.find(i) for i in range(len(self.parent))], dtype=np.int64)
+
+def _sequence_ratio(a, b, threshold=0.0):
+    """SequenceMatcher ratio, or 0.0 as soon as a cheap upper bound is below threshold"""
+    if 2 * min(len(a), len(b)) / (len(a) + len(b)) < threshold:
+        return 0.0
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
+
+def name_similarity(a, b, threshold=0.0):
+    """Max of token Jaccard and character similarity of two normalized names.
+
+    Character similarity is only computed when it could reach threshold.
+    """
+    if a == b:
+        return 1.0
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    jaccard = len(tokens_a & tokens_b) / len(tokens_a | tokens_b) if tokens_a or tokens_b else 0.0
+    if jaccard >= threshold and threshold:
+        return jaccard
+    return max(jaccard, _sequence_ratio(a, b, threshold))
+
+def address_similarity(a, b, threshold=0.0):
+    """Similarity of two normalized addresses; different house numbers never match"""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    number_a, number_b = HOUSE_NUMBER_PATTERN.match(a), HOUSE_NUMBER_PATTERN.match(b)
+    if number_a and number_b and number_a.group(1) != number_b.group(1):
+        return 0.0
+    return _sequence_ratio(a, b, threshold)
+
+class FuzzyDeduplicator:
+    """Cluster near-duplicate restaurants with blocking.
+
+    Rows are grouped into blocks by Zip and, when coordinates exist, by
+    geohash. Within a block a row is only compared with rows sharing one of
+    its rarest name tokens, and a pair matches when both the normalized
+    names and addresses are similar enough. Rows with the same normalized
+    name in the same Zip or City/State always match, as in
+    remove_duplicates. Matches are merged into clusters with union-find.
+    """
+
+    def __init__(self, name_threshold=None, address_threshold=None, candidate_tokens=None):
+        self.name_threshold = name_threshold or DEDUP_CONFIG['name_threshold']
+        self.address_threshold = address_threshold or DEDUP_CONFIG['address_threshold']
+        self.candidate_tokens = candidate_tokens or DEDUP_CONFIG['candidate_tokens']
+        self.stats = {}
+
+    def cluster(self, df):
+        """Return a cluster label per row (the position of the cluster's first row)"""
+        started = time.monotonic()
+        n = len(df)
+        names = normalize_names(df['Restaurant Name'])
+        addresses = normalize_addresses(df['Cleaned Address'] if 'Cleaned Address' in df else df['Address'])
+        house_numbers = addresses.str.extract(HOUSE_NUMBER_PATTERN, expand=False).fillna('').tolist()
+        names, addresses = names.tolist(), addresses.tolist()
+        union_find = _UnionFind(n)
+
+        exact_groups = 0
+        for columns in (['Zip'], ['City', 'State']):
+            if not set(columns).issubset(df.columns):
+                continue
+            keys = [df[column].fillna('').astype(str).str.strip().str.casefold().to_numpy() for column in columns]
+            has_key = np.logical_and.reduce([key != '' for key in keys])
+            combined = pd.Series(names).str.cat([pd.Series(key) for key in keys], sep='\x1f')
+            codes = pd.factorize(combined.where(has_key))[0]
+            keyed = np.flatnonzero(codes >= 0)
+            group_codes, first = np.unique(codes[keyed], return_index=True)
+            first_row = np.full(len(group_codes) and group_codes[-1] + 1, -1, dtype=np.int64)
+            first_row[group_codes] = keyed[first]
+            duplicates = keyed[first_row[codes[keyed]] != keyed]
+            exact_groups += len(np.unique(codes[duplicates]))
+            for row, first in zip(duplicates.tolist(), first_row[codes[duplicates]].tolist()):
+                union_find.union(first, row)
+
+        blocks = defaultdict(list)
+        if 'Zip' in df:
+            for i, zip_code in enumerate(df['Zip'].fillna('').astype(str).str.strip()):
+                if zip_code:
+                    blocks['zip:' + zip_code].append(i)
+        if {'Latitude', 'Longitude'}.issubset(df.columns):
+            hashes = geohash(pd.to_numeric(df['Latitude'], errors='coerce'),
+                             pd.to_numeric(df['Longitude'], errors='coerce'))
+            for i, cell in enumerate(hashes):
+                if cell:
+                    blocks['geo:' + cell].append(i)
+
+        compared, matched = 0, 0
+        for rows in blocks.values():
+            if len(rows) < 2:
+                continue
+            token_counts = Counter(token for i in rows for token in set(names[i].split()))
+            postings = defaultdict(list)
+            for i in rows:
+                tokens = sorted(set(names[i].split()), key=lambda token: (token_counts[token], token))
+                for token in tokens[:self.candidate_tokens]:
+                    postings[token].append(i)
+
+            seen = set()
+            for members in postings.values():
+                for x in range(len(members)):
+                    for y in range(x + 1, len(members)):
+                        pair = (members[x], members[y])
+                        if pair in seen:
+                            continue
+                        seen.add(pair)
+                        compared += 1
+                        a, b = pair
+                        if house_numbers[a] and house_numbers[b] and house_numbers[a] != house_numbers[b]:
+                            continue
+                        if union_find.find(a) == union_find.find(b):
+                            continue
+                        if (address_similarity(addresses[a], addresses[b], self.address_threshold)
+                                >= self.address_threshold
+                                and name_similarity(names[a], names[b], self.name_threshold)
+                                >= self.name_threshold):
+                            union_find.union(a, b)
+                            matched += 1
+
+        labels = union_find.labels()
+        self.stats = {
+            'rows': n,
+            'blocks': sum(1 for rows in blocks.values() if len(rows) > 1),
+            'exact_groups': exact_groups,
+            'pairs_compared': compared,
+            'fuzzy_matches': matched,
+            'clusters': len(np.unique(labels)) if n else 0,
+            'seconds': time.monotonic() - started,
+        }
+        logger.info(
+            f"Dedup: {n} rows -> {self.stats['clusters']} clusters "
+            f"({self.stats['blocks']} blocks, {compared} pairs compared, {matched} fuzzy matches) "
+            f"in {self.stats['seconds']:.2f}s"
+        )
+        return labels
+
+    def canonical_records(self, df, labels):
+        """One record per cluster: the most complete row, gaps filled from the others"""
+        df = df.reset_index(drop=True)
+        filled = df.notna() & df.astype(str).apply(lambda column: column.str.strip() != '')
+        completeness = filled.sum(axis=1).to_numpy()
+
+        order = np.lexsort((np.arange(len(df)), -completeness, labels))
+        ordered = df.iloc[order].where(filled.iloc[order])
+        canonical = ordered.groupby(labels[order], sort=False).first()
+        canonical = canonical.where(canonical.notna(), df.iloc[order].groupby(labels[order], sort=False).first())
+        canonical.insert(0, 'Cluster Size', pd.Series(labels).value_counts().reindex(canonical.index).to_numpy())
+        return canonical.sort_index().reset_index(drop=True)
+
+    def deduplicate(self, df):
+        """Return (canonical records, cluster label per input row)"""
+        labels = self.cluster(df)
+        return self.canonical_records(df, labels), labels
+
+def fuzzy_remove_duplicates(df):
+    """Drop near-duplicate restaurants, keeping one canonical record per cluster"""
+    deduped, _ = FuzzyDeduplicator().deduplicate(df)
+    deduped = deduped.drop(columns='Cluster Size')
+    if {'City', 'Zip'}.issubset(deduped.columns):
+        deduped = deduped.dropna(subset=['City', 'Zip'], how='all')
+    return deduped
+
+class IncrementalDeduplicator:
+    """Streaming counterpart of FuzzyDeduplicator for rows that arrive one at a time.
+
+    Each accepted row is indexed in its Zip block under its name tokens, and
+    a new row is a duplicate when it has the same normalized name as an
+    earlier row in its Zip or City/State, or matches one sharing a name
+    token by the same name and address thresholds. The first row of a
+    cluster is kept, as in remove_duplicates; no canonical merge is possible
+    because earlier rows have already moved on.
+    """
+
+    def __init__(self, name_threshold=None, address_threshold=None):
+        self.name_threshold = name_threshold or DEDUP_CONFIG['name_threshold']
+        self.address_threshold = address_threshold or DEDUP_CONFIG['address_threshold']
+        self._exact = set()
+        self._postings = defaultdict(lambda: defaultdict(list))
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.duplicates = 0
+
+    def add(self, row):
+        """Index row and return True, or return False if it duplicates an earlier row"""
+        name = _normalize_name(_text(row.get('Restaurant Name')))
+        address = _normalize_address(_text(row.get('Cleaned Address') or row.get('Address')))
+        zip_code = _text(row.get('Zip')).strip().casefold()
+        city_state = tuple(_text(row.get(column)).strip().casefold() for column in ('City', 'State'))
+        exact_keys = []
+        if zip_code:
+            exact_keys.append((name, 'zip', zip_code))
+        if all(city_state):
+            exact_keys.append((name, 'city') + city_state)
+
+        with self._lock:
+            if any(key in self._exact for key in exact_keys) or self._fuzzy_match(zip_code, name, address):
+                self.duplicates += 1
+                return False
+            self._exact.update(exact_keys)
+            if zip_code:
+                block = self._postings[zip_code]
+                for token in set(name.split()):
+                    block[token].append((name, address))
+            self.accepted += 1
+            return True
+
+    def _fuzzy_match(self, zip_code, name, address):
+        if not zip_code or zip_code not in self._postings:
+            return False
+        block = self._postings[zip_code]
+        seen = set()
+        for token in set(name.split()):
+            for other in block.get(token, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                other_name, other_address = other
+                if (address_similarity(address, other_address, self.address_threshold) >= self.address_threshold
+                        and name_similarity(name, other_name, self.name_threshold) >= self.name_threshold):
+                    return True
+        return False
+
+def _text(value):
+    return '' if value is None or (isinstance(value, float) and np.isnan(value)) else str(value)
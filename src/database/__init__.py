@@ -1,9 +1,12 @@
 from .db_setup import init_database, backup_database
 from .db_operations import RestaurantDB
+from .connection_pool import get_connection_pool, close_connection_pool
 
 __all__ = [
     'init_database',
     'backup_database',
-    'RestaurantDB'
+    'RestaurantDB',
+    'get_connection_pool',
+    'close_connection_pool'
 ]
 
@@ -0,0 +1,106 @@
+import atexit
+import logging
+import threading
+import psycopg2
+import psycopg2.extensions
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+from ..config.database_config import DATABASE, DB_POOL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which statements were PREPAREd on it"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+class BlockingConnectionPool(ThreadedConnectionPool):
+    """ThreadedConnectionPool whose getconn waits for a free connection instead of failing.
+
+    minconn connections are opened up front. Returned connections are kept
+    open up to maxconn rather than closed once minconn are idle, so bursts
+    of workers do not reconnect on every batch.
+    """
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        self._available = threading.BoundedSemaphore(maxconn)
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None, timeout=None):
+        timeout = DB_POOL_CONFIG['checkout_timeout'] if timeout is None else timeout
+        if not self._available.acquire(timeout=timeout):
+            raise PoolError(f"Timed out after {timeout}s waiting for a database connection")
+        try:
+            conn = super().getconn(key)
+        except Exception:
+            self._available.release()
+            raise
+        if conn.closed:
+            super().putconn(conn, close=True)
+            try:
+                conn = super().getconn(key)
+            except Exception:
+                self._available.release()
+                raise
+        return conn
+
+    def putconn(self, conn, key=None, close=False):
+        """Return conn to the idle list, or close it if it is broken or close is set.
+
+        psycopg2's own putconn closes a returned connection once minconn are
+        idle; here every open connection is kept, and at most maxconn exist.
+        """
+        try:
+            if not conn.closed and conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except psycopg2.Error:
+            close = True
+        try:
+            with self._lock:
+                if self.closed:
+                    raise PoolError("connection pool is closed")
+                if key is None:
+                    key = self._rused.get(id(conn))
+                    if key is None:
+                        raise PoolError("trying to put unkeyed connection")
+                del self._used[key]
+                del self._rused[id(conn)]
+                if close or conn.closed:
+                    conn.close()
+                else:
+                    self._pool.append(conn)
+        finally:
+            self._available.release()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_connection_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = BlockingConnectionPool(
+                DB_POOL_CONFIG['min_connections'],
+                DB_POOL_CONFIG['max_connections'],
+                host=DATABASE['host'],
+                port=DATABASE['port'],
+                database=DATABASE['database'],
+                user=DATABASE['user'],
+                password=DATABASE['password'],
+                connection_factory=PreparingConnection
+            )
+            logger.info(f"Database connection pool opened "
+                        f"({DB_POOL_CONFIG['min_connections']}-{DB_POOL_CONFIG['max_connections']} connections)")
+        return _pool
+
+def close_connection_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and not _pool.closed:
+            _pool.closeall()
+            logger.info("Database connection pool closed")
+        _pool = None
+
+atexit.register(close_connection_pool)
@@ -1,97 +1,350 @@
-import psycopg2
+import hashlib
+import io
+import itertools
+import math
 import logging
 import pandas as pd
+from contextlib import contextmanager
 from pathlib import Path
-from psycopg2.extras import execute_values
-from ..config.database_config import DATABASE
-from ..config.config import EXPECTED_RESTAURANT_FIELDS, EXPECTED_GOOGLE_FIELDS
+from psycopg2.extras import execute_batch, execute_values
+from ..config.database_config import DB_LOAD_CONFIG, DB_POOL_CONFIG
+from ..config.config import CSV_FIELDNAMES, EXPECTED_RESTAURANT_FIELDS, EXPECTED_GOOGLE_FIELDS
+from .connection_pool import get_connection_pool
+from ..utils.metrics import timer, record_rows
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_KM = 6371.0
+# GiST-indexed expression used by every geo query; x is longitude, y latitude
+GEO_POINT = 'point(longitude, latitude)'
+
+# Typed columns and the SQL that parses their scraped text form, yielding
+# NULL for anything malformed or out of range instead of failing the cast
+TYPED_COLUMNS = {
+    'star_rating': (
+        'NUMERIC(2,1)',
+        "CASE WHEN trim({0}) ~ '^[0-9](\\.[0-9]+)?$' THEN "
+        "CASE WHEN trim({0})::numeric BETWEEN 0 AND 5 THEN round(trim({0})::numeric, 1)::numeric(2,1) END END"
+    ),
+    'number_of_reviews': (
+        'INTEGER',
+        "CASE WHEN trim({0}) ~ '^\\(?[0-9][0-9,]{{0,10}}(\\.0+)?\\)?$' "
+        "AND length(regexp_replace(split_part({0}, '.', 1), '[^0-9]', '', 'g')) <= 9 "
+        "THEN regexp_replace(split_part({0}, '.', 1), '[^0-9]', '', 'g')::integer END"
+    ),
+    'latitude': (
+        'DOUBLE PRECISION',
+        "CASE WHEN trim({0}) ~ '^-?[0-9]{{1,3}}(\\.[0-9]+)?$' THEN "
+        "CASE WHEN abs(trim({0})::double precision) <= 90 THEN trim({0})::double precision END END"
+    ),
+    'longitude': (
+        'DOUBLE PRECISION',
+        "CASE WHEN trim({0}) ~ '^-?[0-9]{{1,3}}(\\.[0-9]+)?$' THEN "
+        "CASE WHEN abs(trim({0})::double precision) <= 180 THEN trim({0})::double precision END END"
+    ),
+}
+
+GEO_RESULT_COLUMNS = [
+    'id', 'restaurant_name', 'cleaned_address', 'city', 'state', 'zip',
+    'restaurant_category', 'star_rating', 'number_of_reviews', 'latitude', 'longitude'
+]
+
+def column_name(field):
+    return field.lower().replace(' ', '_')
+
+def parse_expression(column, source=None):
+    """SQL converting the text in source (default: column) to column's stored type"""
+    source = source or column
+    if column in TYPED_COLUMNS:
+        return TYPED_COLUMNS[column][1].format(source)
+    return source
+
+def longitude_ranges(min_lon, max_lon):
+    """Split a west-to-east longitude span into ranges within [-180, 180].
+
+    min_lon > max_lon, or either bound past +/-180, means the span crosses
+    the antimeridian; it is then returned as two ranges meeting at +/-180.
+    """
+    width = max_lon - min_lon if min_lon <= max_lon else max_lon - min_lon + 360.0
+    if width >= 360.0:
+        return [(-180.0, 180.0)]
+    west = (min_lon + 180.0) % 360.0 - 180.0
+    east = west + width
+    if east <= 180.0:
+        return [(west, east)]
+    return [(west, 180.0), (-180.0, east - 360.0)]
+
+def radius_box(lat, lon, radius_km):
+    """(min_lat, min_lon, max_lat, max_lon) enclosing the circle of radius_km.
+
+    Derived on the same sphere as the haversine distance, so the box never
+    cuts off the edge of the circle. A circle reaching a pole spans every
+    longitude; other longitude bounds may run past +/-180 (see
+    longitude_ranges).
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    lat_delta = math.degrees(angle)
+    min_lat, max_lat = lat - lat_delta, lat + lat_delta
+    spread = math.sin(angle) / math.cos(math.radians(lat)) if abs(lat) < 90 else 1.0
+    if min_lat <= -90.0 or max_lat >= 90.0 or angle >= math.pi / 2 or spread >= 1.0:
+        min_lon, max_lon = -180.0, 180.0
+    else:
+        lon_delta = math.degrees(math.asin(spread))
+        min_lon, max_lon = lon - lon_delta, lon + lon_delta
+    return max(-90.0, min_lat), min_lon, min(90.0, max_lat), max_lon
+
+def bbox_query(min_lat, min_lon, max_lat, max_lon, min_rating=None, limit=None):
+    """(sql, params) selecting restaurants inside a bounding box.
+
+    The box is matched against the GiST index on GEO_POINT, so both
+    coordinates narrow the scan. Boxes crossing the antimeridian are split
+    in two (see longitude_ranges).
+    """
+    ranges = longitude_ranges(min_lon, max_lon)
+    boxes = [f"{GEO_POINT} <@ box(point(%s, %s), point(%s, %s))"] * len(ranges)
+    conditions = [boxes[0] if len(boxes) == 1 else f"({' OR '.join(boxes)})"]
+    params = [value for west, east in ranges for value in (west, min_lat, east, max_lat)]
+    if min_rating is not None:
+        conditions.append('star_rating >= %s')
+        params.append(min_rating)
+    query = f"SELECT {', '.join(GEO_RESULT_COLUMNS)} FROM restaurants WHERE {' AND '.join(conditions)}"
+    if limit:
+        query += ' LIMIT %s'
+        params.append(limit)
+    return query, params
+
+def radius_query(lat, lon, radius_km, min_rating=None, limit=None):
+    """(sql, params) selecting restaurants within radius_km, nearest first.
+
+    The bounding box of the circle narrows candidates through the GiST
+    index; the haversine distance filters and orders the remainder. A
+    circle reaching a pole spans every longitude.
+    """
+    box_query, box_params = bbox_query(*radius_box(lat, lon, radius_km), min_rating)
+    distance = (
+        f"2 * {EARTH_RADIUS_KM} * asin(least(1.0, sqrt("
+        "power(sin(radians(latitude - %s) / 2), 2) + "
+        "cos(radians(%s)) * cos(radians(latitude)) * power(sin(radians(longitude - %s) / 2), 2))))"
+    )
+    query = (
+        f"SELECT * FROM (SELECT candidates.*, {distance} AS distance_km FROM ({box_query}) AS candidates) AS nearby "
+        f"WHERE distance_km <= %s ORDER BY distance_km"
+    )
+    params = [lat, lat, lon] + box_params + [radius_km]
+    if limit:
+        query += ' LIMIT %s'
+        params.append(limit)
+    return query, params
+
 class RestaurantDB:
-    def __init__(self):
+    """Restaurant table access over the shared connection pool.
+
+    ``connect()`` pins one pooled connection to the instance until
+    ``close()`` returns it. Without a pinned connection, ``transaction()``
+    and ``cursor()`` borrow one from the pool for the duration of the block,
+    so instances are cheap to create per thread or per stage.
+    """
+
+    _cursor_ids = itertools.count(1)
+
+    def __init__(self, pool=None):
+        self.pool = pool
         self.conn = None
-        self.cursor = None
 
     def connect(self):
         try:
-            self.conn = psycopg2.connect(
-                host=DATABASE['host'],
-                port=DATABASE['port'],
-                database=DATABASE['database'],
-                user=DATABASE['user'],
-                password=DATABASE['password']
-            )
-            self.cursor = self.conn.cursor()
+            self.pool = self.pool or get_connection_pool()
+            self.conn = self.pool.getconn()
             logger.info("Database connection established")
         except Exception as e:
             logger.error(f"Error connecting to database: {e}")
             raise
 
+    @contextmanager
+    def _connection(self):
+        if self.conn is not None:
+            yield self.conn
+            return
+        self.pool = self.pool or get_connection_pool()
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Yield a cursor; commit when the block succeeds, roll back if it raises"""
+        with self._connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    yield cur
+                conn.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+
+    @contextmanager
+    def cursor(self, server_side=False, itersize=None):
+        """Yield a cursor for reads, named (server-side) if server_side is set.
+
+        A server-side cursor fetches itersize rows per round trip instead of
+        materialising the whole result on the client.
+        """
+        with self._connection() as conn:
+            if server_side:
+                cur = conn.cursor(name=f"restaurant_reader_{next(self._cursor_ids)}")
+                cur.itersize = itersize or DB_POOL_CONFIG['itersize']
+            else:
+                cur = conn.cursor()
+            try:
+                yield cur
+            finally:
+                if not conn.closed:
+                    cur.close()
+
+    def stream_query(self, query, params=None, itersize=None):
+        """Iterate over the rows of a large query through a server-side cursor"""
+        with self.cursor(server_side=True, itersize=itersize) as cur:
+            cur.execute(query, params)
+            yield from cur
+
+    def upsert_restaurant_rows(self, rows, fieldnames=CSV_FIELDNAMES):
+        """Upsert row dicts keyed by CSV field names with a prepared statement.
+
+        The upsert is PREPAREd once per connection and column set, so
+        repeated small batches, such as one per enrichment worker batch,
+        skip parsing and planning. Blank and 'Not available' values are
+        stored as NULL, as in the CSV load.
+        """
+        columns = [column_name(field) for field in fieldnames]
+        statement = f"upsert_restaurants_{hashlib.sha1(','.join(columns).encode()).hexdigest()[:12]}"
+        values = [
+            tuple(None if pd.isna(value) or str(value).strip() in ('', 'Not available') else value
+                  for value in (row.get(field) for field in fieldnames))
+            for row in rows
+        ]
+
+        with timer('db_upsert'), self.transaction() as cur:
+            prepared = getattr(cur.connection, 'prepared', None)
+            if prepared is None or statement not in prepared:
+                update_stmt = ", ".join(f"{col} = EXCLUDED.{col}" for col in columns if col != 'id')
+                cur.execute(f"""
+                    PREPARE {statement} ({', '.join(['text'] * len(columns))}) AS
+                    INSERT INTO restaurants ({', '.join(columns)})
+                    VALUES ({', '.join(parse_expression(col, f'${i}') for i, col in enumerate(columns, 1))})
+                    ON CONFLICT (restaurant_name, cleaned_address) DO UPDATE SET
+                    {update_stmt}, updated_at = CURRENT_TIMESTAMP
+                """)
+                if prepared is not None:
+                    prepared.add(statement)
+            execute_batch(cur, f"EXECUTE {statement} ({', '.join(['%s'] * len(columns))})", values)
+        record_rows('db_upsert', len(values))
+        return len(values)
+
     def create_tables(self):
         try:
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS restaurants (
-                    id SERIAL PRIMARY KEY,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            with self.transaction() as cur:
+                cur.execute('''
+                    CREATE TABLE IF NOT EXISTS restaurants (
+                        id SERIAL PRIMARY KEY,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     
-                    -- Core Fields
-                    restaurant_name TEXT NOT NULL,
-                    restaurant_description TEXT,
-                    address TEXT,
-                    cleaned_address TEXT NOT NULL,
-                    city TEXT,
-                    state TEXT,
-                    zip TEXT,
-                    phone TEXT,
-                    website TEXT,
-                    google_maps_link TEXT,
-                    embedded_links TEXT,
-                    venue_id TEXT,
+                        -- Core Fields
+                        restaurant_name TEXT NOT NULL,
+                        restaurant_description TEXT,
+                        address TEXT,
+                        cleaned_address TEXT NOT NULL,
+                        city TEXT,
+                        state TEXT,
+                        zip TEXT,
+                        phone TEXT,
+                        website TEXT,
+                        google_maps_link TEXT,
+                        embedded_links TEXT,
+                        venue_id TEXT,
                     
-                    -- Google Fields
-                    star_rating TEXT,
-                    number_of_reviews TEXT,
-                    restaurant_category TEXT,
-                    price_range TEXT,
-                    latitude TEXT,
-                    longitude TEXT,
-                    accessibility TEXT,
-                    service_options TEXT,
-                    highlights TEXT,
-                    popular_for TEXT,
-                    offerings TEXT,
-                    dining_options TEXT,
-                    amenities TEXT,
-                    atmosphere TEXT,
-                    crowd TEXT,
-                    planning TEXT,
-                    payments TEXT,
-                    parking TEXT,
-                    pets TEXT,
-                    children TEXT,
-                    from_the_business TEXT,
-                    doesnt_offer TEXT,
+                        -- Google Fields
+                        star_rating NUMERIC(2,1),
+                        number_of_reviews INTEGER,
+                        restaurant_category TEXT,
+                        price_range TEXT,
+                        latitude DOUBLE PRECISION,
+                        longitude DOUBLE PRECISION,
+                        accessibility TEXT,
+                        service_options TEXT,
+                        highlights TEXT,
+                        popular_for TEXT,
+                        offerings TEXT,
+                        dining_options TEXT,
+                        amenities TEXT,
+                        atmosphere TEXT,
+                        crowd TEXT,
+                        planning TEXT,
+                        payments TEXT,
+                        parking TEXT,
+                        pets TEXT,
+                        children TEXT,
+                        from_the_business TEXT,
+                        doesnt_offer TEXT,
                     
-                    CONSTRAINT restaurants_unique_name_address UNIQUE(restaurant_name, cleaned_address)
-                )
-            ''')
-            
-            # Create indexes
-            self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_restaurant_name ON restaurants(restaurant_name)')
-            self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_location ON restaurants(city, state, zip)')
-            self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_rating ON restaurants(star_rating)')
+                        CONSTRAINT restaurants_unique_name_address UNIQUE(restaurant_name, cleaned_address)
+                    )
+                ''')
             
-            self.conn.commit()
+                # Create indexes
+                cur.execute('CREATE INDEX IF NOT EXISTS idx_restaurant_name ON restaurants(restaurant_name)')
+                cur.execute('CREATE INDEX IF NOT EXISTS idx_location ON restaurants(city, state, zip)')
+                self._migrate_typed_columns(cur)
+                cur.execute('CREATE INDEX IF NOT EXISTS idx_rating ON restaurants(star_rating)')
+                # A (latitude, longitude) btree only narrows by latitude; GiST on a
+                # point narrows by both coordinates
+                cur.execute('DROP INDEX IF EXISTS idx_lat_lon')
+                cur.execute(f'CREATE INDEX IF NOT EXISTS idx_geo_point ON restaurants USING gist ({GEO_POINT})')
+
             logger.info("Tables and indexes created successfully")
         except Exception as e:
             logger.error(f"Error creating tables: {e}")
-            self.conn.rollback()
             raise
 
+    def _migrate_typed_columns(self, cur):
+        """Convert numeric columns still stored as TEXT, parsing existing values safely"""
+        cur.execute(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'restaurants'"
+        )
+        current_types = dict(cur.fetchall())
+        for column, (sql_type, _) in TYPED_COLUMNS.items():
+            if column not in current_types:
+                cur.execute(f"ALTER TABLE restaurants ADD COLUMN {column} {sql_type}")
+            elif current_types[column] == 'text':
+                cur.execute(f"SELECT count(*) FROM restaurants WHERE {column} IS NOT NULL "
+                            f"AND ({parse_expression(column)}) IS NULL")
+                unparsable = cur.fetchone()[0]
+                cur.execute(f"ALTER TABLE restaurants ALTER COLUMN {column} TYPE {sql_type} "
+                            f"USING {parse_expression(column)}")
+                logger.info(f"Converted restaurants.{column} to {sql_type} "
+                            f"({unparsable} unparsable values set to NULL)")
+
+    def find_restaurants_in_bbox(self, min_lat, min_lon, max_lat, max_lon, min_rating=None, limit=None):
+        """Restaurants inside the box, optionally rated at least min_rating"""
+        query, params = bbox_query(min_lat, min_lon, max_lat, max_lon, min_rating, limit)
+        with self.cursor() as cur:
+            cur.execute(query, params)
+            return [dict(zip(GEO_RESULT_COLUMNS, row)) for row in cur.fetchall()]
+
+    def find_restaurants_near(self, lat, lon, radius_km, min_rating=None, limit=50):
+        """Restaurants within radius_km of (lat, lon), nearest first, with distance_km"""
+        query, params = radius_query(lat, lon, radius_km, min_rating, limit)
+        with self.cursor() as cur:
+            cur.execute(query, params)
+            columns = [description[0] for description in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+
     def insert_restaurant_data(self, df):
-        df.columns = [col.lower().replace(' ', '_') for col in df.columns]
+        df.columns = [column_name(col) for col in df.columns]
         
         df = df.astype(object).where(pd.notnull(df), None)
         records = df.to_records(index=False)
@@ -114,16 +367,69 @@ def insert_restaurant_data(self, df):
         """
 
         try:
-            with self.conn.cursor() as cur:
+            with timer('db_insert'), self.transaction() as cur:
                 execute_values(cur, insert_query, data)
-            self.conn.commit()
+            record_rows('db_insert', len(data))
             print(f"Successfully upserted {len(data)} records")
         except Exception as e:
-            self.conn.rollback()
             print(f"Error inserting data: {str(e)}")
             raise
 
+    def bulk_load_restaurant_data(self, df, chunk_rows=None):
+        """Upsert df through a COPY-loaded staging table in one transaction.
+
+        Rows are streamed into a temporary all-TEXT staging table with COPY
+        FROM STDIN in chunks of chunk_rows, then merged into restaurants with
+        a single INSERT ... SELECT ... ON CONFLICT. When a key appears more
+        than once the last row wins. Rows without a name or cleaned address
+        are skipped. Returns the number of rows upserted.
+        """
+        chunk_rows = chunk_rows or DB_LOAD_CONFIG['copy_chunk_rows']
+        columns = [column_name(col) for col in df.columns]
+        column_list = ', '.join(columns)
+        key_columns = ('restaurant_name', 'cleaned_address')
+        update_stmt = ", ".join([f"{col} = EXCLUDED.{col}" for col in columns if col != 'id'])
+
+        try:
+            with timer('db_bulk_load'), self.transaction() as cur:
+                cur.execute(f"""
+                    CREATE TEMP TABLE restaurants_staging (
+                        staging_row BIGSERIAL,
+                        {', '.join(f'{col} TEXT' for col in columns)}
+                    ) ON COMMIT DROP
+                """)
+
+                copy_sql = (f"COPY restaurants_staging ({column_list}) "
+                            f"FROM STDIN WITH (FORMAT csv, NULL '\\N')")
+                for start in range(0, len(df), chunk_rows):
+                    buffer = io.StringIO()
+                    df.iloc[start:start + chunk_rows].to_csv(buffer, index=False, header=False, na_rep='\\N')
+                    buffer.seek(0)
+                    cur.copy_expert(copy_sql, buffer)
+
+                cur.execute(f"""
+                    INSERT INTO restaurants ({column_list})
+                    SELECT DISTINCT ON ({', '.join(key_columns)})
+                        {', '.join(parse_expression(col) for col in columns)}
+                    FROM restaurants_staging
+                    WHERE {' AND '.join(f'{col} IS NOT NULL' for col in key_columns)}
+                    ORDER BY {', '.join(key_columns)}, staging_row DESC
+                    ON CONFLICT (restaurant_name, cleaned_address) DO UPDATE SET
+                    {update_stmt}, updated_at = CURRENT_TIMESTAMP
+                """)
+                upserted = cur.rowcount
+            record_rows('db_bulk_load', upserted)
+            skipped = len(df) - upserted
+            print(f"Successfully upserted {upserted} records"
+                  + (f" ({skipped} duplicate or keyless rows skipped)" if skipped else ""))
+            return upserted
+        except Exception as e:
+            print(f"Error bulk loading data: {str(e)}")
+            raise
+
     def close(self):
+        """Return the pinned connection to the pool"""
         if self.conn:
-            self.conn.close()
-            logger.info("Database connection closed")
+            self.pool.putconn(self.conn)
+            self.conn = None
+            logger.info("Database connection released")
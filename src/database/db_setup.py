@@ -4,6 +4,7 @@
 from datetime import datetime
 from ..config.database_config import DATABASE, RESTAURANT_SCHEMA
 from ..config.config import CSV_FIELDNAMES
+from .db_operations import RestaurantDB
 import os
 
 logging.basicConfig(
@@ -29,47 +30,35 @@ def backup_database():
 
 def init_database():
     try:
-        conn = psycopg2.connect(
-            host=DATABASE['host'],
-            port=DATABASE['port'],
-            database=DATABASE['database'],
-            user=DATABASE['user'],
-            password=DATABASE['password']
-        )
-        cursor = conn.cursor()
-
         column_definitions = []
         for field in CSV_FIELDNAMES:
             field_name = field.lower().replace(' ', '_')
             column_definitions.append(f"{field_name} TEXT")
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS restaurants (
-                id SERIAL PRIMARY KEY,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                restaurant_name TEXT NOT NULL,
-                cleaned_address TEXT NOT NULL,
-                city TEXT,
-                state TEXT,
-                zip TEXT,
-                UNIQUE(restaurant_name, cleaned_address)
-            )
-        ''')
+        with RestaurantDB().transaction() as cursor:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS restaurants (
+                    id SERIAL PRIMARY KEY,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    restaurant_name TEXT NOT NULL,
+                    cleaned_address TEXT NOT NULL,
+                    city TEXT,
+                    state TEXT,
+                    zip TEXT,
+                    UNIQUE(restaurant_name, cleaned_address)
+                )
+            ''')
 
-        # Create indexes
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_restaurant_name ON restaurants(restaurant_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_location ON restaurants(city, state, zip)')
+            # Create indexes
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_restaurant_name ON restaurants(restaurant_name)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_location ON restaurants(city, state, zip)')
 
-        conn.commit()
         logger.info("Database initialized successfully")
         
     except psycopg2.Error as e:
         logger.error(f"Database initialization failed: {e}")
         raise
-    finally:
-        cursor.close()
-        conn.close()
 
 if __name__ == "__main__":
     try:
@@ -1,6 +1,7 @@
+import argparse
 import platform
 from src.scrapers import scrape_eater_archives, process_csv
-from src.data_processing import clean_and_split_address, remove_duplicates
+from src.data_processing import clean_and_split_addresses, fuzzy_remove_duplicates
 from src.database import init_database, RestaurantDB
 from src.config.config import (
     RAW_RESTAURANTS_CSV, 
@@ -9,7 +10,6 @@
     CHROME_OPTIONS,
     CSV_FIELDNAMES,
     PARALLEL_PROCESSING_CONFIG,
-    WEBDRIVER_CONFIG,
     TIMEOUT_CONFIG,
     MAX_RETRIES,
     RETRY_DELAY,
@@ -20,8 +20,6 @@
 import logging
 import threading
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from concurrent.futures import ThreadPoolExecutor
 from itertools import islice
@@ -34,6 +32,8 @@
 from selenium.webdriver.chrome.options import Options
 from scripts.send2db import load_csv_to_database
 from src.utils.webdriver_manager import WebDriverManager
+from src.utils.streaming_pipeline import run_streaming_pipeline
+from src.utils.profiler import profiling, profile_stage
 from scripts.enhance_send2db import main as enhance_and_send_to_db
 
 logging.basicConfig(level=logging.INFO)
@@ -50,16 +50,17 @@ def run_with_timeout(timeout_duration=PARALLEL_PROCESSING_CONFIG['timeout_second
     timer.start()
     return timer
 
-def main():
+def main(streaming=False, profile=False):
+    """Run the full pipeline; with profile, write a per-stage profile report to logs/"""
+    with profiling(enabled=profile):
+        run_pipeline(streaming)
+
+def run_pipeline(streaming=False):
+    """Run the pipeline stage by stage or, with streaming, with all stages overlapping"""
     try:
 
         try:
-            service = Service()
-            options = webdriver.ChromeOptions()
-            for option in WEBDRIVER_CONFIG['options']:
-                options.add_argument(option)
-            driver = webdriver.Chrome(service=service, options=options)
-            driver.quit()
+            WebDriverManager.warm_up(PARALLEL_PROCESSING_CONFIG['num_workers'])
             logger.info("WebDriver setup successful")
         except Exception as e:
             logger.error(f"WebDriver setup failed: {e}")
@@ -77,16 +78,23 @@ def main():
                 writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
                 writer.writeheader()
 
+        if streaming:
+            logger.info("Running streaming scrape-enrich-load pipeline...")
+            with profile_stage('streaming'):
+                run_streaming_pipeline()
+            return
+
         logger.info("Initializing Eater.com scraper...")
-        scrape_eater_archives()
+        with profile_stage('scraping'):
+            scrape_eater_archives()
 
         logger.info("Cleaning restaurant data...")
-        df = pd.read_csv(RAW_RESTAURANTS_CSV)
-        df[["Cleaned Address", "City", "State", "Zip"]] = df['Address'].apply(
-            lambda x: pd.Series(clean_and_split_address(x))
-        )
-        df = remove_duplicates(df)
-        df.to_csv(CLEANED_RESTAURANTS_CSV, index=False)
+        with profile_stage('cleaning'):
+            df = pd.read_csv(RAW_RESTAURANTS_CSV)
+            df[["Cleaned Address", "City", "State", "Zip"]] = clean_and_split_addresses(df['Address'])
+        with profile_stage('dedup'):
+            df = fuzzy_remove_duplicates(df)
+            df.to_csv(CLEANED_RESTAURANTS_CSV, index=False)
 
         logger.info("Enhancing with Google Maps data and loading to database...")
         enhance_and_send_to_db()
@@ -100,4 +108,10 @@ def main():
             signal.alarm(0)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scrape, clean, enrich and load Eater restaurants")
+    parser.add_argument('--streaming', action='store_true',
+                        help="run scraping, dedup, enrichment and database loading concurrently")
+    parser.add_argument('--profile', action='store_true',
+                        help="write per-stage cProfile, tracemalloc and wall-clock reports to logs/")
+    args = parser.parse_args()
+    main(streaming=args.streaming, profile=args.profile)
@@ -1,11 +1,10 @@
 import logging
 import requests
-from bs4 import BeautifulSoup
 import time
-import random
-import csv
 import os
 import re
+from collections import Counter
+from functools import partial
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -16,9 +15,16 @@
 from contextlib import contextmanager
 import pandas as pd
 from threading import Timer
-from ..data_processing.cleanAddrRestaurants import fill_missing_city, clean_and_split_address
+from ..data_processing.cleanAddrRestaurants import CityBackfill, clean_and_split_address
 from ..utils.cleaning_monitor import log_cleaning_progress
 from src.utils.webdriver_manager import WebDriverManager
+from src.utils.dedup_index import get_dedup_index
+from .archive_crawler import discover_article_urls
+from src.utils.csv_handler import get_csv_sink, flush_csv_sink, close_csv_sinks
+from src.utils.http_client import get_http_session, random_headers
+from src.utils.html_parser import make_soup, strainer
+from src.utils.parse_pool import parse_html, log_parse_stats
+from src.utils.metrics import timer, observe, record_rows, record_error, record_retry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,95 +32,123 @@
 )
 logger = logging.getLogger(__name__)
 
-POST_PROCESS_INTERVAL = 300
-last_post_process_time = 0
+DEDUP_KEY_FIELDS = ['Restaurant Name', 'Address']
+city_backfill = CityBackfill()
 
-def scrape_eater_page(url, output_csv, driver):
-    logger.info(f"Attempting to load page: {url}")
-    
+fetch_path_counts = Counter()
+
+CARD_STRAINER = strainer('section', 'c-mapstack__card')
+DESCRIPTION_CLASS = 'c-entry-content venu-card'
+
+def parse_card(entry):
+    """Extract one c-mapstack__card section, or None if it lacks a name or address.
+
+    The card's divs are walked once to find the heading, description, venue
+    and info containers, then each container's own small subtree is read,
+    instead of searching the whole card again for every field.
+    """
+    name_tag = description_container = card_hed = info_section = None
+    for tag in entry.find_all(['h1', 'div']):
+        if tag.name == 'h1':
+            name_tag = name_tag or tag
+            continue
+        classes = tag.get('class') or ()
+        if description_container is None and ' '.join(classes) == DESCRIPTION_CLASS:
+            description_container = tag
+        elif card_hed is None and 'c-mapstack__card-hed' in classes:
+            card_hed = tag
+        elif info_section is None and 'c-mapstack__info' in classes:
+            info_section = tag
+        if name_tag and description_container and card_hed and info_section:
+            break
+
+    name = name_tag.text.strip() if name_tag else "Name Not Found"
+    description = "Description Not Found"
+    embedded_links = []
+    if description_container:
+        paragraphs = description_container.find_all('p')
+        description = ''.join(p.text.strip() for p in paragraphs)
+        embedded_links = [
+            {'text': link.text.strip(), 'url': link.get('href', '')}
+            for p in paragraphs for link in p.find_all('a')
+        ]
+
+    venue_id = "Venue ID Not Found"
+    if card_hed and 'data-venue-id' in card_hed.attrs:
+        venue_id = card_hed['data-venue-id']
+
+    address = "Address Not Found"
+    phone = "Phone Not Found"
+    website = "Website Not Found"
+    google_maps_link = "Google Maps Link Not Found"
+    address_div = None
+
+    for div in info_section.find_all('div') if info_section else ():
+        classes = div.get('class') or ()
+        if address_div is None and 'c-mapstack__address' in classes:
+            address_div = div
+            if link := div.find('a'):
+                google_maps_link = link['href']
+            address = div.text.strip()
+        elif 'info' in classes:
+            use = div.select_one('div.info-icon svg use')
+            icon = use.get('xlink:href', '') if use else ''
+            if '#icon-phone' in icon:
+                if phone_link := div.select_one('div.c-mapstack__phone-url a'):
+                    phone = phone_link.text.strip()
+            elif '#icon-world' in icon:
+                if link := div.find('a'):
+                    website = link['href']
+
+    if name == "Name Not Found" or address == "Address Not Found":
+        return None
+    return {
+        'Restaurant Name': name,
+        'Restaurant Description': description,
+        'Address': address,
+        'Phone': phone,
+        'Website': website,
+        'Google Maps Link': google_maps_link,
+        'Embedded Links': embedded_links,
+        'Venue ID': venue_id
+    }
+
+def parse_eater_cards(html):
+    """Parse an article's c-mapstack__card sections.
+
+    Only the card sections are built into a tree. Returns the number of
+    cards found and the entries that have both a name and an address.
+    """
+    soup = make_soup(html, parse_only=CARD_STRAINER)
+    cards = soup.find_all('section', class_='c-mapstack__card')
+    return len(cards), [entry for entry in map(parse_card, cards) if entry]
+
+def fetch_cards_http(url):
+    """Fetch article HTML over the pooled HTTP session and parse its cards in the parse pool"""
+    with timer('eater_http_fetch'):
+        response = get_http_session().get(
+            url, headers=random_headers(), timeout=EATER_CONFIG['crawler']['request_timeout']
+        )
+        response.raise_for_status()
+    return parse_html(parse_eater_cards, response.text)
+
+def fetch_cards_selenium(url, driver):
+    """Load the article in a browser and parse its cards, retrying once"""
     for attempt in range(2):  # Try twice at most
         try:
-            driver.set_page_load_timeout(15)  # 15 second timeout
-            driver.get(url)
-            
-            wait = WebDriverWait(driver, 3)  
-            wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'c-mapstack__card')))
-            
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            restaurant_entries = soup.find_all('section', class_='c-mapstack__card')
-            
-            data = []
-            
-            for entry in restaurant_entries:
-                name = entry.find('h1').text.strip() if entry.find('h1') else "Name Not Found"
-                
-                description_container = entry.find('div', class_='c-entry-content venu-card')
-                if description_container:
-                    description_paragraphs = description_container.find_all('p')
-                    description = ''.join([p.text.strip() for p in description_paragraphs])
-                    
-                    embedded_links = []
-                    for p in description_paragraphs:
-                        links = p.find_all('a')
-                        for link in links:
-                            link_data = {
-                                'text': link.text.strip(),
-                                'url': link.get('href', ''),
-                            }
-                            embedded_links.append(link_data)
-                else:
-                    description = "Description Not Found"
-                    embedded_links = []
-                
-                venue_id = "Venue ID Not Found"
-                card_hed = entry.find('div', class_='c-mapstack__card-hed')
-                if card_hed and 'data-venue-id' in card_hed.attrs:
-                    venue_id = card_hed['data-venue-id']
-
-                info_section = entry.find('div', class_='c-mapstack__info')
+            with timer('eater_page_load'):
+                driver.set_page_load_timeout(15)  # 15 second timeout
+                driver.get(url)
                 
-                address = "Address Not Found"
-                phone = "Phone Not Found"
-                website = "Website Not Found"
-                google_maps_link = "Google Maps Link Not Found"
-
-                if info_section:
-                    address_div = info_section.find('div', class_='c-mapstack__address')
-                    if address_div:
-                        google_maps_link = address_div.find('a')['href']
-                        address = address_div.text.strip()
-
-                    info_items = info_section.find_all('div', class_='info')
-                    for item in info_items:
-                        icon = item.find('div', class_='info-icon').find('svg').find('use')['xlink:href']
-                        if '#icon-phone' in icon:
-                            phone = item.find('div', class_='c-mapstack__phone-url').find('a').text.strip()
-                        elif '#icon-world' in icon:
-                            website = item.find('a')['href']
-
-                if name != "Name Not Found" and address != "Address Not Found":
-                    new_entry = {
-                        'Restaurant Name': name,
-                        'Restaurant Description': description,
-                        'Address': address,
-                        'Phone': phone,
-                        'Website': website,
-                        'Google Maps Link': google_maps_link,
-                        'Embedded Links': embedded_links,
-                        'Venue ID': venue_id
-                    }
-                    
-                    if not is_duplicate_entry(output_csv, new_entry):
-                        write_to_raw_csv(new_entry, output_csv)
-                        
-                        clean_and_write_entry(new_entry, CLEANED_RESTAURANTS_CSV)
+                wait = WebDriverWait(driver, 3)  
+                wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'c-mapstack__card')))
             
-            return
+            return parse_html(parse_eater_cards, driver.page_source)
             
         except Exception as e:
             logger.warning(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
             if attempt == 0:  # Only refresh and retry once
+                record_retry('eater_page_load')
                 try:
                     driver.refresh()
                     time.sleep(1)
@@ -122,41 +156,100 @@ def scrape_eater_page(url, output_csv, driver):
                     pass
             else:
                 logger.error(f"Skipping {url} after failed attempts")
-                return  # Skip this article and move on
+    return 0, []
+
+def scrape_eater_page(url, output_csv, driver=None, fetch_mode=None, on_entry=None):
+    """Scrape one article and store its new entries.
+
+    fetch_mode 'auto' tries plain HTTP first and falls back to Selenium when
+    no cards are found; 'http' and 'selenium' use only that path. A pooled
+    driver is borrowed for the fallback if none is passed. on_entry, if
+    given, is called with each new cleaned entry once it is written.
+    Returns the path that served the page, or None if it could not be
+    scraped.
+    """
+    logger.info(f"Attempting to load page: {url}")
+    started = time.perf_counter()
+    fetch_mode = fetch_mode or EATER_CONFIG['fetch_mode']
+    card_count, entries, path = 0, [], None
+
+    if fetch_mode in ('auto', 'http'):
+        try:
+            card_count, entries = fetch_cards_http(url)
+            if card_count:
+                path = 'http'
+        except Exception as e:
+            logger.warning(f"HTTP fetch failed for {url}: {str(e)}")
+
+    if not card_count and fetch_mode in ('auto', 'selenium'):
+        if driver is not None:
+            card_count, entries = fetch_cards_selenium(url, driver)
+        else:
+            with WebDriverManager.driver() as pooled_driver:
+                card_count, entries = fetch_cards_selenium(url, pooled_driver)
+        if card_count:
+            path = 'selenium'
+
+    fetch_path_counts[path or 'failed'] += 1
+    logger.info(f"Served {url} via {path or 'no path'} ({card_count} cards)")
+    if path is None:
+        record_error('eater_article', path='failed')
+
+    with timer('eater_store_entries'):
+        for new_entry in entries:
+            if not is_duplicate_entry(output_csv, new_entry):
+                write_to_raw_csv(new_entry, output_csv)
+                record_rows('eater_store_entries')
+                
+                cleaned_entry = clean_and_write_entry(new_entry, CLEANED_RESTAURANTS_CSV)
+                if cleaned_entry and on_entry:
+                    on_entry(cleaned_entry)
+
+    observe('eater_article', time.perf_counter() - started, path=path or 'failed')
+    record_rows('eater_article', card_count, path=path or 'failed')
+    return path
 
 def write_to_raw_csv(entry, output_csv):
     fieldnames = REQUIRED_RESTAURANT_FIELDS + ['Restaurant Description', 'Phone', 
         'Website', 'Google Maps Link', 'Embedded Links', 'Venue ID']
     
-    with open(output_csv, 'a', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        if file.tell() == 0:  
-            writer.writeheader()
-        writer.writerow(entry)
+    # The key only reaches the sidecar once the row itself is on disk, in
+    # one sidecar write per CSV flush
+    dedup_index = get_dedup_index(output_csv, DEDUP_KEY_FIELDS)
+    dedup_index.add(entry)
+    sink = get_csv_sink(output_csv, fieldnames)
+    sink.add_flush_listener(dedup_index.sync)
+    sink.write(entry, on_flushed=partial(dedup_index.persist, entry))
 
 def post_process_cleaned_data():
+    """Fill cities for rows written before their (State, Zip) city was known"""
     try:
-        
-        df = pd.read_csv(CLEANED_RESTAURANTS_CSV)
-        
-        df = fill_missing_city(df)
-        
+        flush_csv_sink(CLEANED_RESTAURANTS_CSV)
+        if not city_backfill.resolvable():
+            logger.info("Post-processing skipped: no rows need a city backfill")
+            return
+
+        df = pd.read_csv(CLEANED_RESTAURANTS_CSV, dtype=str, keep_default_na=False)
+        filled = city_backfill.fill(df)
         df.to_csv(CLEANED_RESTAURANTS_CSV, index=False)
-        logger.info("Post-processing completed successfully")
-        
+        logger.info(f"Post-processing completed successfully: backfilled city for {filled} rows")
+
     except Exception as e:
         logger.error(f"Error during post-processing: {e}")
 
-def should_run_post_processing():
-    global last_post_process_time
-    current_time = time.time()
-    
-    if current_time - last_post_process_time >= POST_PROCESS_INTERVAL:
-        last_post_process_time = current_time
-        return True
-    return False
+def seed_city_backfill():
+    """Load known cities from the cleaned CSV once per run"""
+    if not os.path.exists(CLEANED_RESTAURANTS_CSV):
+        return
+    try:
+        df = pd.read_csv(CLEANED_RESTAURANTS_CSV, usecols=['City', 'State', 'Zip'],
+                         dtype=str, keep_default_na=False)
+        city_backfill.seed(df)
+    except Exception as e:
+        logger.error(f"Error loading cities for backfill: {e}")
 
 def clean_and_write_entry(entry, cleaned_csv):
+    """Write the entry with its address split out; returns it, or None if it has no Zip"""
     cleaned_components = clean_and_split_address(entry['Address'])
     
     cleaned_entry = {
@@ -168,95 +261,38 @@ def clean_and_write_entry(entry, cleaned_csv):
     }
     
     if not cleaned_entry['Zip']:
-        return
+        return None
     
     fieldnames = REQUIRED_RESTAURANT_FIELDS + [
         'Restaurant Description', 'Phone', 'Website', 'Google Maps Link',
         'Cleaned Address', 'City', 'State', 'Zip', 'Embedded Links', 'Venue ID'
     ]
     
-    with open(cleaned_csv, 'a', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        if file.tell() == 0:  
-            writer.writeheader()
-        writer.writerow(cleaned_entry)
-    
-    if should_run_post_processing():
-        post_process_cleaned_data()
+    cleaned_entry = city_backfill.apply(cleaned_entry)
+    get_csv_sink(cleaned_csv, fieldnames).write(cleaned_entry)
+    return cleaned_entry
 
 def is_duplicate_entry(csv_file, new_entry):
-    try:        
-        if not os.path.exists(csv_file):
-            return False
-            
-        with open(csv_file, 'r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            existing_entries = [(row['Restaurant Name'], row['Address']) for row in reader]
-            
-            new_key = (new_entry['Restaurant Name'], new_entry['Address'])
-            return new_key in existing_entries
-            
+    try:
+        return new_entry in get_dedup_index(csv_file, DEDUP_KEY_FIELDS)
     except Exception as e:
         logger.error(f"Error checking for duplicates: {str(e)}")
-        return False  
-    
-    return False
+        return False
 
-def scrape_eater_archives():
-    global last_post_process_time
-    last_post_process_time = time.time()
-    
+def scrape_eater_archives(on_entry=None):
+    """Scrape every archive article; on_entry receives each new cleaned entry"""
     output_csv = RAW_RESTAURANTS_CSV
     os.makedirs(os.path.dirname(output_csv), exist_ok=True)
     os.makedirs(os.path.dirname(CLEANED_RESTAURANTS_CSV), exist_ok=True)
-    base_url = EATER_CONFIG['base_url']
-    start_page = EATER_CONFIG['page_range']['start']
-    end_page = EATER_CONFIG['page_range']['end']
-    
-    driver = None
+    dedup_index = get_dedup_index(output_csv, DEDUP_KEY_FIELDS)
+    logger.info(f"Dedup index ready with {len(dedup_index)} known entries")
+    seed_city_backfill()
     try:
-        driver = WebDriverManager.create_driver()
-        
-        for page in range(start_page, end_page + 1):
-            logger.info(f"Processing archive page {page} (range: {start_page}-{end_page})")
-            
-            page_url = f"{base_url}?page={page}" if page > 1 else base_url
-            
-            max_retries = 3
-            retry_count = 0
-            while retry_count < max_retries:
-                try:
-                    response = requests.get(
-                        page_url, 
-                        headers={"User-Agent": random.choice(EATER_CONFIG['user_agents'])},
-                        timeout=30
-                    )
-                    response.raise_for_status()
-                    break
-                except (requests.Timeout, requests.RequestException) as e:
-                    retry_count += 1
-                    logger.warning(f"Attempt {retry_count} failed: {e}")
-                    if retry_count == max_retries:
-                        raise
-                    time.sleep(5)
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            entries = soup.find_all('div', class_='c-compact-river__entry')
-            if not entries:
-                logger.warning(f"No entries found on page {page}. Stopping pagination.")
-                break
-                
-            for idx, entry in enumerate(entries, 1):
-                if link := entry.find('a'):
-                    article_url = link['href']
-                    if not article_url.startswith('http'):
-                        article_url = 'https://www.eater.com' + article_url
-                        
-                    logger.info(f"Processing article {idx}/{len(entries)} on page {page}")
-                    scrape_eater_page(article_url, output_csv, driver)
-                    time.sleep(2)
-            
+        for page, idx, total, article_url in discover_article_urls():
+            logger.info(f"Processing article {idx}/{total} on page {page}")
+            scrape_eater_page(article_url, output_csv, on_entry=on_entry)
+            time.sleep(EATER_CONFIG['crawler']['article_delay'])
+
     except requests.Timeout:
         logger.error("Timeout accessing archive page")
     except requests.RequestException as e:
@@ -264,8 +300,9 @@ def scrape_eater_archives():
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
     finally:
-        if driver:
-            driver.quit()
+        logger.info(f"Article fetch paths: {dict(fetch_path_counts)}")
+        log_parse_stats()
+        close_csv_sinks(output_csv, CLEANED_RESTAURANTS_CSV)
         post_process_cleaned_data()
 
 if __name__ == "__main__":
@@ -2,6 +2,8 @@
 import time
 import random
 import re
+from contextlib import contextmanager
+from functools import partial
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -12,6 +14,7 @@
     ENHANCED_RESTAURANTS_CSV, 
     CHROME_OPTIONS, 
     TIMEOUT_CONFIG,
+    GOOGLE_MAPS_CONFIG,
     EXPECTED_GOOGLE_FIELDS
 )
 import logging
@@ -23,7 +26,11 @@
 import pandas as pd
 import os
 from src.utils.webdriver_manager import WebDriverManager
-from src.utils.csv_handler import ensure_csv_exists, write_row
+from src.utils.csv_handler import ensure_csv_exists, write_row, close_csv_sinks
+from src.utils.google_cache import get_google_maps_cache, log_cache_stats
+from src.utils.parse_pool import parse_html, log_parse_stats
+from src.utils.metrics import observe, record_rows, record_error
+from src.utils.html_parser import make_soup
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -52,73 +59,229 @@ def get_element_text(driver, selectors, default='Not available'):
                 continue
     return default
 
-def fetch_google_maps_data(url, driver=None):
+class LatencyBudget:
+    """Per-place time budget that also records how long each phase took.
+
+    Phase durations and failures also go to the run metrics as the
+    google_maps_phase stage.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.started = time.monotonic()
+        self.timings = {}
+
+    def remaining(self):
+        return max(0.0, self.total - (time.monotonic() - self.started))
+
+    def timeout(self, phase_timeout):
+        """Phase timeout capped by what is left of the budget"""
+        return min(phase_timeout, self.remaining())
+
+    def exhausted(self):
+        return self.remaining() <= 0
+
+    @contextmanager
+    def phase(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            record_error('google_maps_phase', phase=name)
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            observe('google_maps_phase', elapsed, phase=name)
+
+    def report(self):
+        phases = ' '.join(f"{name}={seconds:.2f}s" for name, seconds in self.timings.items())
+        return f"{phases} total={time.monotonic() - self.started:.2f}s"
+
+def wait_for_stable_sections(container, budget):
+    """Poll the info sections until their count stops changing or time runs out"""
+    deadline = time.monotonic() + budget.timeout(GOOGLE_MAPS_CONFIG['section_settle_timeout'])
+    last_count, stable, sections = -1, 0, []
+    while True:
+        sections = container.find_elements(By.CSS_SELECTOR, 'div.iP2t7d, div.LBgpqf')
+        if sections and len(sections) == last_count:
+            stable += 1
+            if stable >= GOOGLE_MAPS_CONFIG['stable_polls']:
+                return sections
+        else:
+            stable = 0
+        last_count = len(sections)
+        if time.monotonic() >= deadline:
+            return sections
+        time.sleep(GOOGLE_MAPS_CONFIG['poll_interval'])
+
+BASIC_INFO_SELECTOR = 'div.F7nice, button.DkEaL[jsaction*="category"], span[aria-label*="Price"]'
+INFO_CONTAINER_SELECTOR = 'div.m6QErb[role="region"]'
+INFO_SECTION_SELECTOR = 'div.iP2t7d, div.LBgpqf'
+SECTION_TITLE_SELECTOR = 'h2.iL3Qke'
+OPTION_SELECTOR = 'div.iNvpkb, div.Rz1y8b'
+UNAVAILABLE_OPTION_CLASSES = ('XJynsc', 'wmQCje')
+OPTION_PREFIXES = ("Has ", "Serves ", "No ", "Doesn't ")
+
+def read_basic_info(data, class_name, text, aria_label):
+    """Fill rating, reviews, category or price from one basic-info element.
+
+    aria_label is a callable so the WebDriver path only fetches the
+    attribute for the elements that need it.
+    """
+    if 'F7nice' in class_name:
+        if rating_match := re.search(r'(\d+\.\d+)', text):
+            data['Star Rating'] = rating_match.group(1)
+        if reviews_match := re.search(r'\(([0-9,]+)\)', text):
+            data['Number of Reviews'] = reviews_match.group(1).replace(',', '')
+    elif 'DkEaL' in class_name:
+        data['Restaurant Category'] = text
+    else:
+        label = aria_label()
+        if label and 'Price' in label:
+            data['Price Range'] = text.strip()
+
+def option_name(option_text):
+    """Option label without its Has/Serves/No/Doesn't prefix"""
+    option_text = clean_text(option_text)
+    for prefix in OPTION_PREFIXES:
+        if option_text.startswith(prefix):
+            return option_text[len(prefix):]
+    return option_text
+
+def add_section(data, unavailable_items, section_title, available_options, section_unavailable):
+    if section_title in data and available_options:
+        data[section_title] = ', '.join(available_options)
+    if section_unavailable:
+        unavailable_items.extend(section_unavailable)
+
+def read_coordinates(data, current_url):
+    if coords := re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', current_url):
+        data['Latitude'], data['Longitude'] = coords.groups()
+
+def _snapshot_text(element):
+    """Approximation of WebElement.text: rendered text with runs of whitespace collapsed per line"""
+    lines = (' '.join(line.split()) for line in element.get_text('\n').split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+def extract_snapshot_attributes(section):
+    """extract_attributes for a BeautifulSoup section element"""
+    available_options = []
+    unavailable_options = []
+    for option in section.select(OPTION_SELECTOR):
+        spans = option.select('span[aria-label]')
+        if not spans:
+            continue
+        option_text = spans[0]['aria-label']
+        classes = option.get('class', [])
+        not_available = (
+            any(name in classes for name in UNAVAILABLE_OPTION_CLASSES) or
+            bool(option.select('span.OazX1c')) or
+            option_text.startswith(("No ", "Doesn't ")) or
+            "not available" in option_text.lower()
+        )
+        (unavailable_options if not_available else available_options).append(option_name(option_text))
+    return available_options, unavailable_options
+
+def parse_place_snapshot(html, current_url='', include_sections=True):
+    """Extract the fetch_google_maps_data fields from one rendered place page.
+
+    Mirrors the WebDriver extraction element for element, but on a parsed
+    copy of page_source, so a place costs one round trip to chromedriver
+    instead of several per attribute. Sections and coordinates are skipped
+    when include_sections is false, as when the info container never loaded.
+    """
+    data = {field: 'Not available' for field in EXPECTED_GOOGLE_FIELDS}
+    soup = make_soup(html)
+
+    for element in soup.select(BASIC_INFO_SELECTOR):
+        class_name = ' '.join(element.get('class', []))
+        read_basic_info(data, class_name, _snapshot_text(element), partial(element.get, 'aria-label'))
+
+    if not include_sections:
+        return data
+
+    container = soup.select_one(INFO_CONTAINER_SELECTOR)
+    unavailable_items = []
+    for section in container.select(INFO_SECTION_SELECTOR) if container else []:
+        title_element = section.select_one(SECTION_TITLE_SELECTOR)
+        if title_element is None:
+            logger.error("Error processing section: no title element")
+            continue
+        add_section(data, unavailable_items, _snapshot_text(title_element).strip(),
+                    *extract_snapshot_attributes(section))
+    if unavailable_items:
+        data['Doesnt Offer'] = ', '.join(unavailable_items)
+
+    read_coordinates(data, current_url)
+    return data
+
+def fetch_google_maps_data(url, driver=None, timings=None, extraction_mode=None):
+    """Scrape a Google Maps place page within GOOGLE_MAPS_CONFIG['latency_budget'].
+
+    Each phase waits for the elements it needs instead of sleeping, and every
+    wait, including the page load itself, is capped by the remaining budget
+    so a slow page returns partial data. In 'snapshot' mode (GOOGLE_MAPS_CONFIG['extraction_mode']) the
+    fields are parsed from one page_source snapshot, in the HTML parse pool,
+    once the page has settled; 'webdriver' reads every element through the driver. Per-phase
+    durations are logged and copied into timings if given.
+    """
     data = {field: 'Not available' for field in EXPECTED_GOOGLE_FIELDS}
+    budget = LatencyBudget(GOOGLE_MAPS_CONFIG['latency_budget'])
+    snapshot = (extraction_mode or GOOGLE_MAPS_CONFIG['extraction_mode']) == 'snapshot'
 
     try:
-        driver.get(url)
-        time.sleep(1)
+        with budget.phase('load'):
+            driver.set_page_load_timeout(max(1.0, budget.remaining()))
+            try:
+                driver.get(url)
+            except TimeoutException:
+                logger.warning(f"Page load for {url} hit the latency budget; extracting what has loaded")
 
         try:
-            elements = WebDriverWait(driver, 5).until(
-                EC.presence_of_all_elements_located((
-                    By.CSS_SELECTOR, 
-                    'div.F7nice, button.DkEaL[jsaction*="category"], span[aria-label*="Price"]'
-                ))
-            )
-            
-            for element in elements:
-                class_name = element.get_attribute('class')
-                if 'F7nice' in class_name:
-                    rating_text = element.text
-                    if rating_match := re.search(r'(\d+\.\d+)', rating_text):
-                        data['Star Rating'] = rating_match.group(1)
-                    if reviews_match := re.search(r'\(([0-9,]+)\)', rating_text):
-                        data['Number of Reviews'] = reviews_match.group(1).replace(',', '')
-                elif 'DkEaL' in class_name:
-                    data['Restaurant Category'] = element.text
-                else:
-                    aria_label = element.get_attribute('aria-label')
-                    if aria_label and 'Price' in aria_label:
-                        data['Price Range'] = element.text.strip()
+            with budget.phase('basic_info'):
+                elements = WebDriverWait(driver, budget.timeout(GOOGLE_MAPS_CONFIG['basic_info_timeout'])).until(
+                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, BASIC_INFO_SELECTOR))
+                )
+                
+                for element in [] if snapshot else elements:
+                    read_basic_info(data, element.get_attribute('class'), element.text,
+                                    partial(element.get_attribute, 'aria-label'))
 
         except Exception as e:
             logger.error(f"Error extracting basic info: {str(e)}")
 
-        if 'Not available' in data.values():
+        # Snapshot mode has read nothing yet, so it always opens the About tab,
+        # as the WebDriver path does while any attribute is still missing
+        if (snapshot or 'Not available' in data.values()) and not budget.exhausted():
             try:
-                about_tab = safe_find_element(driver, By.CSS_SELECTOR, 'button[aria-label*="About"]', timeout=2)
-                if about_tab:
-                    about_tab.click()
-                    time.sleep(1)
+                with budget.phase('about_tab'):
+                    about_tab = safe_find_element(
+                        driver, By.CSS_SELECTOR, 'button[aria-label*="About"]',
+                        timeout=budget.timeout(GOOGLE_MAPS_CONFIG['about_tab_timeout'])
+                    )
+                    if about_tab:
+                        about_tab.click()
             except:
                 pass
 
         try:
-            info_container = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.m6QErb[role="region"]'))
-            )
-            time.sleep(5)
-            
-            if info_container:
-                info_sections = info_container.find_elements(
-                    By.CSS_SELECTOR, 
-                    'div.iP2t7d, div.LBgpqf'
+            with budget.phase('sections_wait'):
+                info_container = WebDriverWait(driver, budget.timeout(GOOGLE_MAPS_CONFIG['info_container_timeout'])).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, INFO_CONTAINER_SELECTOR))
                 )
-                
+                info_sections = wait_for_stable_sections(info_container, budget) if info_container else []
+            
+            with budget.phase('extract'):
+                if snapshot:
+                    return parse_html(parse_place_snapshot, driver.page_source, driver.current_url)
+
                 unavailable_items = []
                 for section in info_sections:
                     try:
-                        title_element = section.find_element(By.CSS_SELECTOR, 'h2.iL3Qke')
-                        section_title = title_element.text.strip()
-                        
-                        available_options, section_unavailable = extract_attributes(section)
-                        
-                        if section_title in data and available_options:
-                            data[section_title] = ', '.join(available_options)
-                        
-                        if section_unavailable:
-                            unavailable_items.extend(section_unavailable)
+                        title_element = section.find_element(By.CSS_SELECTOR, SECTION_TITLE_SELECTOR)
+                        add_section(data, unavailable_items, title_element.text.strip(),
+                                    *extract_attributes(section))
                             
                     except Exception as e:
                         logger.error(f"Error processing section: {str(e)}")
@@ -128,26 +291,65 @@ def fetch_google_maps_data(url, driver=None):
                     data['Doesnt Offer'] = ', '.join(unavailable_items)
                     
         except TimeoutException:
-            logger.warning("Info container not found within timeout")
+            if budget.exhausted():
+                logger.warning(f"Latency budget exhausted for {url}; returning partial data")
+            else:
+                logger.warning("Info container not found within timeout")
+            if snapshot:
+                with budget.phase('extract'):
+                    return parse_html(parse_place_snapshot, driver.page_source, '', False)
             return data
         except Exception as e:
             logger.error(f"Error extracting information sections: {str(e)}")
             return data
 
-        if coords := re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', driver.current_url):
-            data['Latitude'], data['Longitude'] = coords.groups()
+        read_coordinates(data, driver.current_url)
 
         return data
 
     except Exception as e:
         logger.error(f"Error fetching Google Maps data: {str(e)}")
+        record_error('google_maps_place')
         return data
 
+    finally:
+        observe('google_maps_place', time.monotonic() - budget.started)
+        record_rows('google_maps_place')
+        logger.info(f"Google Maps timings for {url} ({'snapshot' if snapshot else 'webdriver'} extraction): "
+                    f"{budget.report()}")
+        if timings is not None:
+            timings.update(budget.timings)
+
+def fetch_google_maps_data_cached(url, driver=None, timings=None, cache=None):
+    """fetch_google_maps_data behind the persistent GoogleMapsCache.
+
+    Fresh entries are returned without touching the browser. When some field
+    groups have expired the page is scraped again, and fields the new scrape
+    could not find keep their still-fresh cached values.
+    """
+    if cache is None:
+        cache = get_google_maps_cache()
+    if cache is None:
+        return fetch_google_maps_data(url, driver, timings)
+
+    cached, stale_groups = cache.get(url)
+    if cached and not stale_groups:
+        return cached
+
+    data = fetch_google_maps_data(url, driver, timings)
+    found_groups = {cache.group_of(field) for field, value in data.items() if value != 'Not available'}
+    kept_groups = {cache.group_of(field) for field in cached} - found_groups
+    for field, value in cached.items():
+        if data.get(field, 'Not available') == 'Not available':
+            data[field] = value
+    cache.put(url, data, skip_groups=kept_groups)
+    return data
+
 def extract_attributes(section):
     available_options = []
     unavailable_options = []
     
-    options = section.find_elements(By.CSS_SELECTOR, 'div.iNvpkb, div.Rz1y8b')
+    options = section.find_elements(By.CSS_SELECTOR, OPTION_SELECTOR)
     for option in options:
         try:
             spans = option.find_elements(By.CSS_SELECTOR, 'span[aria-label]')
@@ -164,13 +366,7 @@ def extract_attributes(section):
                 "not available" in option_text.lower()
             )
             
-            option_text = clean_text(option_text)
-            for prefix in ("Has ", "Serves ", "No ", "Doesn't "):
-                if option_text.startswith(prefix):
-                    option_text = option_text[len(prefix):]
-                    break
-                
-            (unavailable_options if not_available else available_options).append(option_text)
+            (unavailable_options if not_available else available_options).append(option_name(option_text))
                 
         except Exception as e:
             logger.debug(f"Error processing option: {str(e)}")
@@ -181,7 +377,7 @@ def extract_attributes(section):
 def process_csv(input_file, output_file):
     driver = None
     try:
-        driver = WebDriverManager.create_driver()
+        driver = WebDriverManager.checkout()
         df = pd.read_csv(input_file)
         
         ensure_csv_exists(output_file, list(df.columns) + list(EXPECTED_GOOGLE_FIELDS))
@@ -195,7 +391,7 @@ def process_csv(input_file, output_file):
                     search_query = f"{row['Restaurant Name']} {row['Address']} {row['City']} {row['State']}"
                     google_maps_url = f"https://www.google.com/maps/search/{quote(search_query)}"
                 
-                google_data = fetch_google_maps_data(google_maps_url, driver)
+                google_data = fetch_google_maps_data_cached(google_maps_url, driver)
                 processed_row = {**row.to_dict(), **google_data}
                 
                 write_row(output_file, processed_row, list(df.columns) + list(EXPECTED_GOOGLE_FIELDS))
@@ -207,7 +403,10 @@ def process_csv(input_file, output_file):
                 
     finally:
         if driver:
-            driver.quit()
+            WebDriverManager.checkin(driver)
+        close_csv_sinks(output_file)
+        log_cache_stats()
+        log_parse_stats()
 
 def process_google_data(input_file=CLEANED_RESTAURANTS_CSV, output_file=ENHANCED_RESTAURANTS_CSV):
     process_csv(input_file, output_file)
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlparse
+import requests
+from ..config.config import EATER_CONFIG
+from src.utils.http_client import get_http_session, random_headers
+from src.utils.html_parser import make_soup, strainer
+
+logger = logging.getLogger(__name__)
+
+EATER_ROOT = 'https://www.eater.com'
+
+def archive_page_url(base_url, page):
+    return f"{base_url}?page={page}" if page > 1 else base_url
+
+ARCHIVE_ENTRY_STRAINER = strainer('div', 'c-compact-river__entry')
+
+def parse_archive_entries(html):
+    """Return the article URLs listed on an archive page"""
+    soup = make_soup(html, parse_only=ARCHIVE_ENTRY_STRAINER)
+    urls = []
+    for entry in soup.find_all('div', class_='c-compact-river__entry'):
+        if link := entry.find('a'):
+            article_url = link['href']
+            if not article_url.startswith('http'):
+                article_url = EATER_ROOT + article_url
+            urls.append(article_url)
+    return urls
+
+class _HostLimiter:
+    """Per-host concurrency cap and minimum spacing between request starts"""
+
+    def __init__(self, max_concurrency, delay):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._delay = delay
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        async with self._lock:
+            wait = self._next_start - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_start = time.monotonic() + self._delay
+
+    async def __aexit__(self, *exc):
+        self._semaphore.release()
+
+class ArchiveCrawler:
+    """Concurrent discovery of article URLs from the Eater archive index.
+
+    Archive pages are fetched on an asyncio loop in a background thread,
+    limited per host, and their article URLs are streamed to the caller in
+    page order. Crawling stops at the first page without entries.
+    """
+
+    _DONE = object()
+
+    def __init__(self, base_url=None, start_page=None, end_page=None, max_concurrency=None,
+                 politeness_delay=None, max_retries=None, retry_backoff=None, timeout=None):
+        settings = EATER_CONFIG['crawler']
+        self.base_url = base_url or EATER_CONFIG['base_url']
+        self.start_page = start_page or EATER_CONFIG['page_range']['start']
+        self.end_page = end_page or EATER_CONFIG['page_range']['end']
+        self.max_concurrency = max_concurrency or settings['max_concurrency_per_host']
+        self.politeness_delay = (politeness_delay if politeness_delay is not None
+                                 else settings['politeness_delay'])
+        self.max_retries = max_retries or settings['max_retries']
+        self.retry_backoff = retry_backoff if retry_backoff is not None else settings['retry_backoff']
+        self.timeout = timeout or settings['request_timeout']
+        self._limiters = {}
+
+    def stream(self):
+        """Yield (page, index, total, article_url) as archive pages arrive.
+
+        Raises the last request error if a page still fails after retries,
+        after yielding the URLs of the pages before it.
+        """
+        results = queue.Queue()
+        loop = asyncio.new_event_loop()
+        stop = threading.Event()
+        task_holder = {}
+
+        def run():
+            asyncio.set_event_loop(loop)
+            task = loop.create_task(self._crawl(results, stop))
+            task_holder['task'] = task
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                results.put(e)
+            finally:
+                results.put(self._DONE)
+                loop.close()
+
+        thread = threading.Thread(target=run, name="archive-crawler", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is self._DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            task = task_holder.get('task')
+            if task and not loop.is_closed():
+                try:
+                    loop.call_soon_threadsafe(task.cancel)
+                except RuntimeError:
+                    pass
+            thread.join()
+
+    async def _crawl(self, results, stop):
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="archive-fetch")
+        pending = {}
+        next_page = self.start_page
+        window = self.max_concurrency * 2
+        try:
+            for page in range(self.start_page, self.end_page + 1):
+                while next_page <= self.end_page and len(pending) < window:
+                    pending[next_page] = asyncio.ensure_future(self._fetch_page(next_page, executor))
+                    next_page += 1
+
+                html = await pending.pop(page)
+                urls = parse_archive_entries(html)
+                if not urls:
+                    logger.warning(f"No entries found on page {page}. Stopping pagination.")
+                    break
+
+                logger.info(f"Discovered {len(urls)} articles on archive page {page} "
+                            f"(range: {self.start_page}-{self.end_page})")
+                for idx, url in enumerate(urls, 1):
+                    results.put((page, idx, len(urls), url))
+                if stop.is_set():
+                    break
+        finally:
+            for task in pending.values():
+                task.cancel()
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+            executor.shutdown(wait=False)
+
+    async def _fetch_page(self, page, executor):
+        url = archive_page_url(self.base_url, page)
+        host = urlparse(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = _HostLimiter(self.max_concurrency, self.politeness_delay)
+
+        loop = asyncio.get_running_loop()
+        session = get_http_session()
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                async with limiter:
+                    response = await loop.run_in_executor(
+                        executor,
+                        partial(session.get, url, headers=random_headers(), timeout=self.timeout)
+                    )
+                response.raise_for_status()
+                return response.text
+            except requests.RequestException as e:
+                logger.warning(f"Attempt {attempt} failed for archive page {page}: {e}")
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+def discover_article_urls(**kwargs):
+    """Stream (page, index, total, article_url) tuples from the archive index"""
+    return ArchiveCrawler(**kwargs).stream()
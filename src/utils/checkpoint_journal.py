@@ -0,0 +1,95 @@
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+import pandas as pd
+from ..config.config import CHECKPOINT_JOURNAL_DB, EXPECTED_GOOGLE_FIELDS
+from .helpers import MISSING_VALUES
+
+logger = logging.getLogger(__name__)
+
+KEY_FIELDS = ('Restaurant Name', 'Cleaned Address')
+
+def _key(name, address):
+    return ('' if pd.isna(name) else str(name), '' if pd.isna(address) else str(address))
+
+class CheckpointJournal:
+    """SQLite record of rows that finished enrichment.
+
+    Only rows whose scrape found at least one Google field belong here, so
+    failed scrapes are retried on the next run. Keys are (Restaurant Name,
+    Cleaned Address). All keys are loaded into
+    memory once so lookups are O(1); each completion is committed in its own
+    transaction, so a killed run resumes from the last committed row.
+    """
+
+    def __init__(self, path=CHECKPOINT_JOURNAL_DB, seed_csv=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS enriched (
+                restaurant_name TEXT NOT NULL,
+                cleaned_address TEXT NOT NULL,
+                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (restaurant_name, cleaned_address)
+            )
+        ''')
+        self._conn.commit()
+        self._done = set(self._conn.execute('SELECT restaurant_name, cleaned_address FROM enriched'))
+
+        if not self._done and seed_csv and Path(seed_csv).exists():
+            self._seed(seed_csv)
+        logger.info(f"Checkpoint journal {self.path} has {len(self._done)} completed rows")
+
+    def _seed(self, csv_path):
+        """Import rows already enriched by runs that predate the journal"""
+        try:
+            df = pd.read_csv(csv_path, dtype=str)
+        except Exception as e:
+            logger.error(f"Error seeding checkpoint journal from {csv_path}: {e}")
+            return
+        if df.empty or not set(KEY_FIELDS).issubset(df.columns):
+            return
+        google_fields = [field for field in EXPECTED_GOOGLE_FIELDS if field in df.columns]
+        if google_fields:
+            values = df[google_fields].apply(lambda column: column.str.strip())
+            enriched = df[(values.notna() & ~values.isin(MISSING_VALUES)).any(axis=1)]
+        else:
+            enriched = df.iloc[0:0]
+        keys = {_key(name, address) for name, address in zip(enriched[KEY_FIELDS[0]], enriched[KEY_FIELDS[1]])}
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO enriched (restaurant_name, cleaned_address) VALUES (?, ?)', keys
+            )
+            self._conn.commit()
+            self._done.update(keys)
+        logger.info(f"Seeded checkpoint journal with {len(keys)} rows from {csv_path}")
+
+    def __len__(self):
+        return len(self._done)
+
+    def is_done(self, name, address):
+        return _key(name, address) in self._done
+
+    def mark_done(self, name, address):
+        key = _key(name, address)
+        with self._lock:
+            if key in self._done:
+                return
+            self._conn.execute(
+                'INSERT OR IGNORE INTO enriched (restaurant_name, cleaned_address) VALUES (?, ?)', key
+            )
+            self._conn.commit()
+            self._done.add(key)
+
+    def pending(self, df):
+        """Rows of df that have not been enriched yet"""
+        done = [_key(name, address) in self._done for name, address in zip(df[KEY_FIELDS[0]], df[KEY_FIELDS[1]])]
+        return df[[not flag for flag in done]]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
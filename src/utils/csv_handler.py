@@ -1,7 +1,14 @@
+import atexit
 import csv
+import os
+import queue
+import threading
+import time
 from pathlib import Path
 import pandas as pd
 import logging
+from ..config.config import CSV_WRITER_CONFIG
+from .metrics import observe, record_rows, record_error
 
 logger = logging.getLogger(__name__)
 
@@ -9,23 +16,212 @@ def ensure_csv_exists(filepath, fieldnames):
     """Ensure CSV file exists with headers"""
     filepath = Path(filepath)
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    
+
     if not filepath.exists():
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
 
+class CSVSink:
+    """Single writer thread that owns one CSV file.
+
+    Rows from any number of threads are queued and written by the sink's own
+    thread, which keeps the file open and flushes in batches instead of
+    reopening the file for every row.
+    """
+
+    _STOP = object()
+
+    def __init__(self, filepath, fieldnames, batch_size=None, flush_interval=None,
+                 fsync=None, queue_size=None):
+        self.filepath = Path(filepath)
+        self.fieldnames = list(fieldnames)
+        self.batch_size = batch_size or CSV_WRITER_CONFIG['batch_size']
+        self.flush_interval = (flush_interval if flush_interval is not None
+                               else CSV_WRITER_CONFIG['flush_interval'])
+        self.fsync = CSV_WRITER_CONFIG['fsync'] if fsync is None else fsync
+        self.closed = False
+        self.rows_written = 0
+        self._rows_flushed = 0
+
+        self._fieldname_set = set(self.fieldnames)
+        self._queue = queue.Queue(maxsize=queue_size or CSV_WRITER_CONFIG['queue_size'])
+        self._close_lock = threading.Lock()
+        self._flush_listeners = []
+
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.filepath, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+            self._flush_file()
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"csv-sink-{self.filepath.name}", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, row, on_flushed=None):
+        """Queue a row for writing; raises ValueError for unknown fields like DictWriter.
+
+        on_flushed, if given, is called from the writer thread once the row
+        has been flushed (and fsynced when enabled).
+        """
+        extra = [key for key in row if key not in self._fieldname_set]
+        if extra:
+            raise ValueError(f"dict contains fields not in fieldnames: {', '.join(map(repr, extra))}")
+        # Checked and queued under the lock so no row can land behind STOP
+        with self._close_lock:
+            if self.closed:
+                raise ValueError(f"CSV sink for {self.filepath} is closed")
+            self._queue.put((row, on_flushed))
+
+    def add_flush_listener(self, callback):
+        """Call callback() from the writer thread after every flush.
+
+        Listeners run once per flush, after that flush's on_flushed callbacks,
+        so work those callbacks queue up can be done once per batch. Adding
+        the same callback again is a no-op.
+        """
+        with self._close_lock:
+            if callback not in self._flush_listeners:
+                self._flush_listeners.append(callback)
+
+    def flush(self):
+        """Block until every row queued so far has been flushed to disk"""
+        done = None
+        with self._close_lock:
+            if not self.closed:
+                done = threading.Event()
+                self._queue.put(done)
+        if done is None:
+            # close() flushes everything queued before STOP; wait for it to finish
+            self._thread.join()
+        else:
+            done.wait()
+
+    def close(self):
+        with self._close_lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _flush_file(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def _run(self):
+        pending = 0
+        callbacks = []
+        self._last_flush = time.monotonic()
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0, self.flush_interval - (time.monotonic() - self._last_flush))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._safe_flush(callbacks)
+                pending = 0
+                continue
+
+            if item is self._STOP:
+                self._safe_flush(callbacks)
+                self._file.close()
+                return
+            if isinstance(item, threading.Event):
+                self._safe_flush(callbacks)
+                pending = 0
+                item.set()
+                continue
+
+            row, on_flushed = item
+            try:
+                self._writer.writerow(row)
+                self.rows_written += 1
+                pending += 1
+                if on_flushed:
+                    callbacks.append(on_flushed)
+            except Exception as e:
+                logger.error(f"Error writing row to {self.filepath}: {e}")
+
+            if pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._safe_flush(callbacks)
+                pending = 0
+
+    def _safe_flush(self, callbacks=None):
+        started = time.perf_counter()
+        try:
+            self._flush_file()
+        except Exception as e:
+            logger.error(f"Error flushing {self.filepath}: {e}")
+            record_error('csv_flush', file=self.filepath.name)
+            return
+        observe('csv_flush', time.perf_counter() - started, file=self.filepath.name)
+        record_rows('csv_flush', self.rows_written - self._rows_flushed, file=self.filepath.name)
+        self._rows_flushed = self.rows_written
+        for callback in callbacks or ():
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in flush callback for {self.filepath}: {e}")
+        if callbacks:
+            callbacks.clear()
+        for listener in tuple(self._flush_listeners):
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Error in flush listener for {self.filepath}: {e}")
+
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+def get_csv_sink(filepath, fieldnames):
+    """Return the shared sink for filepath, creating it on first use"""
+    path = Path(filepath).resolve()
+    with _sinks_lock:
+        sink = _sinks.get(path)
+        if sink is None or sink.closed:
+            sink = CSVSink(path, fieldnames)
+            _sinks[path] = sink
+        elif sink.fieldnames != list(fieldnames):
+            logger.warning(f"CSV sink for {path} already open with different fieldnames")
+        return sink
+
+def flush_csv_sink(filepath):
+    """Flush the sink for filepath if one is open"""
+    with _sinks_lock:
+        sink = _sinks.get(Path(filepath).resolve())
+    if sink:
+        sink.flush()
+
+def close_csv_sinks(*filepaths):
+    """Close the sinks for the given files, or every open sink if none are given"""
+    with _sinks_lock:
+        if filepaths:
+            sinks = [_sinks.pop(Path(p).resolve(), None) for p in filepaths]
+        else:
+            sinks = list(_sinks.values())
+            _sinks.clear()
+    for sink in sinks:
+        if sink:
+            sink.close()
+
+atexit.register(close_csv_sinks)
+
 def write_row(filepath, row_data, fieldnames):
     """Write a single row to CSV file"""
-    with open(filepath, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writerow(row_data)
+    get_csv_sink(filepath, fieldnames).write(row_data)
 
 def is_duplicate(filepath, key_fields, row_data):
     """Check if row already exists based on key fields"""
     if not Path(filepath).exists():
         return False
-        
+
     try:
         df = pd.read_csv(filepath)
         for _, row in df.iterrows():
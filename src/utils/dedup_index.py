@@ -0,0 +1,147 @@
+import csv
+import hashlib
+import logging
+import os
+import struct
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+KEY_SIZE = 8
+INDEX_MAGIC = b'DEDUPIX1'
+# Magic, then the size and mtime (ns) of the CSV the keys were taken from
+HEADER = struct.Struct('<8sQQ')
+
+
+def hash_key(*values):
+    """Hash a composite key into a fixed-size digest"""
+    joined = '\x1f'.join('' if value is None else str(value) for value in values)
+    return hashlib.blake2b(joined.encode('utf-8'), digest_size=KEY_SIZE).digest()
+
+
+class DedupIndex:
+    """Set of hashed keys for a CSV file, persisted as a binary sidecar.
+
+    The sidecar is a header recording the CSV's size and mtime followed by
+    fixed-size digests, one per row written to the CSV. ``add`` records a key
+    in memory; ``persist`` queues it once the row has been flushed to the
+    CSV, and ``sync`` appends the queued keys and refreshes the header in
+    one write per CSV flush. A restart reads the sidecar instead of
+    rescanning the CSV, unless the header no longer matches the CSV (a crash
+    between the two writes, or the CSV was edited), in which case the index
+    is rebuilt from the CSV.
+    """
+
+    def __init__(self, csv_path, key_fields, index_path=None):
+        self.csv_path = Path(csv_path)
+        self.key_fields = list(key_fields)
+        self.index_path = Path(index_path) if index_path else self.csv_path.with_suffix('.idx')
+        self._keys = set()
+        self._unsynced = []
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.csv_path.exists():
+            if self.index_path.exists():
+                logger.info(f"Discarding stale dedup index {self.index_path}")
+                self.index_path.unlink()
+            return
+
+        if self.index_path.exists():
+            data = self.index_path.read_bytes()
+            if data[:HEADER.size] == self._header():
+                usable = len(data) - (len(data) - HEADER.size) % KEY_SIZE
+                self._keys = {data[i:i + KEY_SIZE] for i in range(HEADER.size, usable, KEY_SIZE)}
+                logger.info(f"Loaded {len(self._keys)} keys from dedup index {self.index_path}")
+                return
+            logger.info(f"Dedup index {self.index_path} does not match {self.csv_path}, rebuilding")
+
+        self._rebuild()
+
+    def _header(self):
+        stat = self.csv_path.stat()
+        return HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns)
+
+    def _rebuild(self):
+        """Build the index from the CSV once and write the sidecar"""
+        keys = set()
+        try:
+            with open(self.csv_path, 'r', newline='', encoding='utf-8') as file:
+                reader = csv.DictReader(file)
+                for row in reader:
+                    keys.add(hash_key(*(row.get(field) for field in self.key_fields)))
+        except Exception as e:
+            logger.error(f"Error building dedup index from {self.csv_path}: {e}")
+            return
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'wb') as file:
+            file.write(self._header())
+            file.write(b''.join(keys))
+        self._keys = keys
+        logger.info(f"Built dedup index with {len(keys)} keys from {self.csv_path}")
+
+    def key_for(self, entry):
+        return hash_key(*(entry.get(field) for field in self.key_fields))
+
+    def __contains__(self, entry):
+        return self.key_for(entry) in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, entry):
+        """Record an entry in memory; returns False if it was already present"""
+        key = self.key_for(entry)
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+        return True
+
+    def persist(self, entry):
+        """Queue an entry's key for the sidecar; call once its CSV row is on disk"""
+        key = self.key_for(entry)
+        with self._lock:
+            self._unsynced.append(key)
+
+    def sync(self):
+        """Append the keys queued by persist to the sidecar in a single write"""
+        with self._lock:
+            if not self._unsynced:
+                return
+            keys, self._unsynced = self._unsynced, []
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.index_path, 'r+b' if self.index_path.exists() else 'w+b') as file:
+                    if file.seek(0, os.SEEK_END) < HEADER.size:
+                        file.write(bytes(HEADER.size))
+                    file.write(b''.join(keys))
+                    # The header goes last: a crash before it leaves a mismatch, not a lost row
+                    file.seek(0)
+                    file.write(self._header())
+            except OSError as e:
+                logger.error(f"Error updating dedup index {self.index_path}: {e}")
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_dedup_index(csv_path, key_fields):
+    """Return the process-wide index for csv_path, loading it on first use"""
+    path = Path(csv_path).resolve()
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = DedupIndex(path, key_fields)
+            _indexes[path] = index
+        return index
+
+
+def reset_dedup_index(csv_path):
+    """Drop the cached index so the next lookup reloads it from disk"""
+    with _indexes_lock:
+        _indexes.pop(Path(csv_path).resolve(), None)
@@ -0,0 +1,173 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from ..config.config import GOOGLE_MAPS_CACHE_CONFIG
+from .helpers import found_any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUP = 'attributes'
+
+class GoogleMapsCache:
+    """Persistent cache of extracted Google Maps fields, keyed by Maps URL.
+
+    Fields are stored in groups (ratings change faster than coordinates),
+    each with its own fetch time and TTL. ``get`` returns the groups that are
+    still fresh together with the names of the stale ones, so callers can
+    refetch only when something has expired and keep fresh values the new
+    scrape failed to find. Only groups with at least one real value are
+    stored; a group with no cached row counts as stale.
+    """
+
+    def __init__(self, path=None, field_groups=None, ttl=None, max_entries=None, max_age=None):
+        self.path = Path(path or GOOGLE_MAPS_CACHE_CONFIG['path'])
+        self.ttl = ttl or GOOGLE_MAPS_CACHE_CONFIG['ttl']
+        self.max_entries = max_entries or GOOGLE_MAPS_CACHE_CONFIG['max_entries']
+        self.max_age = max_age or GOOGLE_MAPS_CACHE_CONFIG['max_age']
+        field_groups = field_groups or GOOGLE_MAPS_CACHE_CONFIG['field_groups']
+        self._group_of = {field: group for group, fields in field_groups.items() for field in fields}
+        self.groups = set(field_groups) | {DEFAULT_GROUP}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                accessed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS field_groups (
+                key TEXT NOT NULL,
+                field_group TEXT NOT NULL,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (key, field_group)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries (accessed_at);
+        ''')
+        self._conn.commit()
+        self.evict()
+
+    def group_of(self, field):
+        return self._group_of.get(field, DEFAULT_GROUP)
+
+    def get(self, key):
+        """Return (fresh_fields, stale_groups) for key.
+
+        An unknown key returns ({}, None); a full hit returns stale_groups
+        as an empty set. Expired groups and groups never stored are stale.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT field_group, data, fetched_at FROM field_groups WHERE key = ?', (key,)
+            ).fetchall()
+            if not rows:
+                self.misses += 1
+                return {}, None
+
+            fields, stale = {}, self.groups - {group for group, _, _ in rows}
+            for group, data, fetched_at in rows:
+                if now - fetched_at < self.ttl.get(group, self.ttl[DEFAULT_GROUP]):
+                    fields.update(json.loads(data))
+                else:
+                    stale.add(group)
+
+            if stale:
+                self.refreshes += 1
+            else:
+                self.hits += 1
+                self._conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+                self._conn.commit()
+            return fields, stale
+
+    def put(self, key, data, skip_groups=()):
+        """Store the groups of a scrape result that found at least one real value.
+
+        Groups the scrape found nothing for are not cached, so they are
+        fetched again next time. Groups in skip_groups keep their existing
+        cached values and fetch time.
+        """
+        groups = {}
+        for field, value in data.items():
+            group = self.group_of(field)
+            if group not in skip_groups:
+                groups.setdefault(group, {})[field] = value
+        groups = {group: fields for group, fields in groups.items() if found_any(fields.values())}
+        if not groups:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, accessed_at) VALUES (?, ?)', (key, now)
+            )
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO field_groups (key, field_group, data, fetched_at) VALUES (?, ?, ?, ?)',
+                [(key, group, json.dumps(fields), now) for group, fields in groups.items()]
+            )
+            self._conn.commit()
+
+    def evict(self):
+        """Drop entries older than max_age, then the least recently used beyond max_entries"""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            self._conn.execute(
+                'DELETE FROM entries WHERE key IN '
+                '(SELECT key FROM field_groups GROUP BY key HAVING MAX(fetched_at) < ?)', (cutoff,)
+            )
+            self._conn.execute(
+                'DELETE FROM entries WHERE key IN '
+                '(SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)', (self.max_entries,)
+            )
+            removed = self._conn.execute(
+                'DELETE FROM field_groups WHERE key NOT IN (SELECT key FROM entries)'
+            ).rowcount
+            self._conn.commit()
+        if removed:
+            logger.info(f"Evicted {removed} cached field groups from {self.path}")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.refreshes
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_google_maps_cache():
+    """Return the shared cache, or None when GOOGLE_MAPS_CACHE_CONFIG disables it"""
+    global _cache
+    if not GOOGLE_MAPS_CACHE_CONFIG['enabled']:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = GoogleMapsCache()
+        return _cache
+
+def log_cache_stats():
+    if _cache is not None:
+        stats = _cache.stats()
+        logger.info(
+            f"Google Maps cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['refreshes']} refreshes ({stats['hit_rate']:.0%} hit rate)"
+        )
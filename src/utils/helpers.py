@@ -8,3 +8,15 @@ def get_project_root() -> Path:
     """Returns project root directory"""
     return Path(__file__).parent.parent.parent
 
+
+MISSING_VALUES = ('', 'Not available')
+
+def is_missing(value) -> bool:
+    """True for NaN/None, blank strings and the scrapers' 'Not available' placeholder"""
+    if value is None or (isinstance(value, float) and value != value):
+        return True
+    return str(value).strip() in MISSING_VALUES
+
+def found_any(values) -> bool:
+    """True when at least one of the scraped values is real data"""
+    return any(not is_missing(value) for value in values)
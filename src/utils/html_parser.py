@@ -0,0 +1,25 @@
+import importlib.util
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
+from ..config.config import HTML_PARSER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+LXML_AVAILABLE = importlib.util.find_spec('lxml') is not None
+
+def parser_backend(backend=None):
+    """BeautifulSoup tree builder to use: lxml when installed unless configured otherwise"""
+    backend = backend or HTML_PARSER_CONFIG['backend']
+    if backend == 'auto':
+        return 'lxml' if LXML_AVAILABLE else 'html.parser'
+    if backend == 'lxml' and not LXML_AVAILABLE:
+        logger.warning("lxml is not installed; falling back to html.parser")
+        return 'html.parser'
+    return backend
+
+def strainer(name, class_name):
+    """Only build the subtrees rooted at name elements carrying class_name"""
+    return SoupStrainer(name, class_=class_name)
+
+def make_soup(html, parse_only=None, backend=None):
+    return BeautifulSoup(html, parser_backend(backend), parse_only=parse_only)
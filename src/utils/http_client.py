@@ -0,0 +1,28 @@
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from ..config.config import EATER_CONFIG, HTTP_CONFIG
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_http_session():
+    """Shared requests session with pooled keep-alive connections"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_CONFIG['pool_connections'],
+                    pool_maxsize=HTTP_CONFIG['pool_maxsize']
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+def random_headers():
+    """Request headers with a rotated user agent"""
+    return {"User-Agent": random.choice(EATER_CONFIG['user_agents'])}
@@ -0,0 +1,231 @@
+import atexit
+import json
+import logging
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from ..config.config import METRICS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+class LatencyHistogram:
+    """Count, sum and a bounded uniform sample of observed durations"""
+
+    def __init__(self, max_samples):
+        self.max_samples = max_samples
+        self.count = 0
+        self.sum = 0.0
+        self.samples = []
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        if len(self.samples) < self.max_samples:
+            self.samples.append(seconds)
+        else:
+            # Reservoir sampling keeps the sample uniform over the whole run
+            slot = random.randrange(self.count)
+            if slot < self.max_samples:
+                self.samples[slot] = seconds
+
+    def quantiles(self, quantiles=QUANTILES):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in quantiles}
+        return {q: ordered[max(0, math.ceil(q * len(ordered)) - 1)] for q in quantiles}
+
+def _series_key(stage, labels):
+    return stage, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _series_name(key):
+    stage, labels = key
+    return f"{stage}[{','.join(f'{k}={v}' for k, v in labels)}]" if labels else stage
+
+def _label_text(key, extra=()):
+    stage, labels = key
+    pairs = [('stage', stage), *labels, *extra]
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+class MetricsRegistry:
+    """Latency histograms and row/error/retry counters per pipeline stage.
+
+    A series is a stage name plus optional labels (the Google Maps phase, the
+    CSV file). Everything is kept in memory for the run and exported once as
+    a Prometheus text file and a JSON summary.
+    """
+
+    def __init__(self, max_samples=None):
+        self.max_samples = max_samples or METRICS_CONFIG['max_samples']
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {'rows': {}, 'errors': {}, 'retries': {}}
+        self._active = {}
+
+    def _touch(self, key, now):
+        first, _ = self._active.get(key, (now, now))
+        self._active[key] = (first, now)
+
+    def observe(self, stage, seconds, **labels):
+        key = _series_key(stage, labels)
+        now = time.time()
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.max_samples)
+            histogram.observe(seconds)
+            self._touch(key, now - seconds)
+            self._touch(key, now)
+
+    def increment(self, kind, stage, value=1, **labels):
+        key = _series_key(stage, labels)
+        with self._lock:
+            counters = self._counters[kind]
+            counters[key] = counters.get(key, 0) + value
+            if kind == 'rows':
+                self._touch(key, time.time())
+
+    def empty(self):
+        with self._lock:
+            return not self._histograms and not any(self._counters.values())
+
+    def summary(self):
+        """Per-series call count, latency quantiles, rows, rows/sec, errors and retries"""
+        with self._lock:
+            histograms = {key: (h.count, h.sum, h.quantiles()) for key, h in self._histograms.items()}
+            counters = {kind: dict(values) for kind, values in self._counters.items()}
+            active = dict(self._active)
+        finished = time.time()
+
+        stages = {}
+        for key in sorted(set(histograms) | {key for values in counters.values() for key in values}):
+            count, total, quantiles = histograms.get(key, (0, 0.0, {q: 0.0 for q in QUANTILES}))
+            rows = counters['rows'].get(key, 0)
+            first, last = active.get(key, (None, None))
+            span = (last - first) if first is not None else 0.0
+            stages[_series_name(key)] = {
+                'calls': count,
+                'total_seconds': round(total, 6),
+                'mean_ms': round(1000 * total / count, 3) if count else 0.0,
+                **{f"p{int(q * 100)}_ms": round(1000 * value, 3) for q, value in quantiles.items()},
+                'rows': rows,
+                'rows_per_second': round(rows / span, 3) if rows and span > 0 else 0.0,
+                'errors': counters['errors'].get(key, 0),
+                'retries': counters['retries'].get(key, 0),
+            }
+        return {
+            'started_at': datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            'finished_at': datetime.fromtimestamp(finished, timezone.utc).isoformat(),
+            'seconds': round(finished - self.started, 3),
+            'stages': stages,
+        }
+
+    def prometheus_text(self, prefix=None):
+        """Render every series in the Prometheus text exposition format"""
+        prefix = prefix or METRICS_CONFIG['prefix']
+        with self._lock:
+            histograms = {key: (h.count, h.sum, h.quantiles()) for key, h in self._histograms.items()}
+            counters = {kind: dict(values) for kind, values in self._counters.items()}
+            active = dict(self._active)
+
+        lines = [
+            f"# HELP {prefix}_stage_seconds Duration of each call in a pipeline stage",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for key, (count, total, quantiles) in sorted(histograms.items()):
+            for q, value in quantiles.items():
+                lines.append(f"{prefix}_stage_seconds{_label_text(key, [('quantile', q)])} {value:.6f}")
+            lines.append(f"{prefix}_stage_seconds_sum{_label_text(key)} {total:.6f}")
+            lines.append(f"{prefix}_stage_seconds_count{_label_text(key)} {count}")
+
+        for kind, help_text in (('rows', 'Rows processed'), ('errors', 'Failed calls'),
+                                ('retries', 'Retried calls and replaced drivers')):
+            name = f"{prefix}_stage_{kind}_total"
+            lines += [f"# HELP {name} {help_text} per pipeline stage", f"# TYPE {name} counter"]
+            lines += [f"{name}{_label_text(key)} {value}" for key, value in sorted(counters[kind].items())]
+
+        name = f"{prefix}_stage_rows_per_second"
+        lines += [f"# HELP {name} Rows per second between a stage's first and last activity",
+                  f"# TYPE {name} gauge"]
+        for key, rows in sorted(counters['rows'].items()):
+            first, last = active.get(key, (None, None))
+            if first is not None and last > first:
+                lines.append(f"{name}{_label_text(key)} {rows / (last - first):.3f}")
+
+        lines += [f"# HELP {prefix}_run_seconds Seconds since the metrics were started",
+                  f"# TYPE {prefix}_run_seconds gauge",
+                  f"{prefix}_run_seconds {time.time() - self.started:.3f}"]
+        return '\n'.join(lines) + '\n'
+
+    def export(self, directory=None):
+        """Write the Prometheus file and JSON summary; returns their paths"""
+        directory = Path(directory or METRICS_CONFIG['directory'])
+        directory.mkdir(parents=True, exist_ok=True)
+        prometheus_path = directory / METRICS_CONFIG['prometheus_file']
+        summary_path = directory / METRICS_CONFIG['summary_file']
+        prometheus_path.write_text(self.prometheus_text(), encoding='utf-8')
+        summary_path.write_text(json.dumps(self.summary(), indent=2), encoding='utf-8')
+        return prometheus_path, summary_path
+
+_registry = MetricsRegistry()
+
+def get_metrics():
+    return _registry
+
+def observe(stage, seconds, **labels):
+    """Record one call's duration for a stage"""
+    if METRICS_CONFIG['enabled']:
+        _registry.observe(stage, seconds, **labels)
+
+def record_rows(stage, rows=1, **labels):
+    if METRICS_CONFIG['enabled'] and rows:
+        _registry.increment('rows', stage, rows, **labels)
+
+def record_error(stage, **labels):
+    if METRICS_CONFIG['enabled']:
+        _registry.increment('errors', stage, **labels)
+
+def record_retry(stage, **labels):
+    if METRICS_CONFIG['enabled']:
+        _registry.increment('retries', stage, **labels)
+
+@contextmanager
+def timer(stage, **labels):
+    """Time the block as one call of stage; an exception also counts as an error"""
+    if not METRICS_CONFIG['enabled']:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        _registry.increment('errors', stage, **labels)
+        raise
+    finally:
+        _registry.observe(stage, time.perf_counter() - start, **labels)
+
+def write_metrics(directory=None):
+    """Export the run's metrics if anything was recorded"""
+    if not METRICS_CONFIG['enabled'] or _registry.empty():
+        return None
+    try:
+        paths = _registry.export(directory)
+    except Exception as e:
+        logger.error(f"Error writing metrics: {e}")
+        return None
+    logger.info(f"Wrote metrics to {paths[0]} and {paths[1]}")
+    return paths
+
+def _write_at_exit():
+    if METRICS_CONFIG['export_at_exit']:
+        write_metrics()
+
+atexit.register(_write_at_exit)
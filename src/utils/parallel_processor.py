@@ -1,64 +1,142 @@
 import logging
+import queue
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
-from itertools import islice
-from src.scrapers.FetchGoogleData import fetch_google_maps_data
+from functools import partial
+from src.scrapers.FetchGoogleData import fetch_google_maps_data_cached
 from src.utils.webdriver_manager import WebDriverManager
-import pandas as pd
-import csv
+from src.utils.csv_handler import get_csv_sink, close_csv_sinks
+from src.utils.google_cache import log_cache_stats
+from src.utils.parse_pool import log_parse_stats
+from src.utils.metrics import observe, record_rows, record_error, record_retry
+from src.utils.helpers import found_any
+from src.config.config import PARALLEL_PROCESSING_CONFIG
 from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
-def process_with_parallel(df, output_file, fieldnames):
-    """Enhanced parallel processing with better error handling and progress tracking"""
-    chunk_size = -(-len(df) // 4)
-    chunks = [df[i:i + chunk_size] for i in range(0, len(df), chunk_size)]
-    
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = [
-            executor.submit(process_chunk, chunk, idx, output_file, fieldnames)
-            for idx, chunk in enumerate(chunks)
-        ]
-        
-        for future in futures:
-            try:
-                future.result()
-            except Exception as e:
-                logger.error(f"Error in parallel processing: {str(e)}")
+def google_maps_url_for(row):
+    """Maps link from the row, or a search URL built from its name and address"""
+    google_maps_url = row.get('Google Maps Link')
+    if not google_maps_url or google_maps_url == 'Google Maps Link Not Found':
+        search_query = f"{row['Restaurant Name']} {row['Address']} {row['City']} {row['State']}"
+        google_maps_url = f"https://www.google.com/maps/search/{quote(search_query)}"
+    return google_maps_url
+
+class _Progress:
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self._lock = threading.Lock()
+
+    def advance(self):
+        with self._lock:
+            self.done += 1
+            return self.done
+
+def process_with_parallel(df, output_file, fieldnames, num_workers=None, batch_size=None, journal=None):
+    """Enrich rows with workers that each own a browser and pull from a shared queue.
+
+    Work is handed out in batches of batch_size rows, so a slow restaurant
+    only delays its own worker. If a CheckpointJournal is given, each
+    row whose scrape found something is marked done once it has been
+    flushed to output_file; rows that found nothing are retried next run.
+    Returns per-worker throughput stats.
+    """
+    num_workers = num_workers or PARALLEL_PROCESSING_CONFIG['num_workers']
+    batch_size = batch_size or PARALLEL_PROCESSING_CONFIG['batch_size']
+
+    work_queue = queue.Queue()
+    for start in range(0, len(df), batch_size):
+        work_queue.put(df.iloc[start:start + batch_size])
+    num_workers = max(1, min(num_workers, work_queue.qsize()))
+    progress = _Progress(len(df))
+
+    stats = []
+    started = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="enrich") as executor:
+            futures = [
+                executor.submit(process_worker, worker_id, work_queue, output_file, fieldnames, progress, journal)
+                for worker_id in range(num_workers)
+            ]
+
+            for future in futures:
+                try:
+                    stats.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error in parallel processing: {str(e)}")
+    finally:
+        close_csv_sinks(output_file)
 
-def process_chunk(chunk_df, chunk_id, output_file, fieldnames):
-    """Process a chunk of restaurants with its own WebDriver instance"""
+    elapsed = time.monotonic() - started
+    for worker in stats:
+        logger.info(
+            f"Worker {worker['worker_id']}: {worker['rows']} rows, {worker['errors']} errors "
+            f"in {worker['seconds']:.1f}s ({worker['rows_per_minute']:.1f} rows/min)"
+        )
+    logger.info(f"Enriched {progress.done}/{progress.total} rows with {num_workers} workers in {elapsed:.1f}s")
+    log_cache_stats()
+    log_parse_stats()
+    return stats
+
+def process_worker(worker_id, work_queue, output_file, fieldnames, progress, journal=None):
+    """Pull batches until the queue is drained, using one pooled WebDriver"""
+    sink = get_csv_sink(output_file, fieldnames)
+    stats = {'worker_id': worker_id, 'rows': 0, 'errors': 0, 'seconds': 0.0, 'rows_per_minute': 0.0}
+    started = time.monotonic()
     driver = None
     try:
-        driver = WebDriverManager.create_driver()
-        
-        total_in_chunk = len(chunk_df)
-        
-        for idx, row in chunk_df.iterrows():
+        driver = WebDriverManager.checkout()
+
+        while True:
             try:
-                logger.info(f"Chunk {chunk_id}: Processing {idx - chunk_df.index[0] + 1}/{total_in_chunk}")
-                
-                google_maps_url = row.get('Google Maps Link')
-                if not google_maps_url or google_maps_url == 'Google Maps Link Not Found':
-                    search_query = f"{row['Restaurant Name']} {row['Address']} {row['City']} {row['State']}"
-                    google_maps_url = f"https://www.google.com/maps/search/{quote(search_query)}"
-                
-                google_data = fetch_google_maps_data(google_maps_url, driver)
-                processed_row = {**row.to_dict(), **google_data}
-                
-                with open(output_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writerow(processed_row)
-                    
-                logger.info(f"Successfully processed and saved: {row['Restaurant Name']}")
-                
-            except Exception as e:
-                logger.error(f"Error processing row {idx} in chunk {chunk_id}: {str(e)}")
-                with open(output_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writerow(row.to_dict())
-                continue
-                
+                batch = work_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            for idx, row in batch.iterrows():
+                row_started = time.perf_counter()
+                try:
+                    google_data = fetch_google_maps_data_cached(google_maps_url_for(row), driver)
+                    processed_row = {**row.to_dict(), **google_data}
+                    found = found_any(google_data.values())
+
+                    on_flushed = None
+                    if journal is not None and found:
+                        on_flushed = partial(journal.mark_done, row['Restaurant Name'], row['Cleaned Address'])
+                    sink.write(processed_row, on_flushed=on_flushed)
+
+                    logger.info(f"Worker {worker_id}: saved {row['Restaurant Name']} "
+                                f"({progress.advance()}/{progress.total})")
+
+                    if not found and not WebDriverManager.is_alive(driver):
+                        logger.warning(f"Worker {worker_id}: replacing unresponsive WebDriver")
+                        record_retry('enrich_row')
+                        WebDriverManager.checkin(driver, healthy=False)
+                        driver = None
+                        driver = WebDriverManager.checkout()
+
+                except Exception as e:
+                    logger.error(f"Worker {worker_id}: error processing row {idx}: {str(e)}")
+                    stats['errors'] += 1
+                    record_error('enrich_row')
+                    sink.write(row.to_dict())
+                    progress.advance()
+                    if driver is None:
+                        raise
+                    continue
+                finally:
+                    observe('enrich_row', time.perf_counter() - row_started)
+                stats['rows'] += 1
+                record_rows('enrich_row')
+
     finally:
         if driver:
-            driver.quit()
\ No newline at end of file
+            WebDriverManager.checkin(driver)
+        stats['seconds'] = time.monotonic() - started
+        if stats['seconds']:
+            stats['rows_per_minute'] = stats['rows'] * 60 / stats['seconds']
+
+    return stats
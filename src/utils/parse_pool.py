@@ -0,0 +1,152 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ..config.config import PARSE_POOL_CONFIG
+from .metrics import observe, record_error
+
+logger = logging.getLogger(__name__)
+
+def _timed_parse(parser, args):
+    """Run parser(*args) in a worker process and return (result, CPU seconds spent)"""
+    started = time.thread_time()
+    result = parser(*args)
+    return result, time.thread_time() - started
+
+def default_worker_count():
+    """One parser per spare core, capped by PARSE_POOL_CONFIG['max_auto_workers']"""
+    return max(0, min(PARSE_POOL_CONFIG['max_auto_workers'], (os.cpu_count() or 1) - 1))
+
+class ParsePool:
+    """Process pool that turns fetched HTML into plain row dicts.
+
+    Fetching threads call ``parse(parser, html, ...)`` with a module-level
+    parse function; the call blocks only that thread while a worker process
+    parses, so browser and HTTP threads keep driving I/O instead of
+    contending for the GIL. With no workers the parser runs inline. Queue
+    depth and parse/wait times are kept so fetchers and parsers can be sized
+    separately.
+    """
+
+    def __init__(self, workers=None, start_method=None):
+        self.workers = default_worker_count() if workers is None else workers
+        self.start_method = start_method or PARSE_POOL_CONFIG['start_method']
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'parsed': 0, 'inline': 0, 'errors': 0,
+            'pending': 0, 'pending_peak': 0,
+            'parse_seconds': 0.0, 'wait_seconds': 0.0,
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+                logger.info(f"Started {self.workers} HTML parser processes ({self.start_method})")
+            return self._executor
+
+    def parse(self, parser, *args):
+        """parser(*args) in a worker process, or inline when the pool has no workers"""
+        executor = self._get_executor()
+        if executor is None:
+            return self._parse_inline(parser, args)
+
+        started = time.monotonic()
+        with self._lock:
+            self._stats['pending'] += 1
+            self._stats['pending_peak'] = max(self._stats['pending_peak'], self._stats['pending'])
+        try:
+            result, parse_seconds = executor.submit(_timed_parse, parser, args).result()
+        except BrokenProcessPool:
+            logger.error("HTML parser pool broke, parsing inline from now on")
+            self.shutdown()
+            self.workers = 0
+            return self._parse_inline(parser, args)
+        except Exception:
+            with self._lock:
+                self._stats['errors'] += 1
+            record_error('html_parse', parser=parser.__name__)
+            raise
+        finally:
+            with self._lock:
+                self._stats['pending'] -= 1
+
+        wait_seconds = max(0.0, time.monotonic() - started - parse_seconds)
+        with self._lock:
+            self._stats['parsed'] += 1
+            self._stats['parse_seconds'] += parse_seconds
+            self._stats['wait_seconds'] += wait_seconds
+        observe('html_parse', parse_seconds, parser=parser.__name__)
+        observe('html_parse_wait', wait_seconds, parser=parser.__name__)
+        return result
+
+    def _parse_inline(self, parser, args):
+        started = time.thread_time()
+        try:
+            result = parser(*args)
+        except Exception:
+            with self._lock:
+                self._stats['errors'] += 1
+            record_error('html_parse', parser=parser.__name__)
+            raise
+        parse_seconds = time.thread_time() - started
+        with self._lock:
+            self._stats['inline'] += 1
+            self._stats['parse_seconds'] += parse_seconds
+        observe('html_parse', parse_seconds, parser=parser.__name__)
+        return result
+
+    def stats(self):
+        """Counts, current and peak queue depth, and mean parse and queue-wait times"""
+        with self._lock:
+            stats = dict(self._stats)
+        parsed = stats['parsed'] + stats['inline']
+        stats['workers'] = self.workers
+        stats['mean_parse_ms'] = 1000 * stats['parse_seconds'] / parsed if parsed else 0.0
+        stats['mean_wait_ms'] = 1000 * stats['wait_seconds'] / stats['parsed'] if stats['parsed'] else 0.0
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_parse_pool():
+    """Return the shared parse pool sized by PARSE_POOL_CONFIG['workers']"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool(PARSE_POOL_CONFIG['workers'])
+        return _pool
+
+def parse_html(parser, *args):
+    """Run a module-level HTML parse function through the shared parse pool"""
+    return get_parse_pool().parse(parser, *args)
+
+def log_parse_stats():
+    if _pool is not None:
+        stats = _pool.stats()
+        logger.info(
+            f"HTML parsing: {stats['parsed']} pages in {stats['workers']} processes, "
+            f"{stats['inline']} inline, {stats['errors']} errors; "
+            f"{stats['mean_parse_ms']:.1f} ms parse, {stats['mean_wait_ms']:.1f} ms queue wait per page; "
+            f"queue depth {stats['pending']} (peak {stats['pending_peak']})"
+        )
+
+def shutdown_parse_pool():
+    if _pool is not None:
+        _pool.shutdown()
+
+atexit.register(shutdown_parse_pool)
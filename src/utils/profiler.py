@@ -0,0 +1,354 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from ..config.config import PROFILING_CONFIG, PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+OTHER_STAGE = 'other'
+MIB = 1024 * 1024
+KIB = 1024
+# From 3.12 cProfile hooks sys.monitoring: one profiler at a time sees every thread
+SHARED_PROFILER = sys.version_info >= (3, 12)
+
+class _StatsSnapshot:
+    """Stats of a profiler still running in another thread, in the form pstats.Stats loads"""
+
+    def __init__(self, profile):
+        profile.snapshot_stats()
+        self.stats = profile.stats
+
+    def create_stats(self):
+        pass
+
+def _thread_group(name):
+    """'enrich_3' and 'pipeline-enrich-3' group with their sibling workers"""
+    return re.sub(r'[-_]?\d+$', '', name) or name
+
+def _location(frame):
+    """Innermost project frame of a stack as 'path:line function', else the leaf frame"""
+    leaf = frame
+    root = str(PROJECT_ROOT)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(root) and 'site-packages' not in filename and filename != __file__:
+            return f"{os.path.relpath(filename, root)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return f"{leaf.f_code.co_filename}:{leaf.f_lineno} {leaf.f_code.co_name}"
+
+class PipelineProfiler:
+    """CPU, allocation and wall-clock profile of one pipeline run, split by stage.
+
+    The calling thread gets a new cProfile profiler for each ``stage()``;
+    work outside any stage is reported as 'other'. Before Python 3.12 every
+    thread started meanwhile (enrichment workers, CSV sinks, the streaming
+    pipeline's stages) also gets its own profiler, and its work is
+    attributed to the stage active when it started, or to the stage its
+    name maps to in PROFILING_CONFIG['thread_stages']. From 3.12 only one
+    profiler can be active per process and it sees every thread, so all
+    threads' calls go to the calling thread's current stage; wall-clock
+    samples still follow the per-thread stages. Wall time, net allocation
+    growth and peak memory (tracemalloc) are charged to the innermost active
+    stage, and a sampler thread records where every thread is in wall-clock
+    time. Threads that override ``Thread.run`` and parser processes are not
+    profiled.
+    """
+
+    def __init__(self, directory=None, top_n=None, sample_interval=None, track_memory=None):
+        self.directory = Path(directory or PROFILING_CONFIG['directory'])
+        self.top_n = top_n or PROFILING_CONFIG['top_n']
+        self.sample_interval = sample_interval or PROFILING_CONFIG['sample_interval']
+        self.track_memory = PROFILING_CONFIG['tracemalloc'] if track_memory is None else track_memory
+        self.thread_stages = PROFILING_CONFIG['thread_stages']
+
+        self._lock = threading.Lock()
+        self._owner = None
+        self._stack = []
+        self._profiles = defaultdict(list)
+        self._live = {}
+        self._thread_groups = defaultdict(set)
+        self._samples = defaultdict(Counter)
+        self._stages = {}
+        self._mark_time = None
+        self._mark_sizes = {}
+        self._mark_bytes = 0
+        self._own_tracemalloc = False
+        self._checkpointing = False
+        self._original_run = None
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+        self._cpu_profiling = True
+        self.report_dir = None
+
+    @property
+    def current_stage(self):
+        return self._stack[-1][0] if self._stack else OTHER_STAGE
+
+    def _stage_record(self, stage):
+        return self._stages.setdefault(stage, {
+            'wall_seconds': 0.0, 'runs': 0, 'net_bytes': 0, 'peak_bytes': 0, 'allocations': Counter(),
+        })
+
+    def start(self):
+        self._owner = threading.get_ident()
+        self._own_tracemalloc = self.track_memory and not tracemalloc.is_tracing()
+        if self._own_tracemalloc:
+            tracemalloc.start()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+        self._sampler.start()
+        self._original_run = threading.Thread.run
+        profiler = self
+
+        def run(thread):
+            return profiler._run_thread(thread)
+
+        threading.Thread.run = run
+        if self.track_memory:
+            self._mark_sizes = self._allocation_sizes()
+            tracemalloc.reset_peak()
+            self._mark_bytes = tracemalloc.get_traced_memory()[0]
+        self._mark_time = time.perf_counter()
+        self._enter(OTHER_STAGE)
+        logger.info(f"Profiling enabled (sampling every {self.sample_interval * 1000:.0f} ms)")
+        return self
+
+    def stop(self):
+        """Stop profiling and write the report; returns the report directory"""
+        while self._stack:
+            self._exit()
+        threading.Thread.run = self._original_run
+        self._stop_sampling.set()
+        self._sampler.join()
+        with self._lock:
+            for stage, profile in self._live.values():
+                if profile is not None:
+                    self._profiles[stage].append(_StatsSnapshot(profile))
+            self._live.clear()
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+        return self.write_report()
+
+    @contextmanager
+    def stage(self, name):
+        """Attribute the calling thread's work, and threads started meanwhile, to name"""
+        if threading.get_ident() != self._owner:
+            yield
+            return
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def _allocation_sizes(self):
+        """Traced bytes per allocating line, leaving out tracemalloc and this module"""
+        sizes = {}
+        for stat in tracemalloc.take_snapshot().statistics('lineno'):
+            frame = stat.traceback[0]
+            if frame.filename not in (tracemalloc.__file__, __file__):
+                sizes[f"{frame.filename}:{frame.lineno}"] = stat.size
+        return sizes
+
+    def _checkpoint(self, allocation_sites=False):
+        """Charge wall time and memory since the last stage switch to the current stage.
+
+        Allocation sites need a full snapshot, which is slow with many live
+        objects, so they are only diffed when a stage exits (growth between
+        stages counts towards the next one) and the snapshot's own time is
+        left out of every stage and of the wall-clock samples.
+        """
+        self._checkpointing = True
+        record = self._stage_record(self.current_stage)
+        record['wall_seconds'] += time.perf_counter() - self._mark_time
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record['net_bytes'] += current - self._mark_bytes
+            record['peak_bytes'] = max(record['peak_bytes'], peak)
+            if allocation_sites:
+                sizes = self._allocation_sizes()
+                for location in sizes.keys() | self._mark_sizes.keys():
+                    growth = sizes.get(location, 0) - self._mark_sizes.get(location, 0)
+                    if growth:
+                        record['allocations'][location] += growth
+                self._mark_sizes = sizes
+            tracemalloc.reset_peak()
+            self._mark_bytes = tracemalloc.get_traced_memory()[0]
+        self._mark_time = time.perf_counter()
+        self._checkpointing = False
+
+    def _enter(self, name):
+        if self._stack:
+            self._stack[-1][1].disable()
+        self._checkpoint()
+        profile = cProfile.Profile()
+        self._stack.append((name, profile))
+        self._stage_record(name)['runs'] += 1
+        self._enable(profile)
+
+    def _exit(self):
+        profile = self._stack[-1][1]
+        profile.disable()
+        self._checkpoint(allocation_sites=True)
+        name, _ = self._stack.pop()
+        with self._lock:
+            self._profiles[name].append(profile)
+            self._thread_groups[name].add(_thread_group(threading.current_thread().name))
+        if self._stack:
+            self._enable(self._stack[-1][1])
+
+    def _enable(self, profile):
+        """Enable a profiler, or give up on CPU profiles if another profiling tool is active"""
+        if not self._cpu_profiling:
+            return False
+        try:
+            profile.enable()
+            return True
+        except ValueError as e:
+            self._cpu_profiling = False
+            logger.warning(f"CPU profiling disabled: {e}")
+            return False
+
+    def _stage_for_thread(self, thread_name):
+        for prefix, stage in self.thread_stages.items():
+            if thread_name.startswith(prefix):
+                return stage
+        return self.current_stage
+
+    def _run_thread(self, thread):
+        stage = self._stage_for_thread(thread.name)
+        ident = threading.get_ident()
+        profile = None if SHARED_PROFILER else cProfile.Profile()
+        if profile is not None and not self._enable(profile):
+            profile = None
+        with self._lock:
+            self._live[ident] = (stage, profile)
+            self._thread_groups[stage].add(_thread_group(thread.name))
+        try:
+            return self._original_run(thread)
+        finally:
+            if profile is not None:
+                profile.disable()
+            with self._lock:
+                if self._live.pop(ident, None) is not None and profile is not None:
+                    self._profiles[stage].append(profile)
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while not self._stop_sampling.wait(self.sample_interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            with self._lock:
+                thread_stages = {ident: stage for ident, (stage, _) in self._live.items()}
+            main_stage = self.current_stage
+            checkpointing = self._checkpointing
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (checkpointing and ident == self._owner):
+                    continue
+                stage = thread_stages.get(ident, main_stage)
+                group = _thread_group(names.get(ident, str(ident)))
+                self._samples[stage][(group, _location(frame))] += 1
+
+    def _stage_stats(self, stage):
+        stats = None
+        for profile in self._profiles.get(stage, []):
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            except TypeError:
+                continue  # a profiler that recorded no calls
+        return stats
+
+    def write_report(self):
+        self.report_dir = self.directory / f"profile_{datetime.now():%Y%m%d-%H%M%S}"
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        stages = list(dict.fromkeys([*self._stages, *self._profiles, *self._samples]))
+
+        overview, sections = [], []
+        for stage in stages:
+            record = self._stage_record(stage)
+            samples = self._samples.get(stage, Counter())
+            stats = self._stage_stats(stage)
+            if stats is not None:
+                stats.dump_stats(self.report_dir / f"{stage}.prof")
+            profiled_seconds = stats.total_tt if stats is not None else 0.0
+            overview.append(
+                f"{stage:<12} {record['wall_seconds']:>10.2f} {profiled_seconds:>10.2f} "
+                f"{sum(samples.values()) * self.sample_interval:>12.2f} "
+                f"{record['net_bytes'] / MIB:>+10.1f} {record['peak_bytes'] / MIB:>10.1f}  "
+                f"{', '.join(sorted(self._thread_groups.get(stage, ())))}"
+            )
+            sections.append(self._stage_section(stage, stats, samples, record))
+
+        header = (
+            f"Pipeline profile written {datetime.now():%Y-%m-%d %H:%M:%S}\n"
+            f"wall s: time the main thread spent in the stage (nested stages excluded); "
+            f"profiled s: time inside profiled calls summed over the stage's threads, waits included; "
+            f"sampled s: thread time seen by the {self.sample_interval * 1000:.0f} ms wall-clock sampler.\n\n"
+            f"{'stage':<12} {'wall s':>10} {'profiled s':>10} {'sampled s':>12} {'net MiB':>10} {'peak MiB':>10}  threads\n"
+        )
+        summary_path = self.report_dir / 'summary.txt'
+        summary_path.write_text(header + '\n'.join(overview) + '\n\n' + '\n'.join(sections), encoding='utf-8')
+        logger.info(f"Profile written to {self.report_dir}")
+        return self.report_dir
+
+    def _stage_section(self, stage, stats, samples, record):
+        lines = [f"=== {stage} ===", ""]
+        if stats is not None:
+            for sort_key, title in (('tottime', 'own time'), ('cumulative', 'cumulative time')):
+                buffer = io.StringIO()
+                stats.stream = buffer
+                stats.sort_stats(sort_key).print_stats(self.top_n)
+                lines += [f"Top {self.top_n} functions by {title} (all threads, {stage}.prof):",
+                          buffer.getvalue().split('\n\n', 1)[-1].rstrip(), ""]
+
+        total = sum(samples.values())
+        if total:
+            lines.append(f"Top {self.top_n} wall-clock sample locations ({total} samples):")
+            for (group, location), count in samples.most_common(self.top_n):
+                lines.append(f"  {100 * count / total:5.1f}%  {count * self.sample_interval:8.2f}s  "
+                             f"{group:<20} {location}")
+            lines.append("")
+
+        if record['allocations']:
+            lines.append(f"Top {self.top_n} allocation sites by net growth:")
+            for location, size in record['allocations'].most_common(self.top_n):
+                lines.append(f"  {size / KIB:+12.1f} KiB  {location}")
+            lines.append("")
+        return '\n'.join(lines)
+
+_profiler = None
+
+@contextmanager
+def profiling(enabled=True, **kwargs):
+    """Profile the block when enabled; the report is written when it exits"""
+    global _profiler
+    if not enabled:
+        yield None
+        return
+    _profiler = PipelineProfiler(**kwargs).start()
+    try:
+        yield _profiler
+    finally:
+        profiler, _profiler = _profiler, None
+        profiler.stop()
+
+@contextmanager
+def profile_stage(name):
+    """Label a pipeline stage for the active profiler; does nothing when not profiling"""
+    if _profiler is None:
+        yield
+        return
+    with _profiler.stage(name):
+        yield
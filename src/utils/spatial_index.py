@@ -0,0 +1,201 @@
+import json
+import logging
+import math
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from ..config.config import ENHANCED_RESTAURANTS_CSV, SPATIAL_INDEX_CONFIG
+from ..database.db_operations import EARTH_RADIUS_KM, longitude_ranges, radius_box
+
+logger = logging.getLogger(__name__)
+
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+ARRAY_NAMES = ('lat', 'lon', 'rating', 'category', 'name', 'address', 'cell_keys', 'cell_offsets')
+SOURCE_COLUMNS = {
+    'Restaurant Name': 'name',
+    'Cleaned Address': 'address',
+    'Restaurant Category': 'category',
+    'Star Rating': 'rating',
+    'Latitude': 'lat',
+    'Longitude': 'lon',
+}
+
+def haversine_km(lat, lon, lats, lons):
+    """Great-circle distance in km from (lat, lon) to each of lats/lons"""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+class GridSpatialIndex:
+    """Uniform-grid index over restaurant coordinates held in flat numpy arrays.
+
+    Points are sorted by grid cell, so every cell, and every run of
+    neighbouring cells in a grid row, is one contiguous slice found with
+    a binary search. ``save`` writes one .npy file per array and ``load``
+    memory-maps them, so a saved index opens instantly and is shared
+    between processes through the page cache. Boxes crossing the
+    antimeridian are split in two, as in the SQL geo queries.
+    """
+
+    def __init__(self, arrays, categories, cell_size):
+        self.lat = arrays['lat']
+        self.lon = arrays['lon']
+        self.rating = arrays['rating']
+        self.category = arrays['category']
+        self.name = arrays['name']
+        self.address = arrays['address']
+        self.cell_keys = arrays['cell_keys']
+        self.cell_offsets = arrays['cell_offsets']
+        self.categories = list(categories)
+        self.cell_size = cell_size
+        self.n_rows = int(math.ceil(180 / cell_size))
+        self.n_cols = int(math.ceil(360 / cell_size))
+        self._category_codes = {category: code for code, category in enumerate(self.categories)}
+
+    def __len__(self):
+        return len(self.lat)
+
+    @classmethod
+    def build(cls, df, cell_size=None):
+        """Build from a frame with lat/lon/rating/category/name/address columns"""
+        cell_size = cell_size or SPATIAL_INDEX_CONFIG['cell_size_deg']
+        lat = pd.to_numeric(df['lat'], errors='coerce').to_numpy(dtype=np.float64)
+        lon = pd.to_numeric(df['lon'], errors='coerce').to_numpy(dtype=np.float64)
+        valid = np.isfinite(lat) & np.isfinite(lon) & (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+        df = df[valid]
+        lat, lon = lat[valid], lon[valid]
+
+        rating = pd.to_numeric(df['rating'], errors='coerce').to_numpy(dtype=np.float64)
+        category_codes, categories = pd.factorize(df['category'].replace('Not available', None))
+        name = df['name'].fillna('').astype(str).to_numpy(dtype=np.str_)
+        address = df['address'].fillna('').astype(str).to_numpy(dtype=np.str_)
+
+        index = cls({'lat': lat, 'lon': lon, 'cell_keys': None, 'cell_offsets': None,
+                     'rating': rating, 'category': category_codes.astype(np.int32),
+                     'name': name, 'address': address}, categories, cell_size)
+        keys = index._cell_key(index._cell_row(lat), index._cell_col(lon))
+        order = np.argsort(keys, kind='stable')
+        for attr in ('lat', 'lon', 'rating', 'category', 'name', 'address'):
+            setattr(index, attr, getattr(index, attr)[order])
+        index.cell_keys, starts = np.unique(keys[order], return_index=True)
+        index.cell_offsets = np.append(starts, len(keys)).astype(np.int64)
+        logger.info(f"Built spatial index over {len(index)} restaurants in {len(index.cell_keys)} cells")
+        return index
+
+    @classmethod
+    def from_csv(cls, csv_path=ENHANCED_RESTAURANTS_CSV, cell_size=None):
+        df = pd.read_csv(csv_path, usecols=list(SOURCE_COLUMNS), dtype=str)
+        return cls.build(df.rename(columns=SOURCE_COLUMNS), cell_size)
+
+    @classmethod
+    def from_database(cls, db, cell_size=None):
+        """Build from the restaurants table, streamed through a server-side cursor"""
+        columns = ['restaurant_name', 'cleaned_address', 'restaurant_category',
+                   'star_rating', 'latitude', 'longitude']
+        rows = db.stream_query(
+            f"SELECT {', '.join(columns)} FROM restaurants "
+            "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+        )
+        df = pd.DataFrame(rows, columns=list(SOURCE_COLUMNS.values()))
+        return cls.build(df, cell_size)
+
+    def save(self, directory=None):
+        directory = Path(directory or SPATIAL_INDEX_CONFIG['path'])
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        with open(directory / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump({'cell_size': self.cell_size, 'categories': self.categories, 'count': len(self)}, f)
+        logger.info(f"Saved spatial index ({len(self)} restaurants) to {directory}")
+
+    @classmethod
+    def load(cls, directory=None, mmap=True):
+        directory = Path(directory or SPATIAL_INDEX_CONFIG['path'])
+        with open(directory / 'meta.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        # np.asarray keeps the mapping but drops the np.memmap subclass, whose
+        # __getitem__ overhead dominates small queries
+        arrays = {name: np.asarray(np.load(directory / f"{name}.npy", mmap_mode='r' if mmap else None))
+                  for name in ARRAY_NAMES}
+        return cls(arrays, meta['categories'], meta['cell_size'])
+
+    def record(self, i):
+        category = int(self.category[i])
+        rating = float(self.rating[i])
+        return {
+            'Restaurant Name': str(self.name[i]),
+            'Cleaned Address': str(self.address[i]),
+            'Restaurant Category': self.categories[category] if category >= 0 else None,
+            'Star Rating': None if math.isnan(rating) else rating,
+            'Latitude': float(self.lat[i]),
+            'Longitude': float(self.lon[i]),
+        }
+
+    def within_bbox(self, min_lat, min_lon, max_lat, max_lon, min_rating=None, category=None):
+        """Indices of restaurants inside the box; min_lon > max_lon crosses the antimeridian"""
+        matches = []
+        for west, east in longitude_ranges(min_lon, max_lon):
+            candidates = self._candidates(min_lat, west, max_lat, east)
+            lat, lon = self.lat[candidates], self.lon[candidates]
+            mask = (lat >= min_lat) & (lat <= max_lat) & (lon >= west) & (lon <= east)
+            mask &= self._filter_mask(candidates, min_rating, category)
+            matches.append(candidates[mask])
+        return matches[0] if len(matches) == 1 else np.concatenate(matches)
+
+    def within_radius(self, lat, lon, radius_km, min_rating=None, category=None):
+        """(indices, distances_km) of restaurants within radius_km, nearest first"""
+        candidates = self.within_bbox(*radius_box(lat, lon, radius_km), min_rating, category)
+
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+    def nearest(self, lat, lon, k=10, min_rating=None, category=None):
+        """(indices, distances_km) of the k nearest matching restaurants"""
+        radius = math.radians(self.cell_size) * EARTH_RADIUS_KM
+        while True:
+            indices, distances = self.within_radius(lat, lon, radius, min_rating, category)
+            if len(indices) >= k or radius >= MAX_DISTANCE_KM:
+                return indices[:k], distances[:k]
+            radius *= 2
+
+    def _cell_row(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_size), 0, self.n_rows - 1).astype(np.int64)
+
+    def _cell_col(self, lon):
+        return np.clip(np.floor((np.asarray(lon) + 180) / self.cell_size), 0, self.n_cols - 1).astype(np.int64)
+
+    def _scalar_cell(self, offset_degrees, limit):
+        return min(max(int(math.floor(offset_degrees / self.cell_size)), 0), limit - 1)
+
+    def _cell_key(self, row, col):
+        return row * self.n_cols + col
+
+    def _candidates(self, min_lat, min_lon, max_lat, max_lon):
+        """Indices of all points in the grid cells overlapping the box"""
+        row0, row1 = self._scalar_cell(min_lat + 90, self.n_rows), self._scalar_cell(max_lat + 90, self.n_rows)
+        col0, col1 = self._scalar_cell(min_lon + 180, self.n_cols), self._scalar_cell(max_lon + 180, self.n_cols)
+        rows = np.arange(row0, row1 + 1, dtype=np.int64)
+        first = np.searchsorted(self.cell_keys, self._cell_key(rows, col0), side='left')
+        last = np.searchsorted(self.cell_keys, self._cell_key(rows, col1), side='right')
+        starts, ends = self.cell_offsets[first], self.cell_offsets[last]
+        spans = [(start, end) for start, end in zip(starts, ends) if end > start]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        if len(spans) == 1:
+            return np.arange(spans[0][0], spans[0][1], dtype=np.int64)
+        return np.concatenate([np.arange(start, end, dtype=np.int64) for start, end in spans])
+
+    def _filter_mask(self, candidates, min_rating, category):
+        mask = np.ones(len(candidates), dtype=bool)
+        if min_rating is not None:
+            mask &= self.rating[candidates] >= min_rating
+        if category is not None:
+            wanted = [category] if isinstance(category, str) else category
+            codes = [self._category_codes[c] for c in wanted if c in self._category_codes]
+            mask &= np.isin(self.category[candidates], codes)
+        return mask
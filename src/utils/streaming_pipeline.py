@@ -0,0 +1,302 @@
+import logging
+import queue
+import threading
+import time
+from functools import partial
+import pandas as pd
+from src.config.config import (
+    CLEANED_RESTAURANTS_CSV, CSV_FIELDNAMES, ENHANCED_RESTAURANTS_CSV,
+    PARALLEL_PROCESSING_CONFIG, STREAMING_PIPELINE_CONFIG, WEBDRIVER_CONFIG
+)
+from src.data_processing.fuzzy_dedup import IncrementalDeduplicator
+from src.database.db_operations import RestaurantDB
+from src.scrapers.EAS import scrape_eater_archives
+from src.scrapers.FetchGoogleData import fetch_google_maps_data_cached
+from src.utils.checkpoint_journal import CheckpointJournal
+from src.utils.csv_handler import get_csv_sink, close_csv_sinks
+from src.utils.google_cache import log_cache_stats
+from src.utils.parse_pool import get_parse_pool, log_parse_stats
+from src.utils.metrics import observe, record_rows, record_error, record_retry
+from src.utils.helpers import found_any
+from src.utils.parallel_processor import google_maps_url_for
+from src.utils.webdriver_manager import WebDriverManager
+
+logger = logging.getLogger(__name__)
+
+class PipelineStopped(Exception):
+    """Raised inside a stage when another stage has failed"""
+
+def _db_row(row):
+    """Row as the database expects it: lists and dicts stored as their CSV text"""
+    return {key: str(value) if isinstance(value, (list, dict)) else value for key, value in row.items()}
+
+class StreamingPipeline:
+    """Scrape, clean, dedup, enrich and load restaurants concurrently.
+
+    The source thread scrapes the archive (scrape_eater_archives cleans each
+    address as it is written) and passes every new cleaned row through an
+    IncrementalDeduplicator into a bounded enrichment queue. Enrichment
+    workers, each owning one pooled browser, feed a bounded database queue
+    drained by a single writer that upserts in small batches. A full queue
+    blocks the stage feeding it, so a slow Google or Postgres throttles
+    scraping instead of growing memory. Rows left unenriched by earlier
+    runs are fed in first, and rows whose scrape found something are
+    journaled as in the batch pipeline.
+    """
+
+    _DONE = object()
+
+    def __init__(self, source=None, num_workers=None, enrich_queue_size=None, db_queue_size=None,
+                 db_batch_rows=None, db_flush_interval=None, resume=True):
+        settings = STREAMING_PIPELINE_CONFIG
+        self.source = source or scrape_eater_archives
+        self.num_workers = max(1, num_workers or settings['enrich_workers'] or min(
+            PARALLEL_PROCESSING_CONFIG['num_workers'], WEBDRIVER_CONFIG['pool_size'] - 1))
+        self.db_batch_rows = db_batch_rows or settings['db_batch_rows']
+        self.db_flush_interval = db_flush_interval or settings['db_flush_interval']
+        self.status_interval = settings['status_interval']
+        self.resume = resume
+
+        self.enrich_queue = queue.Queue(maxsize=enrich_queue_size or settings['enrich_queue_size'])
+        self.db_queue = queue.Queue(maxsize=db_queue_size or settings['db_queue_size'])
+        self.deduplicator = IncrementalDeduplicator()
+        self.journal = None
+
+        self._stop = threading.Event()
+        self._source_done = threading.Event()
+        self._lock = threading.Lock()
+        self._live_workers = 0
+        self._errors = []
+        self._started = None
+        self.stats = {
+            'rows_in': 0, 'duplicates': 0, 'already_enriched': 0, 'enriched': 0,
+            'enrich_errors': 0, 'db_rows': 0, 'db_batches': 0,
+            'enrich_queue_peak': 0, 'db_queue_peak': 0,
+            'first_db_row_seconds': None, 'seconds': 0.0,
+        }
+
+    def run(self):
+        """Run every stage to completion and return the stats; re-raises a stage failure"""
+        self._started = time.monotonic()
+        self.journal = CheckpointJournal(seed_csv=ENHANCED_RESTAURANTS_CSV)
+        self._live_workers = self.num_workers
+        threads = [threading.Thread(target=self._guard, args=(self._source_stage,), name="pipeline-source")]
+        threads += [threading.Thread(target=self._guard, args=(self._enrich_stage, worker_id),
+                                     kwargs={'fatal': False}, name=f"pipeline-enrich-{worker_id}")
+                    for worker_id in range(self.num_workers)]
+        threads.append(threading.Thread(target=self._guard, args=(self._db_stage,), name="pipeline-db"))
+        logger.info(f"Starting streaming pipeline with {self.num_workers} enrichment workers")
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            # If this thread was interrupted (Ctrl-C, the run timeout) the stages
+            # are still running and must stop before their sink and journal close
+            self._stop.set()
+            for thread in threads:
+                if thread.ident is not None:
+                    thread.join()
+            close_csv_sinks(ENHANCED_RESTAURANTS_CSV)
+            self.journal.close()
+            self.stats['seconds'] = time.monotonic() - self._started
+
+        self._log_status("finished")
+        log_cache_stats()
+        log_parse_stats()
+        if self._errors:
+            raise self._errors[0]
+        return self.stats
+
+    def _guard(self, stage, *args, fatal=True):
+        """Run a stage; a fatal stage's failure stops the whole pipeline"""
+        try:
+            stage(*args)
+        except PipelineStopped:
+            pass
+        except Exception as e:
+            logger.error(f"Pipeline stage {threading.current_thread().name} failed: {e}")
+            with self._lock:
+                self._errors.append(e)
+            if fatal:
+                self._stop.set()
+
+    def _put(self, target, item, peak):
+        """Blocking put that gives up if the pipeline is stopping"""
+        while True:
+            if self._stop.is_set():
+                raise PipelineStopped()
+            try:
+                target.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+        size = target.qsize()
+        if size > self.stats[peak]:
+            self.stats[peak] = size
+
+    def _emit(self, row):
+        """Dedup a cleaned row and hand it to the enrichment workers"""
+        with self._lock:
+            self.stats['rows_in'] += 1
+        if self.journal.is_done(row.get('Restaurant Name'), row.get('Cleaned Address')):
+            with self._lock:
+                self.stats['already_enriched'] += 1
+            self.deduplicator.add(row)
+            return
+        if not self.deduplicator.add(row):
+            with self._lock:
+                self.stats['duplicates'] += 1
+            return
+        self._put(self.enrich_queue, row, 'enrich_queue_peak')
+
+    def _source_stage(self):
+        try:
+            if self.resume:
+                self._emit_backlog()
+            self.source(on_entry=self._emit)
+            if self._stop.is_set():
+                raise PipelineStopped()
+        finally:
+            self._source_done.set()
+            for _ in range(self.num_workers):
+                try:
+                    self._put(self.enrich_queue, self._DONE, 'enrich_queue_peak')
+                except PipelineStopped:
+                    break
+
+    def _emit_backlog(self):
+        """Feed rows cleaned by earlier runs that were never enriched"""
+        if not CLEANED_RESTAURANTS_CSV.exists():
+            return
+        for chunk in pd.read_csv(CLEANED_RESTAURANTS_CSV, dtype=str, keep_default_na=False, chunksize=10000):
+            for row in chunk.to_dict('records'):
+                self._emit(row)
+        logger.info(f"Pipeline: queued backlog from {CLEANED_RESTAURANTS_CSV}")
+
+    def _next(self, source, timeout=0.5):
+        while True:
+            if self._stop.is_set():
+                raise PipelineStopped()
+            try:
+                return source.get(timeout=timeout)
+            except queue.Empty:
+                continue
+
+    def _enrich_stage(self, worker_id):
+        sink = get_csv_sink(ENHANCED_RESTAURANTS_CSV, CSV_FIELDNAMES)
+        driver = None
+        try:
+            driver = WebDriverManager.checkout()
+            while True:
+                row = self._next(self.enrich_queue)
+                if row is self._DONE:
+                    break
+                row_started = time.perf_counter()
+                try:
+                    google_data = fetch_google_maps_data_cached(google_maps_url_for(row), driver)
+                    enriched = {**row, **google_data}
+                    found = found_any(google_data.values())
+                    on_flushed = None
+                    if found:
+                        on_flushed = partial(self.journal.mark_done, row['Restaurant Name'], row['Cleaned Address'])
+                    sink.write(enriched, on_flushed=on_flushed)
+                    with self._lock:
+                        self.stats['enriched'] += 1
+                    record_rows('enrich_row')
+
+                    if not found and not WebDriverManager.is_alive(driver):
+                        logger.warning(f"Pipeline worker {worker_id}: replacing unresponsive WebDriver")
+                        record_retry('enrich_row')
+                        WebDriverManager.checkin(driver, healthy=False)
+                        driver = None
+                        driver = WebDriverManager.checkout()
+                except Exception as e:
+                    logger.error(f"Pipeline worker {worker_id}: error enriching {row.get('Restaurant Name')}: {e}")
+                    with self._lock:
+                        self.stats['enrich_errors'] += 1
+                    record_error('enrich_row')
+                    if driver is None:
+                        raise
+                    enriched = row
+                    sink.write(row)
+                finally:
+                    observe('enrich_row', time.perf_counter() - row_started)
+                self._put(self.db_queue, _db_row(enriched), 'db_queue_peak')
+        finally:
+            if driver:
+                WebDriverManager.checkin(driver)
+            with self._lock:
+                self._live_workers -= 1
+                last = self._live_workers == 0
+            if last and not self._source_done.is_set():
+                # Nobody is left to drain the enrichment queue
+                logger.error("Pipeline: all enrichment workers have stopped, aborting")
+                self._stop.set()
+            if last:
+                try:
+                    self._put(self.db_queue, self._DONE, 'db_queue_peak')
+                except PipelineStopped:
+                    pass
+
+    def _db_stage(self):
+        db = RestaurantDB()
+        db.connect()
+        db.create_tables()
+        batch = []
+        flush_at = time.monotonic() + self.db_flush_interval
+        next_status = time.monotonic() + self.status_interval
+        try:
+            while True:
+                try:
+                    row = self.db_queue.get(timeout=max(0.05, min(flush_at - time.monotonic(), 0.5)))
+                except queue.Empty:
+                    row = None
+                    if self._stop.is_set():
+                        break
+
+                if row is self._DONE:
+                    break
+                if row is not None and row.get('Restaurant Name') and row.get('Cleaned Address'):
+                    batch.append(row)
+                if len(batch) >= self.db_batch_rows or (batch and time.monotonic() >= flush_at):
+                    self._write_batch(db, batch)
+                    batch = []
+                if time.monotonic() >= flush_at:
+                    flush_at = time.monotonic() + self.db_flush_interval
+                if time.monotonic() >= next_status:
+                    self._log_status("running")
+                    next_status = time.monotonic() + self.status_interval
+        finally:
+            if batch:
+                self._write_batch(db, batch)
+            db.close()
+
+    def _write_batch(self, db, batch):
+        written = db.upsert_restaurant_rows(batch)
+        with self._lock:
+            if self.stats['first_db_row_seconds'] is None:
+                self.stats['first_db_row_seconds'] = time.monotonic() - self._started
+            self.stats['db_rows'] += written
+            self.stats['db_batches'] += 1
+
+    def _log_status(self, state):
+        stats = self.stats
+        elapsed = time.monotonic() - self._started
+        first = stats['first_db_row_seconds']
+        parsing = get_parse_pool().stats()
+        logger.info(
+            f"Pipeline {state} after {elapsed:.0f}s: {stats['rows_in']} rows in, "
+            f"{stats['duplicates']} duplicates, {stats['already_enriched']} already enriched, "
+            f"{stats['enriched']} enriched ({stats['enrich_errors']} errors), "
+            f"{stats['db_rows']} in database in {stats['db_batches']} batches; "
+            f"queues enrich={self.enrich_queue.qsize()}/{self.enrich_queue.maxsize} "
+            f"db={self.db_queue.qsize()}/{self.db_queue.maxsize} "
+            f"parse={parsing['pending']}/{parsing['workers']} (peak {parsing['pending_peak']}); "
+            f"first database write at {'n/a' if first is None else f'{first:.1f}s'}"
+        )
+
+def run_streaming_pipeline(**kwargs):
+    """Run the scrape-to-database pipeline with all stages overlapping"""
+    return StreamingPipeline(**kwargs).run()
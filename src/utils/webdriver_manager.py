@@ -1,53 +1,229 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
-from ..config.config import CHROME_OPTIONS
+from ..config.config import CHROME_OPTIONS, WEBDRIVER_CONFIG
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import logging
 import os
 from pathlib import Path
 import stat
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+class PooledChrome(webdriver.Chrome):
+    """Chrome driver that counts page loads so the pool can recycle it"""
+
+    page_loads = 0
+
+    def get(self, url):
+        self.page_loads += 1
+        return super().get(url)
+
 class WebDriverManager:
+    """Process-wide pool of warm Chrome drivers.
+
+    Use ``with WebDriverManager.driver() as driver:`` to borrow one. Drivers
+    are health-checked before being handed out and replaced after
+    ``max_page_loads`` page loads or a WebDriver failure. New drivers get
+    ``page_load_timeout``; callers needing a tighter bound set their own
+    before each ``get``.
+    """
+
     _driver_path = None
+    _path_lock = threading.Lock()
     _instances = []
+    _idle = []
+    _pool_size = 0
+    _pool_cond = threading.Condition()
     _active = True
 
+    @classmethod
+    def get_driver_path(cls):
+        """Resolve and chmod the chromedriver binary once per process"""
+        if cls._driver_path:
+            return cls._driver_path
+        with cls._path_lock:
+            if cls._driver_path:
+                return cls._driver_path
+
+            driver_path = WEBDRIVER_CONFIG['driver_path'] or ChromeDriverManager().install()
+
+            if 'chromedriver-linux64' in driver_path:
+                driver_path = str(Path(driver_path).parent / 'chromedriver')
+
+            os.chmod(driver_path, stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
+            cls._driver_path = driver_path
+            logger.info(f"Using chromedriver at {driver_path}")
+            return driver_path
+
     @classmethod
     def create_driver(cls):
         if not cls._active:
             raise RuntimeError("WebDriverManager is not active")
-            
+
         try:
             options = webdriver.ChromeOptions()
             for option in CHROME_OPTIONS:
                 options.add_argument(option)
-            
-            driver_path = ChromeDriverManager().install()
-            
-            if 'chromedriver-linux64' in driver_path:
-                driver_path = str(Path(driver_path).parent / 'chromedriver')
-            
-            os.chmod(driver_path, stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
-            
-            service = Service(driver_path)
-            driver = webdriver.Chrome(service=service, options=options)
-            cls._instances.append(driver)
+
+            service = Service(cls.get_driver_path())
+            driver = PooledChrome(service=service, options=options)
+            with cls._pool_cond:
+                cls._instances.append(driver)
+            driver.set_page_load_timeout(WEBDRIVER_CONFIG['page_load_timeout'])
             return driver
-            
+
         except Exception as e:
             logger.error(f"Failed to create WebDriver: {str(e)}")
             raise
 
+    @classmethod
+    def warm_up(cls, count=None):
+        """Start drivers in parallel until the pool holds count idle drivers"""
+        count = min(count or WEBDRIVER_CONFIG['pool_size'], WEBDRIVER_CONFIG['pool_size'])
+        with cls._pool_cond:
+            to_start = max(0, min(count - len(cls._idle), WEBDRIVER_CONFIG['pool_size'] - cls._pool_size))
+            cls._pool_size += to_start
+        if not to_start:
+            return 0
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=to_start) as executor:
+            results = list(executor.map(lambda _: cls._add_idle_driver(), range(to_start)))
+        started = sum(results)
+        logger.info(f"Warmed {started}/{to_start} WebDrivers in {time.monotonic() - start:.1f}s")
+        if not started:
+            raise RuntimeError("WebDriver setup failed: no driver could be started")
+        return started
+
+    @classmethod
+    @contextmanager
+    def driver(cls, timeout=None):
+        """Borrow a pooled driver for the duration of the with block"""
+        driver = cls.checkout(timeout)
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            cls.checkin(driver, healthy)
+
+    @classmethod
+    def checkout(cls, timeout=None):
+        """Take a live driver from the pool, starting one if below pool_size"""
+        timeout = WEBDRIVER_CONFIG['checkout_timeout'] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with cls._pool_cond:
+                if not cls._active:
+                    raise RuntimeError("WebDriverManager is not active")
+                driver = cls._idle.pop() if cls._idle else None
+                if driver is None:
+                    if cls._pool_size < WEBDRIVER_CONFIG['pool_size']:
+                        cls._pool_size += 1
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError("Timed out waiting for a pooled WebDriver")
+                        cls._pool_cond.wait(remaining)
+                        continue
+
+            if driver is not None:
+                if cls.is_alive(driver):
+                    return driver
+                logger.warning("Discarding unresponsive WebDriver from pool")
+                cls._discard(driver)
+                continue
+
+            try:
+                driver = cls.create_driver()
+                driver.pooled = True
+                return driver
+            except Exception:
+                with cls._pool_cond:
+                    cls._pool_size -= 1
+                    cls._pool_cond.notify()
+                raise
+
+    @classmethod
+    def checkin(cls, driver, healthy=True):
+        """Return a driver to the pool, recycling it if worn out or broken"""
+        if not healthy or not cls._active:
+            cls._discard(driver)
+            return
+        if getattr(driver, 'page_loads', 0) >= WEBDRIVER_CONFIG['max_page_loads']:
+            logger.info(f"Recycling WebDriver after {driver.page_loads} page loads")
+            cls._discard(driver)
+            cls._replace_async()
+            return
+        with cls._pool_cond:
+            cls._idle.append(driver)
+            cls._pool_cond.notify()
+
+    @staticmethod
+    def is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def _add_idle_driver(cls):
+        """Start a driver into the idle list; its pool slot must already be reserved"""
+        try:
+            driver = cls.create_driver()
+            driver.pooled = True
+        except Exception:
+            with cls._pool_cond:
+                cls._pool_size -= 1
+                cls._pool_cond.notify()
+            return False
+        with cls._pool_cond:
+            cls._idle.append(driver)
+            cls._pool_cond.notify()
+        return True
+
+    @classmethod
+    def _replace_async(cls):
+        with cls._pool_cond:
+            if not cls._active or cls._pool_size >= WEBDRIVER_CONFIG['pool_size']:
+                return
+            cls._pool_size += 1
+        threading.Thread(target=cls._add_idle_driver, name="webdriver-warmup", daemon=True).start()
+
+    @classmethod
+    def _discard(cls, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error while quitting driver: {e}")
+        with cls._pool_cond:
+            if driver in cls._instances:
+                cls._instances.remove(driver)
+                if getattr(driver, 'pooled', False) and cls._pool_size > 0:
+                    cls._pool_size -= 1
+            cls._pool_cond.notify()
+
     @classmethod
     def cleanup(cls):
-        cls._active = False
+        with cls._pool_cond:
+            cls._active = False
+            cls._idle.clear()
+            cls._pool_cond.notify_all()
+        cleaned = 0
         for driver in cls._instances[:]:  # Create a copy of the list to iterate
             try:
                 driver.quit()
                 cls._instances.remove(driver)
+                cleaned += 1
             except Exception as e:
                 logger.warning(f"Error while cleaning up driver: {e}")
-        logger.info(f"WebDriver cleanup completed. Cleaned up {len(cls._instances)} instances")
-
+        cls._pool_size = 0
+        logger.info(f"WebDriver cleanup completed. Cleaned up {cleaned} instances")
@@ -0,0 +1,77 @@
+import random
+
+import pandas as pd
+
+from src.data_processing.cleanAddrRestaurants import clean_and_split_address, clean_and_split_addresses
+
+EDGE_CASES = [
+    None,
+    float('nan'),
+    '',
+    '   ',
+    ',,, ,',
+    '123 Main St, Boston, MA 02118',
+    '123 Main St , Boston ,Massachusetts 02118',
+    '1600 Pennsylvania Ave NW, Washington, D.C. 20500',
+    '1600 Pennsylvania Ave NW, D.C. 20500',
+    '500 K St, Washington, DC 20001-1234',
+    '12 & 14 Elm Ave, Suite 200, Austin, Texas 78701',
+    '77 Ocean Dr Ste 4, Miami, FL',
+    '9 Mission St Floor 2, San Francisco, CA, 94103',
+    '1 Broadway #12, New York, New York 10004 10004',
+    '45 Peachtree Rd, Atlanta, GA 30303 USA',
+    '8 Colorado Blvd, Denver',
+    'Pike Place Market',
+    '3 West Virginia Ave, Charleston, west virginia 25301',
+    '10 Market Street, Portland, or 97205',
+    '21 Fl 3 Harbor Rd,, Seattle , , WA98101',
+]
+
+STREETS = ['Main St', 'Broadway', 'Market Street', 'Pennsylvania Ave', 'Washington Blvd']
+CITIES = ['Boston', 'Washington', 'New York', 'Charleston', 'Kansas City', '']
+STATES = ['Massachusetts', 'MA', 'New York', 'NY', 'D.C.', 'DC', 'West Virginia', 'tx', '']
+UNITS = ['', ' Suite 200', ' Ste 4', ' Floor 2', ' #12', ' fl 9']
+SEPARATORS = [', ', ',', ' , ', ',, ', ' ']
+
+
+def random_address(rng):
+    street = f"{rng.randint(1, 999)}{rng.choice(['', ' & ' + str(rng.randint(1, 99))])} {rng.choice(STREETS)}"
+    zip_code = rng.choice(['', '02118', '20500', '78701-1234', '10004 10004'])
+    tail = f"{rng.choice(STATES)}{rng.choice([' ', ''])}{zip_code}".strip()
+    parts = [street + rng.choice(UNITS), rng.choice(CITIES), tail]
+    return rng.choice(SEPARATORS).join(part for part in parts if rng.random() > 0.1)
+
+
+def scalar_frame(addresses):
+    rows = [clean_and_split_address('' if pd.isna(address) else address) for address in addresses]
+    return pd.DataFrame(rows).rename(columns={'Address': 'Cleaned Address'})
+
+
+def assert_matches_scalar(addresses, index=None):
+    series = pd.Series(addresses, dtype=object, index=index)
+    batch = clean_and_split_addresses(series)
+
+    expected = scalar_frame(addresses)
+    expected.index = series.index
+    assert list(batch.columns) == ['Cleaned Address', 'City', 'State', 'Zip']
+    pd.testing.assert_frame_equal(batch.astype(object), expected[list(batch.columns)].astype(object))
+
+
+def test_edge_cases_match_the_scalar_parser():
+    assert_matches_scalar(EDGE_CASES)
+
+
+def test_random_addresses_match_the_scalar_parser_row_for_row():
+    rng = random.Random(2024)
+    addresses = [random_address(rng) for _ in range(3000)]
+    addresses += rng.sample(addresses, 500)
+    assert_matches_scalar(addresses)
+
+
+def test_result_keeps_the_input_index():
+    addresses = ['123 Main St, Boston, MA 02118', None, '123 Main St, Boston, MA 02118']
+    assert_matches_scalar(addresses, index=[10, 'b', 7])
+
+
+def test_empty_input():
+    assert clean_and_split_addresses(pd.Series([], dtype=object)).empty
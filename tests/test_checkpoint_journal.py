@@ -0,0 +1,94 @@
+import pandas as pd
+
+from src.config.config import EXPECTED_GOOGLE_FIELDS
+from src.utils import parallel_processor
+from src.utils.checkpoint_journal import CheckpointJournal
+from src.utils.parallel_processor import process_with_parallel
+
+
+def enhanced_csv(path, rows):
+    pd.DataFrame(rows).reindex(columns=['Restaurant Name', 'Cleaned Address', *EXPECTED_GOOGLE_FIELDS]).to_csv(
+        path, index=False
+    )
+    return path
+
+
+def test_seed_imports_only_rows_with_google_data(tmp_path):
+    seed = enhanced_csv(tmp_path / 'enhanced.csv', [
+        {'Restaurant Name': 'Found', 'Cleaned Address': '1 Main St', 'Star Rating': '4.5'},
+        {'Restaurant Name': 'Placeholder', 'Cleaned Address': '2 Main St',
+         **{field: 'Not available' for field in EXPECTED_GOOGLE_FIELDS}},
+        {'Restaurant Name': 'Blank', 'Cleaned Address': '3 Main St', 'Star Rating': '  '},
+        {'Restaurant Name': 'Empty', 'Cleaned Address': '4 Main St'},
+    ])
+
+    journal = CheckpointJournal(tmp_path / 'journal.db', seed_csv=seed)
+
+    assert len(journal) == 1
+    assert journal.is_done('Found', '1 Main St')
+    assert not journal.is_done('Placeholder', '2 Main St')
+    assert not journal.is_done('Blank', '3 Main St')
+    journal.close()
+
+
+def test_seed_only_runs_on_an_empty_journal(tmp_path):
+    path = tmp_path / 'journal.db'
+    journal = CheckpointJournal(path)
+    journal.mark_done('Kept', '5 Main St')
+    journal.close()
+    seed = enhanced_csv(tmp_path / 'enhanced.csv', [
+        {'Restaurant Name': 'Found', 'Cleaned Address': '1 Main St', 'Star Rating': '4.5'},
+    ])
+
+    journal = CheckpointJournal(path, seed_csv=seed)
+
+    assert len(journal) == 1
+    assert not journal.is_done('Found', '1 Main St')
+    journal.close()
+
+
+def test_mark_done_survives_reopen_and_filters_pending(tmp_path):
+    path = tmp_path / 'journal.db'
+    journal = CheckpointJournal(path)
+    journal.mark_done('Done', '1 Main St')
+    journal.mark_done('Done', '1 Main St')
+    journal.mark_done(float('nan'), '2 Main St')
+    journal.close()
+
+    journal = CheckpointJournal(path)
+    df = pd.DataFrame({
+        'Restaurant Name': ['Done', 'Todo', None],
+        'Cleaned Address': ['1 Main St', '1 Main St', '2 Main St'],
+    })
+
+    assert len(journal) == 2
+    assert list(journal.pending(df)['Restaurant Name']) == ['Todo']
+    journal.close()
+
+
+def test_enrichment_journals_only_rows_that_found_data(tmp_path, monkeypatch):
+    scraped = {
+        'Found': {'Star Rating': '4.5', 'Restaurant Category': 'Not available'},
+        'Missed': {'Star Rating': 'Not available', 'Restaurant Category': 'Not available'},
+    }
+    monkeypatch.setattr(parallel_processor, 'fetch_google_maps_data_cached',
+                        lambda url, driver: scraped['Found' if 'Found' in url else 'Missed'])
+    monkeypatch.setattr(parallel_processor.WebDriverManager, 'checkout', classmethod(lambda cls, timeout=None: object()))
+    monkeypatch.setattr(parallel_processor.WebDriverManager, 'checkin',
+                        classmethod(lambda cls, driver, healthy=True: None))
+    monkeypatch.setattr(parallel_processor.WebDriverManager, 'is_alive', staticmethod(lambda driver: True))
+    df = pd.DataFrame({
+        'Restaurant Name': ['Found', 'Missed'],
+        'Cleaned Address': ['1 Main St', '2 Main St'],
+        'Google Maps Link': ['https://maps.example/Found', 'https://maps.example/Missed'],
+    })
+    output = tmp_path / 'enhanced.csv'
+    journal = CheckpointJournal(tmp_path / 'journal.db')
+
+    process_with_parallel(df, output, [*df.columns, 'Star Rating', 'Restaurant Category'],
+                          num_workers=1, journal=journal)
+
+    assert len(pd.read_csv(output)) == 2
+    assert journal.is_done('Found', '1 Main St')
+    assert not journal.is_done('Missed', '2 Main St')
+    journal.close()
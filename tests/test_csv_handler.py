@@ -0,0 +1,124 @@
+import csv
+import threading
+
+import pytest
+
+from src.utils.csv_handler import CSVSink
+
+FIELDNAMES = ['Restaurant Name', 'City']
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def make_sink(path, **kwargs):
+    kwargs.setdefault('batch_size', 1000)
+    kwargs.setdefault('flush_interval', 60)
+    return CSVSink(path, FIELDNAMES, fsync=False, **kwargs)
+
+
+def test_flush_writes_queued_rows_in_order(tmp_path):
+    path = tmp_path / 'out.csv'
+    sink = make_sink(path)
+    for i in range(50):
+        sink.write({'Restaurant Name': f'r{i}', 'City': 'Austin'})
+
+    sink.flush()
+
+    assert [row['Restaurant Name'] for row in read_rows(path)] == [f'r{i}' for i in range(50)]
+    sink.close()
+
+
+def test_on_flushed_runs_after_the_row_is_on_disk(tmp_path):
+    path = tmp_path / 'out.csv'
+    sink = make_sink(path)
+    seen = []
+
+    def on_flushed(name):
+        seen.append((name, name in [row['Restaurant Name'] for row in read_rows(path)]))
+
+    for name in ('a', 'b', 'c'):
+        sink.write({'Restaurant Name': name, 'City': 'Austin'}, on_flushed=lambda name=name: on_flushed(name))
+    assert seen == []
+
+    sink.flush()
+
+    assert seen == [('a', True), ('b', True), ('c', True)]
+    sink.close()
+
+
+def test_close_flushes_pending_rows_and_callbacks(tmp_path):
+    path = tmp_path / 'out.csv'
+    sink = make_sink(path)
+    flushed = []
+    sink.write({'Restaurant Name': 'a', 'City': 'Austin'}, on_flushed=lambda: flushed.append('a'))
+
+    sink.close()
+
+    assert flushed == ['a']
+    assert [row['Restaurant Name'] for row in read_rows(path)] == ['a']
+
+
+def test_write_after_close_raises_and_flush_returns(tmp_path):
+    sink = make_sink(tmp_path / 'out.csv')
+    sink.close()
+
+    with pytest.raises(ValueError):
+        sink.write({'Restaurant Name': 'late', 'City': 'Austin'})
+    sink.flush()
+    sink.close()
+
+
+def test_unknown_field_is_rejected(tmp_path):
+    sink = make_sink(tmp_path / 'out.csv')
+    with pytest.raises(ValueError):
+        sink.write({'Restaurant Name': 'a', 'Zip': '78701'})
+    sink.close()
+
+
+def test_reopened_file_keeps_a_single_header(tmp_path):
+    path = tmp_path / 'out.csv'
+    for name in ('a', 'b'):
+        sink = make_sink(path)
+        sink.write({'Restaurant Name': name, 'City': 'Austin'})
+        sink.close()
+
+    assert [row['Restaurant Name'] for row in read_rows(path)] == ['a', 'b']
+
+
+def test_rows_accepted_while_closing_are_never_lost(tmp_path):
+    path = tmp_path / 'out.csv'
+    sink = make_sink(path, batch_size=7, queue_size=16)
+    accepted = []
+    flushed = []
+    lock = threading.Lock()
+    start = threading.Barrier(5)
+
+    def writer(worker):
+        start.wait()
+        for i in range(100000):
+            name = f'w{worker}-{i}'
+            try:
+                sink.write({'Restaurant Name': name, 'City': 'Austin'}, on_flushed=lambda name=name: flushed.append(name))
+            except ValueError:
+                return
+            with lock:
+                accepted.append(name)
+
+    threads = [threading.Thread(target=writer, args=(worker,), daemon=True) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    flushers = [threading.Thread(target=sink.flush, daemon=True) for _ in range(4)]
+    for thread in flushers:
+        thread.start()
+    sink.close()
+    for thread in threads + flushers:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+
+    written = [row['Restaurant Name'] for row in read_rows(path)]
+    assert sorted(written) == sorted(accepted)
+    assert sorted(flushed) == sorted(accepted)
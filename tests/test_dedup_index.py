@@ -0,0 +1,100 @@
+import csv
+
+from src.utils.csv_handler import CSVSink
+from src.utils.dedup_index import HEADER, DedupIndex
+
+FIELDNAMES = ['Restaurant Name', 'Address']
+KEY_FIELDS = ['Restaurant Name', 'Address']
+
+
+def entry(name):
+    return {'Restaurant Name': name, 'Address': f'{name} Street'}
+
+
+def write_through_sink(csv_path, names):
+    """Write entries the way the Eater scraper does: keys synced once per flush"""
+    index = DedupIndex(csv_path, KEY_FIELDS)
+    sink = CSVSink(csv_path, FIELDNAMES, fsync=False, batch_size=1000, flush_interval=60)
+    sink.add_flush_listener(index.sync)
+    for name in names:
+        index.add(entry(name))
+        sink.write(entry(name), on_flushed=lambda name=name: index.persist(entry(name)))
+    sink.close()
+    return index
+
+
+def test_keys_survive_a_restart(tmp_path):
+    csv_path = tmp_path / 'raw.csv'
+    write_through_sink(csv_path, ['a', 'b'])
+
+    reloaded = DedupIndex(csv_path, KEY_FIELDS)
+
+    assert len(reloaded) == 2
+    assert entry('a') in reloaded and entry('b') in reloaded
+    assert entry('c') not in reloaded
+    assert not reloaded.add(entry('a'))
+    assert reloaded.add(entry('c'))
+
+
+def test_add_is_in_memory_until_the_row_is_flushed(tmp_path):
+    csv_path = tmp_path / 'raw.csv'
+    index = write_through_sink(csv_path, ['a'])
+
+    assert index.add(entry('pending'))
+    assert entry('pending') in index
+    assert entry('pending') not in DedupIndex(csv_path, KEY_FIELDS)
+
+
+def test_sidecar_is_rebuilt_when_the_csv_changed(tmp_path):
+    csv_path = tmp_path / 'raw.csv'
+    write_through_sink(csv_path, ['a'])
+    # A row that reached the CSV without its key reaching the sidecar, as after a crash
+    with open(csv_path, 'a', newline='', encoding='utf-8') as f:
+        csv.DictWriter(f, fieldnames=FIELDNAMES).writerow(entry('crashed'))
+
+    reloaded = DedupIndex(csv_path, KEY_FIELDS)
+
+    assert entry('crashed') in reloaded
+    assert len(reloaded) == 2
+    assert DedupIndex(csv_path, KEY_FIELDS).index_path.read_bytes()[:HEADER.size] == reloaded._header()
+
+
+def test_sidecar_without_a_header_is_rebuilt(tmp_path):
+    csv_path = tmp_path / 'raw.csv'
+    write_through_sink(csv_path, ['a', 'b'])
+    index_path = csv_path.with_suffix('.idx')
+    index_path.write_bytes(index_path.read_bytes()[HEADER.size:])
+
+    assert len(DedupIndex(csv_path, KEY_FIELDS)) == 2
+
+
+def test_sidecar_is_discarded_without_its_csv(tmp_path):
+    csv_path = tmp_path / 'raw.csv'
+    write_through_sink(csv_path, ['a'])
+    csv_path.unlink()
+
+    index = DedupIndex(csv_path, KEY_FIELDS)
+
+    assert len(index) == 0
+    assert not index.index_path.exists()
+
+
+def test_sidecar_is_written_once_per_flush(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'raw.csv'
+    index = DedupIndex(csv_path, KEY_FIELDS)
+    header_writes = []
+    header = index._header
+    monkeypatch.setattr(index, '_header', lambda: header_writes.append(1) or header())
+    sink = CSVSink(csv_path, FIELDNAMES, fsync=False, batch_size=50, flush_interval=60)
+    sink.add_flush_listener(index.sync)
+    sink.add_flush_listener(index.sync)
+
+    for i in range(120):
+        index.add(entry(f'r{i}'))
+        sink.write(entry(f'r{i}'), on_flushed=lambda i=i: index.persist(entry(f'r{i}')))
+    sink.close()
+
+    assert len(header_writes) == 3
+    reloaded = DedupIndex(csv_path, KEY_FIELDS)
+    assert len(reloaded) == 120
+    assert all(entry(f'r{i}') in reloaded for i in range(120))
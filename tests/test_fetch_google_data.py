@@ -0,0 +1,43 @@
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+from src.config.config import EXPECTED_GOOGLE_FIELDS, GOOGLE_MAPS_CONFIG
+from src.scrapers.FetchGoogleData import fetch_google_maps_data
+
+
+class SlowPageDriver:
+    """Driver whose page never finishes loading and holds no matching elements"""
+
+    current_url = 'https://www.google.com/maps/place/Slow'
+    page_source = '<html></html>'
+
+    def __init__(self):
+        self.page_load_timeouts = []
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeouts.append(seconds)
+
+    def get(self, url):
+        time.sleep(min(self.page_load_timeouts[-1], 0.05))
+        raise TimeoutException('page load timed out')
+
+    def find_element(self, by, selector):
+        raise TimeoutException('no such element')
+
+    def find_elements(self, by, selector):
+        return []
+
+
+def test_page_load_is_bounded_by_the_latency_budget(monkeypatch):
+    monkeypatch.setitem(GOOGLE_MAPS_CONFIG, 'latency_budget', 0.3)
+    driver = SlowPageDriver()
+    timings = {}
+
+    start = time.monotonic()
+    data = fetch_google_maps_data('https://maps.example/slow', driver, timings, extraction_mode='webdriver')
+
+    assert time.monotonic() - start < 2.0
+    assert driver.page_load_timeouts and driver.page_load_timeouts[0] <= 1.0
+    assert data == {field: 'Not available' for field in EXPECTED_GOOGLE_FIELDS}
+    assert 'load' in timings and 'sections_wait' in timings
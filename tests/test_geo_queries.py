@@ -0,0 +1,61 @@
+import math
+import random
+
+import pytest
+
+from src.database.db_operations import EARTH_RADIUS_KM, bbox_query, longitude_ranges, radius_query
+
+
+@pytest.mark.parametrize('min_lon, max_lon, expected', [
+    (-10.0, 10.0, [(-10.0, 10.0)]),
+    (-180.0, 180.0, [(-180.0, 180.0)]),
+    (175.0, 180.0, [(175.0, 180.0)]),
+    (170.0, -170.0, [(170.0, 180.0), (-180.0, -170.0)]),
+    (175.0, 185.0, [(175.0, 180.0), (-180.0, -175.0)]),
+    (-185.0, -175.0, [(175.0, 180.0), (-180.0, -175.0)]),
+    (180.0, 185.0, [(-180.0, -175.0)]),
+    (-200.0, 200.0, [(-180.0, 180.0)]),
+])
+def test_longitude_ranges(min_lon, max_lon, expected):
+    assert longitude_ranges(min_lon, max_lon) == pytest.approx(expected)
+
+
+def test_bbox_across_the_antimeridian_matches_two_boxes():
+    query, params = bbox_query(-17.0, 179.5, -16.0, -179.5, min_rating=4.0)
+
+    assert query.count('<@ box(') == 2
+    assert ' OR ' in query
+    assert params == pytest.approx([179.5, -17.0, 180.0, -16.0, -180.0, -17.0, -179.5, -16.0, 4.0])
+
+
+def destination(lat, lon, bearing, distance_km):
+    """Point distance_km from (lat, lon) along bearing, on the haversine sphere"""
+    angle = distance_km / EARTH_RADIUS_KM
+    lat1, lon1, bearing = map(math.radians, (lat, lon, bearing))
+    lat2 = math.asin(math.sin(lat1) * math.cos(angle) + math.cos(lat1) * math.sin(angle) * math.cos(bearing))
+    lon2 = lon1 + math.atan2(math.sin(bearing) * math.sin(angle) * math.cos(lat1),
+                             math.cos(angle) - math.sin(lat1) * math.sin(lat2))
+    return math.degrees(lat2), (math.degrees(lon2) + 180.0) % 360.0 - 180.0
+
+
+def box_contains(params, lat, lon):
+    """Whether the boxes in a radius_query's params contain (lat, lon)"""
+    box_params = params[3:-1]
+    boxes = [box_params[i:i + 4] for i in range(0, len(box_params), 4)]
+    return any(west <= lon <= east and south <= lat <= north for west, south, east, north in boxes)
+
+
+def test_radius_box_covers_the_whole_circle():
+    rng = random.Random(7)
+    for _ in range(2000):
+        lat, lon = rng.uniform(-85, 85), rng.uniform(-180, 180)
+        radius_km = rng.choice([0.5, 2.0, 50.0, 800.0])
+        _, params = radius_query(lat, lon, radius_km)
+        point = destination(lat, lon, rng.uniform(0, 360), radius_km * 0.999)
+        assert box_contains(params, *point), (lat, lon, radius_km, point)
+
+
+def test_radius_reaching_a_pole_spans_every_longitude():
+    _, params = radius_query(89.9, 10.0, 50.0)
+
+    assert params[3:7] == pytest.approx([-180.0, 89.9 - math.degrees(50.0 / EARTH_RADIUS_KM), 180.0, 90.0])
@@ -0,0 +1,100 @@
+import pytest
+
+from src.scrapers import FetchGoogleData
+from src.scrapers.FetchGoogleData import fetch_google_maps_data_cached
+from src.utils import google_cache
+from src.utils.google_cache import GoogleMapsCache
+
+NA = 'Not available'
+URL = 'https://www.google.com/maps/place/example'
+FIELD_GROUPS = {'reviews': ['Star Rating'], 'place': ['Latitude']}
+TTL = {'reviews': 10, 'place': 100, 'attributes': 50}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(google_cache.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = GoogleMapsCache(tmp_path / 'cache.db', field_groups=FIELD_GROUPS, ttl=TTL,
+                            max_entries=100, max_age=1000)
+    yield cache
+    cache.close()
+
+
+def scrape(rating=NA, latitude=NA, crowd=NA):
+    return {'Star Rating': rating, 'Latitude': latitude, 'Crowd': crowd}
+
+
+def test_groups_expire_on_their_own_ttl(cache, clock):
+    cache.put(URL, scrape('4.5', '30.2', 'Locals'))
+    assert cache.get(URL) == (scrape('4.5', '30.2', 'Locals'), set())
+
+    clock.now += 11
+    fields, stale = cache.get(URL)
+    assert stale == {'reviews'}
+    assert fields == {'Latitude': '30.2', 'Crowd': 'Locals'}
+
+    clock.now += 40
+    assert cache.get(URL) == ({'Latitude': '30.2'}, {'reviews', 'attributes'})
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['refreshes'] == 2
+
+
+def test_unknown_and_empty_results(cache):
+    assert cache.get(URL) == ({}, None)
+    cache.put(URL, scrape())
+    assert cache.get(URL) == ({}, None)
+    assert len(cache) == 0
+
+
+def test_partial_result_stores_only_groups_with_data(cache):
+    cache.put(URL, scrape(rating='4.5'))
+
+    fields, stale = cache.get(URL)
+
+    assert fields == {'Star Rating': '4.5'}
+    assert stale == {'place', 'attributes'}
+
+
+def test_skip_groups_keep_their_fetch_time(cache, clock):
+    cache.put(URL, scrape('4.5', '30.2', 'Locals'))
+    clock.now += 95
+    cache.put(URL, scrape('4.7', '30.3', 'Tourists'), skip_groups={'place'})
+
+    clock.now += 8
+    assert cache.get(URL) == ({'Star Rating': '4.7', 'Crowd': 'Tourists'}, {'place'})
+
+
+def test_cached_fetch_refetches_only_when_a_group_is_missing_or_stale(cache, clock, monkeypatch):
+    scrapes = [scrape(rating='4.5'), scrape('4.6', '30.2', 'Locals'), scrape()]
+    calls = []
+
+    def fake_fetch(url, driver=None, timings=None):
+        calls.append(url)
+        return dict(scrapes[len(calls) - 1])
+
+    monkeypatch.setattr(FetchGoogleData, 'fetch_google_maps_data', fake_fetch)
+
+    assert fetch_google_maps_data_cached(URL, cache=cache) == scrape(rating='4.5')
+    assert fetch_google_maps_data_cached(URL, cache=cache) == scrape('4.6', '30.2', 'Locals')
+    assert fetch_google_maps_data_cached(URL, cache=cache) == scrape('4.6', '30.2', 'Locals')
+    assert len(calls) == 2
+
+    # The reviews group expires and the new scrape finds nothing: fresh groups are kept
+    clock.now += 11
+    assert fetch_google_maps_data_cached(URL, cache=cache) == scrape(NA, '30.2', 'Locals')
+    assert len(calls) == 3
+    assert cache.get(URL)[1] == {'reviews'}
@@ -0,0 +1,46 @@
+import threading
+
+from src.utils import profiler
+from src.utils.profiler import profile_stage, profiling
+
+
+def start_and_join(name="worker-1"):
+    ran = []
+    thread = threading.Thread(target=lambda: ran.append(sum(range(1000))), name=name)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    return ran
+
+
+def test_thread_started_under_profiling_runs(tmp_path):
+    with profiling(directory=tmp_path, track_memory=False, sample_interval=0.001) as active:
+        with profile_stage('enrichment'):
+            ran = start_and_join()
+
+    assert ran == [sum(range(1000))]
+    assert threading.Thread.run is active._original_run
+    summary = (active.report_dir / 'summary.txt').read_text()
+    assert 'enrichment' in summary
+    assert (active.report_dir / 'enrichment.prof').exists()
+
+
+class _RefusingProfile:
+    """Stands in for cProfile.Profile when another profiling tool is active"""
+
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+    def disable(self):
+        pass
+
+
+def test_thread_runs_when_profiler_cannot_enable(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler.cProfile, 'Profile', _RefusingProfile)
+    with profiling(directory=tmp_path, track_memory=False) as active:
+        with profile_stage('db_load'):
+            ran = start_and_join("pipeline-db")
+
+    assert ran == [sum(range(1000))]
+    assert not active._cpu_profiling
+    assert (active.report_dir / 'summary.txt').exists()
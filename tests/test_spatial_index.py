@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.spatial_index import GridSpatialIndex, haversine_km
+from tests.test_geo_queries import destination
+
+BEARINGS = range(0, 360, 15)
+
+
+def build(points, cell_size=0.05):
+    """Index over (lat, lon[, rating, category]) tuples, named by position"""
+    rows = [{'lat': point[0], 'lon': point[1],
+             'rating': point[2] if len(point) > 2 else None,
+             'category': point[3] if len(point) > 3 else 'Not available',
+             'name': f'r{i}', 'address': f'{i} Street'} for i, point in enumerate(points)]
+    return GridSpatialIndex.build(pd.DataFrame(rows), cell_size)
+
+
+def names(index, indices):
+    return [str(index.name[i]) for i in indices]
+
+
+@pytest.mark.parametrize('lat, lon', [(40.7, -74.0), (0.0, 0.0), (64.1, -21.9), (-33.9, 151.2), (-16.5, 179.99)])
+@pytest.mark.parametrize('radius_km', [0.5, 2.0, 50.0])
+def test_radius_finds_points_just_inside_on_every_bearing(lat, lon, radius_km):
+    points = [destination(lat, lon, bearing, radius_km * 0.999) for bearing in BEARINGS]
+    index = build(points)
+
+    indices, distances = index.within_radius(lat, lon, radius_km)
+
+    assert sorted(names(index, indices)) == sorted(f'r{i}' for i in range(len(points)))
+    assert np.all(np.diff(distances) >= 0)
+
+
+def test_radius_excludes_points_just_outside():
+    points = [destination(40.7, -74.0, bearing, 2.0 * 1.001) for bearing in BEARINGS]
+    index = build(points)
+
+    indices, _ = index.within_radius(40.7, -74.0, 2.0)
+
+    assert len(indices) == 0
+
+
+def test_radius_and_nearest_wrap_the_antimeridian():
+    index = build([(-16.5, -179.99), (-16.5, 179.1)])
+
+    indices, distances = index.within_radius(-16.5, 179.99, 5.0)
+    assert names(index, indices) == ['r0']
+    assert distances[0] == pytest.approx(haversine_km(-16.5, 179.99, [-16.5], [-179.99])[0])
+
+    indices, _ = index.nearest(-16.5, 179.99, k=1)
+    assert names(index, indices) == ['r0']
+
+
+def test_bbox_across_the_antimeridian():
+    index = build([(-16.5, 179.8), (-16.5, -179.8), (-16.5, 0.0), (-18.0, 179.8)])
+
+    assert sorted(names(index, index.within_bbox(-17.0, 179.5, -16.0, -179.5))) == ['r0', 'r1']
+
+
+def test_nearest_returns_k_closest_in_order():
+    distances_km = [0.3, 4.0, 1.2, 25.0, 0.8, 9.0]
+    index = build([destination(51.5, -0.1, 40 * i, d) for i, d in enumerate(distances_km)])
+
+    indices, distances = index.nearest(51.5, -0.1, k=4)
+
+    assert names(index, indices) == ['r0', 'r4', 'r2', 'r1']
+    assert distances == pytest.approx([0.3, 0.8, 1.2, 4.0], abs=1e-6)
+
+
+def test_rating_and_category_filters():
+    index = build([
+        (40.7, -74.0, 4.5, 'Pizza'),
+        (40.7, -74.001, 3.0, 'Pizza'),
+        (40.701, -74.0, 4.8, 'Sushi'),
+        (40.701, -74.001, None, 'Sushi'),
+        (40.702, -74.0, 4.9, 'Not available'),
+    ])
+
+    indices, _ = index.within_radius(40.7, -74.0, 1.0, min_rating=4.0)
+    assert sorted(names(index, indices)) == ['r0', 'r2', 'r4']
+
+    indices, _ = index.within_radius(40.7, -74.0, 1.0, category='Sushi')
+    assert sorted(names(index, indices)) == ['r2', 'r3']
+
+    indices, _ = index.nearest(40.7, -74.0, k=5, min_rating=4.0, category=['Pizza', 'Sushi'])
+    assert names(index, indices) == ['r0', 'r2']
+
+    assert len(index.within_bbox(40.69, -74.01, 40.71, -73.99, category='Tacos')) == 0
+
+
+def test_save_and_mmap_load_round_trip(tmp_path):
+    index = build([(40.7, -74.0, 4.5, 'Pizza'), (40.71, -74.01, None, 'Not available'), (-16.5, 179.99, 3.5, 'Sushi')])
+    index.save(tmp_path)
+
+    loaded = GridSpatialIndex.load(tmp_path, mmap=True)
+
+    assert len(loaded) == len(index)
+    assert [loaded.record(i) for i in range(len(loaded))] == [index.record(i) for i in range(len(index))]
+    indices, _ = loaded.within_radius(40.7, -74.0, 5.0, min_rating=4.0)
+    assert names(loaded, indices) == ['r0']
+    indices, _ = loaded.nearest(-16.5, -179.99, k=1)
+    assert names(loaded, indices) == ['r2']
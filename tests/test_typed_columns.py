@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import psycopg2
+import pytest
+
+from src.config.database_config import DATABASE
+from src.database.db_operations import parse_expression
+
+
+@pytest.fixture(scope='module')
+def cursor():
+    try:
+        conn = psycopg2.connect(host=DATABASE['host'], port=DATABASE['port'], dbname=DATABASE['database'],
+                                user=DATABASE['user'], password=DATABASE['password'], connect_timeout=3)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL not reachable: {e}")
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            yield cur
+    finally:
+        conn.close()
+
+
+def parse(cursor, column, value):
+    cursor.execute(f"SELECT {parse_expression(column, '%(value)s::text')}", {'value': value})
+    return cursor.fetchone()[0]
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('4.5', Decimal('4.5')),
+    (' 3 ', Decimal('3.0')),
+    ('4.96', Decimal('5.0')),
+    ('4.44', Decimal('4.4')),
+    ('0', Decimal('0.0')),
+    ('5.04', None),
+    ('9.96', None),
+    ('9.9', None),
+    ('6', None),
+    ('-1', None),
+    ('Not available', None),
+    ('', None),
+])
+def test_star_rating_parses_or_yields_null(cursor, value, expected):
+    assert parse(cursor, 'star_rating', value) == expected
+
+
+@pytest.mark.parametrize('column, value, expected', [
+    ('number_of_reviews', '(1,234)', 1234),
+    ('number_of_reviews', '12345678901', None),
+    ('latitude', '40.7128', 40.7128),
+    ('latitude', '91', None),
+    ('longitude', '-180', -180.0),
+    ('longitude', '180.5', None),
+])
+def test_other_typed_columns(cursor, column, value, expected):
+    assert parse(cursor, column, value) == expected